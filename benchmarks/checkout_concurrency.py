@@ -0,0 +1,191 @@
+"""
+Concurrent checkout capacity: gunicorn sync workers vs an ASGI server.
+
+Starts a local PayPal stub that answers every call after a fixed delay,
+then drives CreatePayPalOrderView (token + STC + create order = three
+remote round trips per request) under each server with the same number
+of worker processes, and prints throughput and latency percentiles.
+
+Usage:
+    python benchmarks/checkout_concurrency.py --workers 2 --concurrency 100 --requests 400
+
+The benchmark seeds one report and lead into the configured database
+(run ``python manage.py migrate`` first).
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+STUB_LATENCY = float(os.environ.get('PAYPAL_STUB_LATENCY', '0.3'))
+
+
+async def paypal_stub(scope, receive, send):
+    """Minimal ASGI app standing in for the PayPal REST API."""
+    if scope['type'] != 'http':
+        return
+    while True:
+        message = await receive()
+        if not message.get('more_body'):
+            break
+    await asyncio.sleep(STUB_LATENCY)
+
+    path = scope['path']
+    if path.endswith('/oauth2/token'):
+        status, body = 200, {'access_token': 'stub-token'}
+    elif '/risk/transaction-contexts/' in path:
+        status, body = 204, None
+    else:
+        status, body = 201, {
+            'id': uuid.uuid4().hex[:17].upper(),
+            'links': [{'rel': 'payer-action', 'href': 'https://paypal.invalid/approve'}],
+        }
+    payload = json.dumps(body).encode() if body is not None else b''
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [(b'content-type', b'application/json')]})
+    await send({'type': 'http.response.body', 'body': payload})
+
+
+def seed_lead():
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'market_research_backend.settings')
+    import django
+    django.setup()
+    from django.utils import timezone
+    from reports.models import Category, Report
+    from leads.models import Lead
+
+    category, _ = Category.objects.get_or_create(name='Benchmark')
+    report, _ = Report.objects.get_or_create(
+        slug='benchmark-checkout-report',
+        defaults={
+            'title': 'Benchmark Checkout Report', 'category': category,
+            'summary': '', 'toc': '', 'segmentation': '', 'methodology': '', 'faqs': '',
+            'publish_date': timezone.now().date(), 'single_user_price': 1000,
+        },
+    )
+    lead = Lead.objects.create(
+        email='benchmark@example.com', first_name='Bench', last_name='Mark',
+        lead_type='PURCHASE', license_type='single', report=report,
+    )
+    return lead.id
+
+
+def start(cmd, env):
+    return subprocess.Popen(cmd, cwd=BASE_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                            start_new_session=True)
+
+
+def stop(proc):
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+    except ProcessLookupError:
+        return
+    proc.wait(timeout=15)
+
+
+async def wait_until_up(url, timeout=30):
+    import httpx
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not start")
+
+
+async def drive(base_url, lead_id, concurrency, total):
+    import httpx
+    latencies, errors = [], 0
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    async def worker(client):
+        nonlocal errors
+        while not queue.empty():
+            queue.get_nowait()
+            started = time.perf_counter()
+            try:
+                response = await client.post(f"{base_url}/api/leads/create-paypal-order/",
+                                             json={'lead_id': lead_id})
+                if response.status_code != 200:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(timeout=120, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': total,
+        'errors': errors,
+        'seconds': round(elapsed, 2),
+        'req_per_sec': round(total / elapsed, 1),
+        'p50_ms': round(statistics.median(latencies) * 1000),
+        'p95_ms': round(latencies[int(len(latencies) * 0.95) - 1] * 1000),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--port', type=int, default=8910)
+    args = parser.parse_args()
+
+    lead_id = seed_lead()
+    stub_port, app_port = args.port, args.port + 1
+    env = dict(os.environ, PAYPAL_API_BASE=f"http://127.0.0.1:{stub_port}",
+               PAYPAL_CLIENT_ID='stub', PAYPAL_CLIENT_SECRET='stub',
+               # Every simulated buyer shares one IP; the limiter would turn most calls into 429s.
+               RATE_LIMIT_ENABLED='False')
+
+    servers = {
+        'gunicorn (sync)': [sys.executable, '-m', 'gunicorn', '-w', str(args.workers),
+                            '-b', f"127.0.0.1:{app_port}", '--timeout', '120',
+                            'market_research_backend.wsgi:application'],
+        'uvicorn (asgi)': [sys.executable, '-m', 'uvicorn', '--workers', str(args.workers),
+                           '--port', str(app_port), '--log-level', 'warning',
+                           'market_research_backend.asgi:application'],
+    }
+
+    stub = start([sys.executable, '-m', 'uvicorn', '--app-dir', 'benchmarks', '--port', str(stub_port),
+                  '--log-level', 'warning', 'checkout_concurrency:paypal_stub'], env)
+    try:
+        asyncio.run(wait_until_up(f"http://127.0.0.1:{stub_port}/"))
+        print(f"PayPal stub latency {STUB_LATENCY}s, {args.workers} workers, "
+              f"{args.concurrency} concurrent clients, {args.requests} requests")
+        for name, cmd in servers.items():
+            server = start(cmd, env)
+            try:
+                base_url = f"http://127.0.0.1:{app_port}"
+                asyncio.run(wait_until_up(base_url + '/robots.txt'))
+                result = asyncio.run(drive(base_url, lead_id, args.concurrency, args.requests))
+                print(f"{name:<18} {json.dumps(result)}")
+            finally:
+                stop(server)
+    finally:
+        stop(stub)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Throughput and latency of the gunicorn worker profiles (gunicorn.conf.py) under a mixed load.
+
+A scratch SQLite database is seeded with a synthetic catalogue, then each
+worker class is started with the checked-in configuration and driven at
+several concurrency levels with a mix of CPU-bound page views (listings,
+report detail, pricing) and I/O-bound checkout calls, which wait on a
+local PayPal stub (see checkout_concurrency.py) like they would on PayPal.
+
+Usage:
+    python benchmarks/load_test.py --profiles sync,gthread,uvicorn --concurrency 8,32 --seconds 15
+    python benchmarks/load_test.py --io-share 0 --env production   # pages only (run collectstatic first)
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from checkout_concurrency import start, stop, wait_until_up
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+PAGE_PATHS = ['/reports/', '/reports/page=2/', '/reports/country-reports/', '/pricing/']
+
+
+def seed(env, reports):
+    """Migrates and fills the scratch database; returns (report detail paths, purchase lead id)."""
+    for args in (['migrate', '-v0'], ['generate_synthetic_data', '--reports', str(reports)]):
+        subprocess.run([sys.executable, 'manage.py', *args], env=env, cwd=BASE_DIR, check=True,
+                       stdout=subprocess.DEVNULL)
+    os.environ.update(env)
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'market_research_backend.settings')
+    import django
+    django.setup()
+    from leads.models import Lead
+    from reports.models import Report
+
+    detail_paths = [report.get_absolute_url() for report in Report.objects.only('url_path', 'slug')[:200]]
+    report = Report.objects.first()
+    lead = Lead.objects.create(email='load-test@example.com', first_name='Load', last_name='Test',
+                               lead_type='PURCHASE', license_type='single', report=report)
+    return detail_paths, lead.id
+
+
+async def drive(base_url, detail_paths, lead_id, concurrency, seconds, io_share):
+    import httpx
+    latencies = {'page': [], 'checkout': []}
+    errors = 0
+    deadline = time.monotonic() + seconds
+
+    async def client_loop(client, rng):
+        nonlocal errors
+        while time.monotonic() < deadline:
+            kind = 'checkout' if rng.random() < io_share else 'page'
+            started = time.perf_counter()
+            try:
+                if kind == 'checkout':
+                    response = await client.post(f"{base_url}/api/leads/create-paypal-order/",
+                                                 json={'lead_id': lead_id})
+                else:
+                    path = rng.choice(PAGE_PATHS) if rng.random() < 0.4 else rng.choice(detail_paths)
+                    response = await client.get(base_url + path)
+                if response.status_code != 200:
+                    errors += 1
+                    continue
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies[kind].append(time.perf_counter() - started)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(timeout=120, limits=limits) as client:
+        await asyncio.gather(*(client_loop(client, random.Random(i)) for i in range(concurrency)))
+    return latencies, errors
+
+
+def summary(values, seconds):
+    if not values:
+        return '       -'
+    values.sort()
+    pick = lambda q: values[min(len(values) - 1, int(len(values) * q))] * 1000  # noqa: E731
+    return (f"{len(values) / seconds:>7.1f}/s  p50 {pick(0.5):>6.0f}  p95 {pick(0.95):>6.0f}  "
+            f"p99 {pick(0.99):>6.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--profiles', default='sync,gthread,uvicorn')
+    parser.add_argument('--concurrency', default='8,32')
+    parser.add_argument('--seconds', type=float, default=15)
+    parser.add_argument('--io-share', type=float, default=0.2, help="Fraction of requests that are checkouts.")
+    parser.add_argument('--reports', type=int, default=2000)
+    parser.add_argument('--workers', help="Override GUNICORN_WORKERS for every profile.")
+    parser.add_argument('--env', default='development', help="DJANGO_ENV for the servers.")
+    parser.add_argument('--port', type=int, default=8920)
+    args = parser.parse_args()
+
+    stub_port, app_port = args.port, args.port + 1
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ, DATABASE_URL=f'sqlite:///{tmp}/load.sqlite3', DJANGO_ENV=args.env,
+            RATE_LIMIT_ENABLED='False', REQUEST_METRICS_ENABLED='False', PYTHONWARNINGS='ignore',
+            PAYPAL_API_BASE=f"http://127.0.0.1:{stub_port}", PAYPAL_CLIENT_ID='stub', PAYPAL_CLIENT_SECRET='stub',
+            GUNICORN_BIND=f"127.0.0.1:{app_port}", GUNICORN_ACCESS_LOG='', GUNICORN_LOG_LEVEL='warning',
+        )
+        if args.workers:
+            env['GUNICORN_WORKERS'] = args.workers
+        detail_paths, lead_id = seed(env, args.reports)
+
+        stub = start([sys.executable, '-m', 'uvicorn', '--app-dir', 'benchmarks', '--port', str(stub_port),
+                      '--log-level', 'warning', 'checkout_concurrency:paypal_stub'], env)
+        try:
+            asyncio.run(wait_until_up(f"http://127.0.0.1:{stub_port}/"))
+            print(f"{os.cpu_count()} CPUs, {args.io_share:.0%} checkouts, {args.seconds:.0f}s per run")
+            for profile in args.profiles.split(','):
+                server = start([sys.executable, '-m', 'gunicorn'], dict(env, GUNICORN_WORKER_CLASS=profile))
+                try:
+                    base_url = f"http://127.0.0.1:{app_port}"
+                    asyncio.run(wait_until_up(base_url + '/robots.txt', timeout=60))
+                    for concurrency in map(int, args.concurrency.split(',')):
+                        latencies, errors = asyncio.run(drive(
+                            base_url, detail_paths, lead_id, concurrency, args.seconds, args.io_share,
+                        ))
+                        print(f"{profile:<8} c={concurrency:<4} pages {summary(latencies['page'], args.seconds)}  "
+                              f"checkout {summary(latencies['checkout'], args.seconds)}  errors {errors}")
+                finally:
+                    stop(server)
+        finally:
+            stop(stub)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Worker boot cost: time to import wsgi.application and the resident memory it leaves.
+
+Each run starts a fresh interpreter (as a gunicorn worker without preload
+would), imports the WSGI application under the given DJANGO_ENV profiles
+(production also warms every template) and reports the median import
+time, peak RSS, and whether heavy optional libraries were loaded.
+
+Usage:
+    python benchmarks/startup.py --runs 7
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+# Only needed by admin imports and management commands; a web worker should not load them.
+HEAVY_MODULES = ('pandas', 'numpy', 'openpyxl', 'dotenv')
+
+
+def child():
+    import resource
+    started = time.perf_counter()
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'market_research_backend.settings')
+    from market_research_backend.wsgi import application  # noqa: F401
+    elapsed = time.perf_counter() - started
+    print(json.dumps({
+        'import_ms': round(elapsed * 1000, 1),
+        # ru_maxrss is in KiB on Linux.
+        'rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'modules': len(sys.modules),
+        'heavy': [name for name in HEAVY_MODULES if name in sys.modules],
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--profiles', default='development,production')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+
+    for profile in args.profiles.split(','):
+        env = dict(os.environ, DJANGO_ENV=profile, PYTHONWARNINGS='ignore')
+        results = []
+        for _ in range(args.runs):
+            output = subprocess.run(
+                [sys.executable, __file__, '--child'],
+                env=env, cwd=BASE_DIR, capture_output=True, text=True, check=True,
+            ).stdout.strip().splitlines()[-1]
+            results.append(json.loads(output))
+        print(f"{profile}: import {statistics.median(r['import_ms'] for r in results):.0f} ms  "
+              f"RSS {statistics.median(r['rss_mb'] for r in results):.1f} MB  "
+              f"{results[-1]['modules']} modules  heavy: {', '.join(results[-1]['heavy']) or 'none'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Startup and per-request render time: development vs production settings.
+
+For each DJANGO_ENV profile a fresh interpreter imports the WSGI
+application (which, in production, warms every template) and then
+renders a set of pages through the test client: the first request to
+each page and the mean of the following ones are reported.
+
+Usage:
+    python benchmarks/template_rendering.py --requests 50 /about/ /reports/
+
+The pages are rendered against the configured database; run
+``python manage.py migrate`` first. A sample report is seeded so the
+report detail page is included.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_PATHS = ['/', '/about/', '/reports/', '/pricing/']
+
+
+def child(paths, requests):
+    started = time.perf_counter()
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'market_research_backend.settings')
+    from market_research_backend.wsgi import application  # noqa: F401
+    startup = time.perf_counter() - started
+
+    from django.core.cache import cache
+    from django.test import Client
+    from django.utils import timezone
+    from reports.models import Category, Report
+
+    category, _ = Category.objects.get_or_create(name='Benchmark')
+    report, _ = Report.objects.get_or_create(
+        slug='benchmark-render-report',
+        defaults={
+            'title': 'Benchmark Render Report', 'category': category,
+            'summary': '<h2>Overview</h2><p>Benchmark.</p>', 'toc': '', 'segmentation': '',
+            'methodology': '', 'faqs': '', 'publish_date': timezone.now().date(),
+        },
+    )
+    client = Client(HTTP_HOST='localhost')
+    results = {'startup_ms': round(startup * 1000, 1), 'pages': {}}
+    for path in [*paths, report.get_absolute_url()]:
+        cache.clear()  # measure template work, not fragment-cache hits
+        started = time.perf_counter()
+        status = client.get(path).status_code
+        first = time.perf_counter() - started
+        timings = []
+        for _ in range(requests):
+            cache.clear()
+            started = time.perf_counter()
+            client.get(path)
+            timings.append(time.perf_counter() - started)
+        results['pages'][path] = {
+            'status': status,
+            'first_ms': round(first * 1000, 1),
+            'mean_ms': round(statistics.mean(timings) * 1000, 2),
+        }
+    print(json.dumps(results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('paths', nargs='*', default=DEFAULT_PATHS)
+    parser.add_argument('--requests', type=int, default=30)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.paths, args.requests)
+        return
+
+    for profile in ('development', 'production'):
+        env = dict(os.environ, DJANGO_ENV=profile, PYTHONWARNINGS='ignore')
+        output = subprocess.run(
+            [sys.executable, __file__, '--child', '--requests', str(args.requests), *args.paths],
+            env=env, cwd=BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip().splitlines()[-1]
+        result = json.loads(output)
+        print(f"{profile}: startup {result['startup_ms']} ms")
+        for path, page in result['pages'].items():
+            print(f"  {path:<48} status {page['status']}  first {page['first_ms']:>7} ms  "
+                  f"mean {page['mean_ms']:>7} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,5 @@
 import json
 import datetime
-import pandas as pd
 from django.contrib import admin, messages
 from django.urls import path, reverse
 from django.shortcuts import render, redirect
@@ -49,6 +48,7 @@ class BlogPostAdmin(admin.ModelAdmin):
 
     def import_excel(self, request):
         if request.method == "POST":
+            import pandas as pd  # deferred: only this view needs it
             form = ExcelImportForm(request.POST, request.FILES)
             if form.is_valid():
                 excel_file = request.FILES["excel_file"]
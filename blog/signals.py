@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from pages.images import build_media_variants
+
+from .models import BlogPost, BlogPostImage
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_save, sender=BlogPostImage)
+def build_upload_variants(sender, instance, **kwargs):
+    # Re-saving an unchanged image is cheap: up-to-date variants are kept.
+    if instance.image:
+        build_media_variants(instance.image.name)
@@ -9,7 +9,8 @@ class BlogPostListView(ListView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        all_posts = BlogPost.objects.filter(is_published=True).order_by('-publish_date')
+        # One query for both sections; the cards show the category name.
+        all_posts = list(self.get_queryset().select_related('category'))
         
         # Section 1: Latest 5
         context['latest_posts'] = all_posts[:5]
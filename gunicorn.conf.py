@@ -0,0 +1,96 @@
+"""
+Gunicorn configuration, read automatically from the project root:
+
+    gunicorn                      # binds $GUNICORN_BIND, serves the app for the chosen worker class
+
+Everything is environment-driven (GUNICORN_*); the defaults suit one host
+serving both the CPU-heavy report pages (regex formatting, large templates)
+and I/O-bound requests (PayPal, SMTP, reCAPTCHA):
+
+- gthread (default): a few processes with several threads each. While one
+  thread waits on PayPal or SMTP, the others keep rendering.
+- sync: one request per process; most predictable latency for pure page
+  rendering, but a slow upstream call blocks the whole worker.
+- uvicorn: the ASGI application, for the async checkout/reCAPTCHA views
+  under many concurrent slow upstream calls (see benchmarks/checkout_concurrency.py).
+
+The app is preloaded in the master so templates are warmed once (see
+TEMPLATE_WARMUP) and shared copy-on-write between workers, and workers are
+recycled after a jittered number of requests to cap memory growth.
+benchmarks/load_test.py compares the profiles.
+"""
+import multiprocessing
+import os
+import time
+
+cpus = multiprocessing.cpu_count()
+
+WORKER_CLASSES = {
+    'sync': 'sync',
+    'gthread': 'gthread',
+    'uvicorn': 'uvicorn.workers.UvicornWorker',
+}
+worker_choice = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+worker_class = WORKER_CLASSES.get(worker_choice, worker_choice)
+wsgi_app = ('market_research_backend.asgi:application' if worker_choice == 'uvicorn'
+            else 'market_research_backend.wsgi:application')
+
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+# Sync workers need one process per concurrent request; threaded and async ones far fewer.
+workers = int(os.environ.get('GUNICORN_WORKERS', 2 * cpus + 1 if worker_choice == 'sync' else cpus + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4 if worker_choice == 'gthread' else 1))
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'True') == 'True'
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+# Spread restarts so the workers are not all recycled at the same moment.
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', max_requests // 10))
+
+# Seconds a request of each class may take. Gunicorn's own timeout (a silent
+# worker is killed) has to cover the slowest class; requests that exceed their
+# own class's budget are logged by post_request below.
+ROUTE_TIMEOUTS = {
+    'admin-import': int(os.environ.get('GUNICORN_IMPORT_TIMEOUT', 300)),
+    'checkout': int(os.environ.get('GUNICORN_CHECKOUT_TIMEOUT', 45)),
+    'default': int(os.environ.get('GUNICORN_TIMEOUT', 30)),
+}
+ROUTE_PREFIXES = (
+    ('/admin/reports/report/import-excel/', 'admin-import'),
+    ('/admin/blog/blogpost/import-excel/', 'admin-import'),
+    ('/admin/reports/report/update-prices/', 'admin-import'),
+    ('/checkout/', 'checkout'),
+    ('/api/leads/', 'checkout'),
+)
+timeout = max(ROUTE_TIMEOUTS.values())
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG') or None
+errorlog = os.environ.get('GUNICORN_ERROR_LOG', '-')
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+# Nginx on the same host sets X-Forwarded-Proto (see SECURE_PROXY_SSL_HEADER).
+forwarded_allow_ips = os.environ.get('GUNICORN_FORWARDED_ALLOW_IPS', '127.0.0.1')
+
+
+def route_class(path):
+    for prefix, name in ROUTE_PREFIXES:
+        if path.startswith(prefix):
+            return name
+    return 'default'
+
+
+def post_fork(server, worker):
+    # Never share a database connection opened while preloading in the master.
+    from django.db import connections
+    connections.close_all()
+
+
+def pre_request(worker, req):
+    req.started_at = time.monotonic()
+
+
+def post_request(worker, req, environ, resp):
+    elapsed = time.monotonic() - getattr(req, 'started_at', time.monotonic())
+    route = route_class(req.path)
+    if elapsed > ROUTE_TIMEOUTS[route]:
+        worker.log.warning(f"{req.method} {req.path} took {elapsed:.1f}s, over the {route} budget "
+                           f"of {ROUTE_TIMEOUTS[route]}s")
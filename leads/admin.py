@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Lead
+from .models import Lead, Payment
 import csv
 from django.http import HttpResponse
 from django.urls import reverse
@@ -78,3 +78,11 @@ class LeadAdmin(admin.ModelAdmin):
         return response
     
     export_to_csv.short_description = "Export Selected to CSV"
+
+
+@admin.register(Payment)
+class PaymentAdmin(admin.ModelAdmin):
+    list_display = ('paypal_order_id', 'lead', 'status', 'amount', 'emails_sent', 'updated_at')
+    list_filter = ('status', 'emails_sent')
+    search_fields = ('paypal_order_id', 'capture_id', 'lead__email')
+    readonly_fields = ('lead', 'paypal_order_id', 'capture_id', 'amount', 'created_at', 'updated_at')
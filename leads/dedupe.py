@@ -0,0 +1,108 @@
+"""
+Duplicate detection for leads keyed by (normalised email, lead type).
+
+The database is authoritative: lookups use the (email_normalized,
+lead_type) index, and for newsletter subscriptions a conditional unique
+constraint (lead_unique_newsletter_email) rejects a duplicate insert, which
+the subscribe view reports as "already subscribed".
+
+In front of that sits a per-process Bloom filter of known emails, so a
+burst of repeat subscriptions is answered without a write. It is warmed
+from the database on first use and caught up by primary key every
+LEAD_DEDUPE_SYNC_SECONDS, so it can lag: rows written by other workers since
+the last sync, rows whose email or type was edited later, and ids committed
+out of order are all missing from it. A negative answer therefore only means
+"not seen by this process"; callers go on to insert and rely on the
+constraint. A positive answer is confirmed against the index (Bloom filters
+report false positives, never false negatives for what they were given).
+"""
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+
+
+def normalize_email(email):
+    return (email or '').strip().lower()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings, using double hashing of one blake2b digest."""
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item):
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class LeadDedupe:
+    """Answers "has this email already submitted a lead of this type?"."""
+
+    def __init__(self, lead_type):
+        self.lead_type = lead_type
+        self._bloom = None
+        self._last_id = 0
+        self._synced_at = 0.0
+        self._lock = threading.Lock()
+
+    def _queryset(self):
+        from .models import Lead
+        return Lead.objects.filter(lead_type=self.lead_type)
+
+    def _load(self):
+        rows = (self._queryset().filter(id__gt=self._last_id)
+                .order_by('id').values_list('id', 'email_normalized'))
+        for pk, email in rows.iterator(chunk_size=5000):
+            self._bloom.add(email)
+            self._last_id = pk
+
+    def _sync(self):
+        with self._lock:
+            if self._bloom is None:
+                self._bloom = BloomFilter(getattr(settings, 'LEAD_DEDUPE_CAPACITY', 1_000_000))
+            self._load()
+            if self._bloom.count > self._bloom.capacity:
+                # Past capacity the false-positive rate climbs; start over with room to grow.
+                self._bloom, self._last_id = BloomFilter(self._bloom.capacity * 2), 0
+                self._load()
+            self._synced_at = time.monotonic()
+
+    def exists(self, email):
+        """
+        True if a lead of this type with this email is in the database. False
+        may be stale (see the module docstring), so inserts must still handle
+        the unique constraint.
+        """
+        email = normalize_email(email)
+        if time.monotonic() - self._synced_at > getattr(settings, 'LEAD_DEDUPE_SYNC_SECONDS', 5):
+            self._sync()
+        if email not in self._bloom:
+            return False
+        return self._queryset().filter(email_normalized=email).exists()
+
+    def add(self, email):
+        """Record a lead written by this process so bursts hit the filter immediately."""
+        if self._bloom is not None:
+            with self._lock:
+                self._bloom.add(normalize_email(email))
+
+
+newsletter_subscribers = LeadDedupe('NEWSLETTER')
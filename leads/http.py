@@ -0,0 +1,132 @@
+"""
+Async HTTP client for outbound integrations (PayPal).
+
+Views that call out are decorated with ``uses_client``, and the helpers they
+call get the client for the current request from get_async_client().
+
+Under ASGI, asgi.py wraps the application in SharedClientApp: every request
+on the worker's event loop reuses one pooled client, so concurrent payment
+calls share connections instead of opening a TLS session each, and the
+client is closed at lifespan shutdown. Under WSGI each async view runs in a
+short-lived event loop of its own (async_to_sync), so the client is opened
+for the request and closed when the view returns.
+
+Sync code that needs an async integration (the reCAPTCHA check, from DRF
+serializers) hands it to a LoopThread: one event loop on a daemon thread
+with a client of its own, so a process can hold many such calls in flight
+without a thread each.
+"""
+import asyncio
+import functools
+import threading
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
+import httpx
+
+_current = ContextVar('outbound_http_client', default=None)
+
+
+def new_client():
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(30.0, connect=10.0),
+        limits=httpx.Limits(max_connections=500, max_keepalive_connections=50),
+    )
+
+
+@asynccontextmanager
+async def client_scope():
+    """Provides the shared client if one is in scope, otherwise a client closed on exit."""
+    shared = _current.get()
+    if shared is not None:
+        yield shared
+        return
+    async with new_client() as client:
+        token = _current.set(client)
+        try:
+            yield client
+        finally:
+            _current.reset(token)
+
+
+def uses_client(view):
+    """Runs an async view (or view method) inside client_scope()."""
+    @functools.wraps(view)
+    async def wrapper(*args, **kwargs):
+        async with client_scope():
+            return await view(*args, **kwargs)
+    return wrapper
+
+
+def get_async_client():
+    client = _current.get()
+    if client is None:
+        raise RuntimeError("get_async_client() called outside client_scope(); decorate the view with uses_client.")
+    return client
+
+
+class SharedClientApp:
+    """ASGI wrapper that shares one client between the requests of a worker and closes it at shutdown."""
+
+    def __init__(self, app):
+        self.app = app
+        self.client = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        # Created lazily, on the loop that serves the requests.
+        if self.client is None or self.client.is_closed:
+            self.client = new_client()
+        token = _current.set(self.client)
+        try:
+            return await self.app(scope, receive, send)
+        finally:
+            _current.reset(token)
+
+    async def lifespan(self, receive, send):
+        # Django itself does not speak the lifespan protocol.
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self.client is not None:
+                    await self.client.aclose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+class LoopThread:
+    """
+    An event loop on a daemon thread, started on first use, for sync callers.
+    submit() runs a coroutine function there with the loop's client in scope
+    and returns a concurrent.futures.Future. The client lives as long as the
+    process.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._loop = None
+        self._client = None
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args):
+        return asyncio.run_coroutine_threadsafe(self._scoped(func, *args), self._running_loop())
+
+    def _running_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name=self.name, daemon=True).start()
+            return self._loop
+
+    async def _scoped(self, func, *args):
+        # Created on the loop that uses it.
+        if self._client is None:
+            self._client = new_client()
+        token = _current.set(self._client)
+        try:
+            return await func(*args)
+        finally:
+            _current.reset(token)
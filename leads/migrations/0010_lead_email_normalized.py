@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:14
+
+from django.db import migrations, models
+from django.db.models.functions import Lower, Trim
+
+
+def backfill_email_normalized(apps, schema_editor):
+    Lead = apps.get_model('leads', 'Lead')
+    Lead.objects.update(email_normalized=Lower(Trim('email')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0009_payment'),
+        ('reports', '0009_report_competitive_environment_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lead',
+            name='email_normalized',
+            field=models.CharField(blank=True, default='', editable=False, max_length=254),
+        ),
+        migrations.RunPython(backfill_email_normalized, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(fields=['email_normalized', 'lead_type'], name='lead_email_type_idx'),
+        ),
+    ]
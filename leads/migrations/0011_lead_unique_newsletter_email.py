@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:09
+
+from django.db import migrations, models
+from django.db.models import Count
+
+# Copied from the later subscriptions when the kept one has no value.
+MERGED_FIELDS = (
+    'first_name', 'last_name', 'full_name', 'country_code', 'phone', 'company_name', 'designation',
+    'country', 'address', 'city', 'state', 'zip_code', 'report_id', 'message', 'ip_address',
+)
+
+
+def merge_duplicate_subscriptions(apps, schema_editor):
+    # Keep the oldest subscription per address, fill its blanks from the later
+    # ones and move anything attached to them; the removed ids are printed.
+    Lead = apps.get_model('leads', 'Lead')
+    Payment = apps.get_model('leads', 'Payment')
+    newsletter = Lead.objects.filter(lead_type='NEWSLETTER')
+    duplicated = (newsletter.values('email_normalized').annotate(count=Count('id'))
+                  .filter(count__gt=1).values_list('email_normalized', flat=True))
+    for email in duplicated:
+        kept, *others = newsletter.filter(email_normalized=email).order_by('id')
+        for field in MERGED_FIELDS:
+            if getattr(kept, field) in (None, ''):
+                values = [getattr(lead, field) for lead in others if getattr(lead, field) not in (None, '')]
+                if values:
+                    setattr(kept, field, values[0])
+        kept.is_exported = kept.is_exported or any(lead.is_exported for lead in others)
+        kept.save()
+        removed = [lead.id for lead in others]
+        Payment.objects.filter(lead_id__in=removed).update(lead_id=kept.id)
+        Lead.objects.filter(id__in=removed).delete()
+        print(f"\n  Merged duplicate newsletter leads {removed} into lead {kept.id}", end='')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0010_lead_email_normalized'),
+    ]
+
+    operations = [
+        # Not reversible beyond dropping the constraint: merged rows are not restored.
+        migrations.RunPython(merge_duplicate_subscriptions, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='lead',
+            constraint=models.UniqueConstraint(condition=models.Q(('lead_type', 'NEWSLETTER')), fields=('email_normalized', 'lead_type'), name='lead_unique_newsletter_email'),
+        ),
+    ]
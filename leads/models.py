@@ -1,5 +1,9 @@
+from datetime import timedelta
 from django.db import models
+from django.db.models import Q
+from django.utils import timezone
 from reports.models import Report
+from .dedupe import normalize_email
 
 class Lead(models.Model):
     LEAD_TYPES = (
@@ -23,6 +27,8 @@ class Lead(models.Model):
     last_name = models.CharField(max_length=150, blank=True, null=True)
     full_name = models.CharField(max_length=255, blank=True, null=True) # Keeping for legacy
     email = models.EmailField()
+    # Lower-cased copy of email, maintained in save(); lookups use this instead of iexact.
+    email_normalized = models.CharField(max_length=254, blank=True, default='', editable=False)
     country_code = models.CharField(max_length=10, blank=True, null=True)
     phone = models.CharField(max_length=20, blank=True, null=True)
     company_name = models.CharField(max_length=255, blank=True, null=True)
@@ -45,6 +51,126 @@ class Lead(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_exported = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['email_normalized', 'lead_type'], name='lead_email_type_idx'),
+        ]
+        constraints = [
+            # The authoritative newsletter dedupe; leads/dedupe.py only saves lookups in front of it.
+            models.UniqueConstraint(fields=['email_normalized', 'lead_type'], condition=Q(lead_type='NEWSLETTER'),
+                                    name='lead_unique_newsletter_email'),
+        ]
+
     def __str__(self):
         name = self.full_name or self.email
         return f"{name} - {self.get_lead_type_display()}"
+
+    def save(self, *args, **kwargs):
+        self.email_normalized = normalize_email(self.email)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'email' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'email_normalized'}
+        super().save(*args, **kwargs)
+
+
+class Payment(models.Model):
+    """
+    One row per PayPal order. The PayPal order id is the idempotency key:
+    every callback for the same order resolves to this row, and state
+    transitions are conditional updates so only one request can capture
+    and finalise an order.
+    """
+    STATUS_CREATED = 'CREATED'
+    STATUS_CAPTURING = 'CAPTURING'
+    STATUS_COMPLETED = 'COMPLETED'
+    STATUS_FAILED = 'FAILED'
+    STATUS_CHOICES = (
+        (STATUS_CREATED, 'Created'),
+        (STATUS_CAPTURING, 'Capturing'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    )
+
+    # A capture that has not finished within this window is assumed to have
+    # died with its worker and may be claimed again.
+    CAPTURE_LEASE = timedelta(minutes=2)
+
+    lead = models.ForeignKey(Lead, on_delete=models.CASCADE, related_name="payments")
+    paypal_order_id = models.CharField(max_length=64, unique=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_CREATED)
+    capture_id = models.CharField(max_length=64, blank=True, null=True)
+    amount = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    emails_sent = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.paypal_order_id} - {self.get_status_display()}"
+
+    @property
+    def is_completed(self):
+        return self.status == self.STATUS_COMPLETED
+
+    def _claimable(self, now):
+        return Q(status__in=[self.STATUS_CREATED, self.STATUS_FAILED]) | Q(
+            status=self.STATUS_CAPTURING, updated_at__lt=now - self.CAPTURE_LEASE
+        )
+
+    def begin_capture(self):
+        """
+        Claim the order for capture. Returns True for exactly one caller;
+        concurrent or repeated callbacks get False and must not call PayPal.
+        """
+        now = timezone.now()
+        claimed = Payment.objects.filter(self._claimable(now), pk=self.pk).update(
+            status=self.STATUS_CAPTURING, updated_at=now
+        )
+        if claimed:
+            self.status = self.STATUS_CAPTURING
+            self.updated_at = now
+        return bool(claimed)
+
+    async def abegin_capture(self):
+        now = timezone.now()
+        claimed = await Payment.objects.filter(self._claimable(now), pk=self.pk).aupdate(
+            status=self.STATUS_CAPTURING, updated_at=now
+        )
+        if claimed:
+            self.status = self.STATUS_CAPTURING
+            self.updated_at = now
+        return bool(claimed)
+
+    def mark_completed(self, capture_id=None):
+        """Move to COMPLETED. Returns False if the order was already completed."""
+        updated = Payment.objects.filter(pk=self.pk).exclude(status=self.STATUS_COMPLETED).update(
+            status=self.STATUS_COMPLETED, capture_id=capture_id, updated_at=timezone.now()
+        )
+        self.refresh_from_db(fields=['status', 'capture_id', 'updated_at'])
+        return bool(updated)
+
+    async def amark_completed(self, capture_id=None):
+        updated = await Payment.objects.filter(pk=self.pk).exclude(status=self.STATUS_COMPLETED).aupdate(
+            status=self.STATUS_COMPLETED, capture_id=capture_id, updated_at=timezone.now()
+        )
+        await self.arefresh_from_db(fields=['status', 'capture_id', 'updated_at'])
+        return bool(updated)
+
+    def mark_failed(self):
+        """Release a claimed capture so the buyer can retry."""
+        Payment.objects.filter(pk=self.pk, status=self.STATUS_CAPTURING).update(
+            status=self.STATUS_FAILED, updated_at=timezone.now()
+        )
+        self.refresh_from_db(fields=['status', 'updated_at'])
+
+    async def amark_failed(self):
+        await Payment.objects.filter(pk=self.pk, status=self.STATUS_CAPTURING).aupdate(
+            status=self.STATUS_FAILED, updated_at=timezone.now()
+        )
+        await self.arefresh_from_db(fields=['status', 'updated_at'])
+
+    def claim_emails(self):
+        """Returns True for exactly one caller, which is responsible for sending the emails."""
+        return bool(Payment.objects.filter(pk=self.pk, emails_sent=False).update(emails_sent=True))
+
+    async def aclaim_emails(self):
+        return bool(await Payment.objects.filter(pk=self.pk, emails_sent=False).aupdate(emails_sent=True))
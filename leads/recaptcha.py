@@ -0,0 +1,160 @@
+"""
+Async reCAPTCHA siteverify client.
+
+Async views await averify_recaptcha() directly (inside uses_client). The
+sync serializers start it with submit_verification(), which runs it on a
+background event loop, and collect the verdict with resolve().
+
+Verdicts are cached per submission (token, client IP and email): tokens
+are single-use, so a client that retries a submission would otherwise get
+"timeout-or-duplicate" back from Google for a token that already passed.
+Keying on the whole submission means a solved token cannot be replayed for
+another email or from another address. A small circuit breaker stops us
+calling siteverify while it is failing; in that state (and whenever the
+provider is slower than RECAPTCHA_TIMEOUT) the outcome is decided by
+RECAPTCHA_FAIL_OPEN.
+
+The caller still waits for the verdict, so submission latency includes the
+siteverify round trip; RECAPTCHA_TIMEOUT caps it rather than removing it.
+"""
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import httpx
+from django.conf import settings
+from django.core.cache import cache
+
+from .dedupe import normalize_email
+from .http import LoopThread, get_async_client
+
+logger = logging.getLogger(__name__)
+
+SITEVERIFY_URL = 'https://www.google.com/recaptcha/api/siteverify'
+
+PASS = 'pass'
+FAIL = 'fail'
+UNKNOWN = 'unknown'
+
+# Error codes that mean our request was wrong, not the visitor's token.
+CONFIG_ERRORS = {'missing-input-secret', 'invalid-input-secret', 'bad-request'}
+
+_loop = LoopThread('recaptcha')
+
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures; after `cooldown` seconds one probe call is let through."""
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if not self._probing and time.monotonic() - self._opened_at >= self.cooldown:
+                # Half-open: only this caller goes through until the probe reports back.
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probing or (self._failures >= self.threshold and self._opened_at is None):
+                # A failed probe re-opens the circuit for another cooldown.
+                self._opened_at = time.monotonic()
+                self._probing = False
+                logger.warning("ReCaptcha circuit opened after %s failures", self._failures)
+
+
+breaker = CircuitBreaker(
+    threshold=getattr(settings, 'RECAPTCHA_BREAKER_THRESHOLD', 5),
+    cooldown=getattr(settings, 'RECAPTCHA_BREAKER_COOLDOWN', 30),
+)
+
+
+def _timeout():
+    return getattr(settings, 'RECAPTCHA_TIMEOUT', 3)
+
+
+def _cache_key(token, remote_ip, email):
+    submission = '\0'.join([token, remote_ip or '', normalize_email(email)])
+    return 'recaptcha:verdict:' + hashlib.sha256(submission.encode()).hexdigest()
+
+
+def _payload(token, remote_ip=None):
+    data = {
+        'secret': settings.RECAPTCHA_PRIVATE_KEY,
+        'response': token,
+    }
+    if remote_ip:
+        data['remoteip'] = remote_ip
+    return data
+
+
+async def _verdict_from_result(key, result):
+    logger.info(f"ReCaptcha verification result: {result}")
+    if result.get('success'):
+        verdict = PASS
+    elif CONFIG_ERRORS.intersection(result.get('error-codes', [])):
+        logger.error(f"ReCaptcha misconfigured: {result}")
+        return UNKNOWN
+    else:
+        verdict = FAIL
+    await cache.aset(key, verdict, getattr(settings, 'RECAPTCHA_VERDICT_TTL', 300))
+    return verdict
+
+
+async def averify_recaptcha(token, remote_ip=None, email=None):
+    """Returns PASS, FAIL or UNKNOWN for a submission's token, consulting the verdict cache first."""
+    key = _cache_key(token, remote_ip, email)
+    cached = await cache.aget(key)
+    if cached:
+        return cached
+    if not breaker.allow():
+        return UNKNOWN
+    try:
+        response = await get_async_client().post(SITEVERIFY_URL, data=_payload(token, remote_ip), timeout=_timeout())
+        result = response.json()
+    except (httpx.HTTPError, ValueError) as e:
+        logger.warning(f"ReCaptcha verification unavailable: {e}")
+        breaker.record_failure()
+        return UNKNOWN
+    breaker.record_success()
+    return await _verdict_from_result(key, result)
+
+
+def submit_verification(token, remote_ip=None, email=None):
+    """Starts averify_recaptcha on the background loop and returns its Future."""
+    return _loop.submit(averify_recaptcha, token, remote_ip, email)
+
+
+def resolve(future):
+    """
+    Waits at most RECAPTCHA_TIMEOUT for a submitted verification and returns
+    True if the submission should be accepted. A slow call keeps running and
+    still caches its verdict for any retry.
+    """
+    try:
+        verdict = future.result(timeout=_timeout())
+    except FutureTimeout:
+        logger.warning("ReCaptcha verification timed out")
+        breaker.record_failure()
+        verdict = UNKNOWN
+    if verdict == UNKNOWN:
+        return getattr(settings, 'RECAPTCHA_FAIL_OPEN', True)
+    return verdict == PASS
@@ -1,3 +1,295 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import httpx
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from reports.models import Report
+from reports.synthetic import build_reports
+
+from . import http, recaptcha, views
+from .dedupe import LeadDedupe
+from .http import SharedClientApp, get_async_client, uses_client
+from .models import Lead, Payment
+
+
+class PaymentCaptureTests(TestCase):
+    """The capture state machine: one claim per order, no second capture once completed."""
+
+    @classmethod
+    def setUpTestData(cls):
+        build_reports(1)
+        cls.report = Report.objects.get()
+        cls.lead = Lead.objects.create(email='buyer@example.com', first_name='Ada', last_name='Lovelace',
+                                       lead_type='PURCHASE', license_type='single', report=cls.report)
+
+    def setUp(self):
+        self.payment = Payment.objects.create(lead=self.lead, paypal_order_id='ORDER-1')
+
+    def test_repeated_return_after_completion_does_not_call_paypal(self):
+        self.assertTrue(self.payment.begin_capture())
+        self.assertTrue(self.payment.mark_completed('CAPTURE-1'))
+        self.assertFalse(self.payment.begin_capture())
+
+        url = reverse('paypal-return') + f'?lead_id={self.lead.id}&token=ORDER-1'
+        with mock.patch.object(views, 'get_paypal_access_token') as get_token:
+            response = self.client.get(url)
+        get_token.assert_not_called()
+        success_url = reverse('report-detail', kwargs={'slug': self.report.slug}) + '?payment=success'
+        self.assertRedirects(response, success_url, fetch_redirect_response=False)
+        self.payment.refresh_from_db()
+        self.assertEqual((self.payment.status, self.payment.capture_id), (Payment.STATUS_COMPLETED, 'CAPTURE-1'))
+
+    def test_finalise_runs_once(self):
+        self.payment.begin_capture()
+        with mock.patch.object(views, 'send_lead_emails_task') as send:
+            self.assertTrue(async_to_sync(views.finalise_payment)(self.payment, capture_id='CAPTURE-1'))
+            self.assertFalse(async_to_sync(views.finalise_payment)(self.payment, capture_id='CAPTURE-2'))
+        self.assertEqual(send.call_count, 1)
+        self.lead.refresh_from_db()
+        self.assertEqual(self.lead.message.count('[PAYPAL ORDER ID: ORDER-1]'), 1)
+
+    def test_concurrent_claim_loses(self):
+        # Two callbacks loaded the row before either claimed it.
+        other = Payment.objects.get(pk=self.payment.pk)
+        self.assertTrue(self.payment.begin_capture())
+        self.assertFalse(other.begin_capture())
+        self.assertEqual(other.status, Payment.STATUS_CREATED)
+
+    def test_expired_lease_is_reclaimed(self):
+        self.assertTrue(self.payment.begin_capture())
+        self.assertFalse(Payment.objects.get(pk=self.payment.pk).begin_capture())
+
+        expired = timezone.now() - Payment.CAPTURE_LEASE - timedelta(seconds=1)
+        Payment.objects.filter(pk=self.payment.pk).update(updated_at=expired)
+        self.assertTrue(Payment.objects.get(pk=self.payment.pk).begin_capture())
+
+    def test_unexpected_paypal_error_releases_the_claim(self):
+        timeout = httpx.ReadTimeout('timed out')
+        client = mock.Mock(post=mock.AsyncMock(side_effect=timeout))
+        return_url = reverse('paypal-return') + f'?lead_id={self.lead.id}&token=ORDER-1'
+        with mock.patch.object(views, 'get_paypal_access_token', mock.AsyncMock(return_value='access')), \
+                mock.patch.object(views, 'get_async_client', return_value=client):
+            self.client.get(return_url)
+        self.assertTrue(Payment.objects.get(pk=self.payment.pk).begin_capture())
+
+        Payment.objects.filter(pk=self.payment.pk).update(status=Payment.STATUS_CREATED)
+        with mock.patch.object(views, 'verify_paypal_payment', mock.AsyncMock(side_effect=timeout)):
+            response = self.client.post(reverse('paypal_capture'), {'orderID': 'ORDER-1', 'leadID': self.lead.id},
+                                        content_type='application/json')
+        self.assertEqual(response.status_code, 500)
+        self.assertTrue(Payment.objects.get(pk=self.payment.pk).begin_capture())
+
+    def test_failed_capture_can_be_retried(self):
+        self.assertTrue(self.payment.begin_capture())
+        self.payment.mark_failed()
+        self.assertEqual(self.payment.status, Payment.STATUS_FAILED)
+        self.assertTrue(self.payment.begin_capture())
+
+
+class OutboundClientTests(SimpleTestCase):
+    def test_wsgi_requests_close_their_client(self):
+        clients = []
+
+        @uses_client
+        async def view():
+            clients.append(get_async_client())
+
+        # Under WSGI every async view call gets an event loop of its own.
+        async_to_sync(view)()
+        async_to_sync(view)()
+        self.assertEqual(len(clients), 2)
+        self.assertTrue(all(client.is_closed for client in clients))
+
+    def test_asgi_requests_share_one_client_until_shutdown(self):
+        clients = []
+
+        @uses_client
+        async def django_app(scope, receive, send):
+            clients.append(get_async_client())
+
+        app = SharedClientApp(django_app)
+
+        async def serve():
+            await app({'type': 'http'}, None, None)
+            await app({'type': 'http'}, None, None)
+            self.assertFalse(clients[0].is_closed)
+            messages = iter([{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}])
+            sent = []
+
+            async def receive():
+                return next(messages)
+
+            async def send(message):
+                sent.append(message['type'])
+
+            await app({'type': 'lifespan'}, receive, send)
+            return sent
+
+        sent = async_to_sync(serve)()
+        self.assertIs(clients[0], clients[1])
+        self.assertTrue(clients[0].is_closed)
+        self.assertEqual(sent, ['lifespan.startup.complete', 'lifespan.shutdown.complete'])
+
+
+class RecaptchaTests(SimpleTestCase):
+    """Siteverify is answered by an httpx mock transport, from a queue of results (or exceptions)."""
+
+    def setUp(self):
+        cache.clear()
+        self.results = []
+        self.calls = 0
+        transport = httpx.MockTransport(self.siteverify)
+        for target, value in (('breaker', recaptcha.CircuitBreaker(threshold=2, cooldown=60)),
+                              ('_loop', http.LoopThread('recaptcha-test'))):
+            patcher = mock.patch.object(recaptcha, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(http, 'new_client', lambda: httpx.AsyncClient(transport=transport))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def siteverify(self, request):
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return httpx.Response(200, json=result)
+
+    def verify(self, token, remote_ip=None, email=None):
+        # From an async view: the request's own client.
+        return async_to_sync(uses_client(recaptcha.averify_recaptcha))(token, remote_ip, email)
+
+    def test_verdict_is_reused_only_for_the_same_submission(self):
+        self.results = [{'success': True}, {'success': False, 'error-codes': ['timeout-or-duplicate']}]
+        self.assertEqual(self.verify('token', '10.0.0.1', 'a@example.com'), recaptcha.PASS)
+        # A retry of the same submission is answered from the cache.
+        self.assertEqual(self.verify('token', '10.0.0.1', 'A@example.com'), recaptcha.PASS)
+        # Replaying the solved token for someone else goes back to Google, which rejects it.
+        self.assertEqual(self.verify('token', '10.0.0.1', 'b@example.com'), recaptcha.FAIL)
+        self.assertEqual(self.calls, 2)
+
+    def test_sync_callers_use_the_background_loop(self):
+        self.results = [{'success': True}, {'success': False}]
+        self.assertTrue(recaptcha.resolve(recaptcha.submit_verification('token-1')))
+        self.assertFalse(recaptcha.resolve(recaptcha.submit_verification('token-2')))
+        self.assertEqual(self.calls, 2)
+
+    def test_fail_open_or_closed_when_unavailable(self):
+        self.results = [httpx.ConnectError('down'), httpx.ConnectError('down')]
+        with override_settings(RECAPTCHA_FAIL_OPEN=True):
+            self.assertTrue(recaptcha.resolve(recaptcha.submit_verification('token-1')))
+        with override_settings(RECAPTCHA_FAIL_OPEN=False):
+            self.assertFalse(recaptcha.resolve(recaptcha.submit_verification('token-2')))
+        # Two failures opened the circuit: siteverify is not called at all now.
+        with override_settings(RECAPTCHA_FAIL_OPEN=False):
+            self.assertFalse(recaptcha.resolve(recaptcha.submit_verification('token-3')))
+        self.assertEqual(self.calls, 2)
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch.object(recaptcha.time, 'monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = recaptcha.CircuitBreaker(threshold=3, cooldown=30)
+
+    def open(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+
+    def test_opens_after_threshold_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertFalse(self.breaker.allow())
+
+    def test_success_resets_the_count(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow())
+
+    def test_half_open_lets_one_probe_through(self):
+        self.open()
+        self.now += 30
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+        self.breaker.record_success()
+        self.assertTrue(self.breaker.allow())
+        self.assertTrue(self.breaker.allow())
+
+    def test_failed_probe_reopens(self):
+        self.open()
+        self.now += 30
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertFalse(self.breaker.allow())
+        self.now += 29
+        self.assertFalse(self.breaker.allow())
+        self.now += 1
+        self.assertTrue(self.breaker.allow())
+
+
+class NewsletterDedupeTests(TestCase):
+    """The per-process filter may lag behind the database; the unique constraint must not."""
+
+    def setUp(self):
+        cache.clear()  # rate-limit buckets
+        self.subscribers = LeadDedupe('NEWSLETTER')
+        for target, value in (('newsletter_subscribers', self.subscribers), ('send_lead_emails_task', mock.Mock())):
+            patcher = mock.patch.object(views, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def subscribe(self, email):
+        with mock.patch.object(recaptcha, 'averify_recaptcha', mock.AsyncMock(return_value=recaptcha.PASS)):
+            return self.client.post(reverse('newsletter-subscribe'), {'email': email, 'captcha': 'token'},
+                                    content_type='application/json')
+
+    def subscriptions(self, email):
+        return Lead.objects.filter(email_normalized=email, lead_type='NEWSLETTER').count()
+
+    def test_first_and_repeat_subscription(self):
+        self.assertEqual(self.subscribe('new@example.com').status_code, 201)
+        self.assertEqual(self.subscribe('New@Example.com ').status_code, 200)
+        self.assertEqual(self.subscriptions('new@example.com'), 1)
+
+    def test_subscription_from_another_worker(self):
+        self.assertFalse(self.subscribers.exists('other@example.com'))  # warms the filter
+        Lead.objects.create(email='other@example.com', lead_type='NEWSLETTER')
+        self.assertFalse(self.subscribers.exists('other@example.com'))  # not synced yet
+
+        response = self.subscribe('other@example.com')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.subscriptions('other@example.com'), 1)
+        self.assertTrue(self.subscribers.exists('other@example.com'))
+
+    def test_lead_edited_into_a_subscription(self):
+        lead = Lead.objects.create(email='edited@example.com', lead_type='CONTACT')
+        Lead.objects.create(email='later@example.com', lead_type='NEWSLETTER')
+        self.assertFalse(self.subscribers.exists('edited@example.com'))
+        lead.lead_type = 'NEWSLETTER'
+        lead.save()
+        # The filter only catches up on ids above the last one it saw, so it never learns about this row.
+        self.subscribers._synced_at = 0
+        self.assertFalse(self.subscribers.exists('edited@example.com'))
+
+        self.assertEqual(self.subscribe('edited@example.com').status_code, 200)
+        self.assertEqual(self.subscriptions('edited@example.com'), 1)
+
+    def test_inquiry_endpoint_for_a_subscribed_address(self):
+        Lead.objects.create(email='listed@example.com', lead_type='NEWSLETTER')
+        response = self.client.post(reverse('lead-create'), {'email': 'Listed@example.com', 'lead_type': 'NEWSLETTER'},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'message': 'You are already subscribed!'})
+        self.assertEqual(self.subscriptions('listed@example.com'), 1)
@@ -1,23 +1,25 @@
 from django.views.generic.edit import CreateView
 from django.views import View
-from django.shortcuts import get_object_or_404, redirect, render
+from django.shortcuts import get_object_or_404, aget_object_or_404, redirect, render
 from django.http import JsonResponse
 from django.urls import reverse
 from django.contrib import messages
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from reports.models import Report
-from .models import Lead
+from .models import Lead, Payment
 from .forms import LeadForm, CheckoutForm
 from django.core.mail import send_mail, EmailMessage
 from django.conf import settings
+from django.db import IntegrityError, transaction
 from rest_framework import generics, status
 from rest_framework.response import Response
 from .serializers import LeadSerializer
+from .http import get_async_client, uses_client
+from .dedupe import newsletter_subscribers
 import logging
 import os
 import threading
-import requests
 import base64
 import uuid
 
@@ -42,13 +44,13 @@ def clean_paypal_payload(data):
         ]
     return data
 
-def set_paypal_stc(tracking_id, lead, access_token=None):
+async def set_paypal_stc(tracking_id, lead, access_token=None):
     """
     Invokes the RISK/STC (Set Transaction Context) API.
     https://developer.paypal.com/docs/limited-release/raas/v1/api/
     """
     try:
-        token = access_token or get_paypal_access_token()
+        token = access_token or await get_paypal_access_token()
         if not token:
             return False
             
@@ -78,7 +80,7 @@ def set_paypal_stc(tracking_id, lead, access_token=None):
             item for item in stc_data["additional_data"] if item["value"]
         ]
         
-        response = requests.put(url, headers=headers, json=stc_data, timeout=10)
+        response = await get_async_client().put(url, headers=headers, json=stc_data, timeout=10)
         if response.status_code not in [200, 204]:
             logger.error(f"PayPal STC API failed ({response.status_code}): {response.text}")
             return False
@@ -89,13 +91,16 @@ def set_paypal_stc(tracking_id, lead, access_token=None):
 
 
 def get_paypal_base_url():
+    # Explicit override, e.g. to point at a local stub when benchmarking
+    if os.environ.get('PAYPAL_API_BASE'):
+        return os.environ['PAYPAL_API_BASE'].rstrip('/')
     mode = os.environ.get('PAYPAL_MODE', 'sandbox')
     return "https://api-m.paypal.com" if mode == 'live' else "https://api-m.sandbox.paypal.com"
 
 def get_site_base_url():
     return "https://marketsnxt.com"
 
-def get_paypal_access_token():
+async def get_paypal_access_token():
     try:
         client_id = os.environ.get('PAYPAL_CLIENT_ID')
         client_secret = os.environ.get('PAYPAL_CLIENT_SECRET')
@@ -108,7 +113,7 @@ def get_paypal_access_token():
             "Accept-Language": "en_US"
         }
 
-        response = requests.post(
+        response = await get_async_client().post(
             url,
             auth=(client_id, client_secret),
             headers=headers,
@@ -125,14 +130,14 @@ def get_paypal_access_token():
         logger.error(f"Error getting PayPal Token: {e}")
         return None
 
-def verify_paypal_payment(order_id, expected_price=None):
+async def verify_paypal_payment(order_id, expected_price=None):
     """
     Verifies that the PayPal order is actually COMPLETED and the payment is captured.
     Also verifies the amount if expected_price is provided.
     Returns (True, None) if valid, (False, error_message) if invalid.
     """
     try:
-        token = get_paypal_access_token()
+        token = await get_paypal_access_token()
         if not token:
             return False, "Could not authenticate with Payment Gateway"
 
@@ -144,7 +149,7 @@ def verify_paypal_payment(order_id, expected_price=None):
             "Authorization": f"Bearer {token}"
         }
 
-        response = requests.get(url, headers=headers, timeout=15)
+        response = await get_async_client().get(url, headers=headers, timeout=15)
         if response.status_code != 200:
             return False, f"Could not retrieve order details: {response.text}"
 
@@ -299,6 +304,38 @@ Client Relations Desk"""
         logger.error(f"Error sending lead emails: {e}", exc_info=True)
         # In a thread, we can't show messages to user, so we just log clearly
 
+async def finalise_payment(payment, capture_id=None, payer=None, address=None, note='CAPTURED'):
+    """
+    Completes a payment exactly once. The request that wins the transition
+    annotates the lead, applies payer details and sends the emails; any
+    later callback for the same order is a no-op.
+    """
+    if not await payment.amark_completed(capture_id):
+        return False
+
+    lead = payment.lead
+    capture_part = f" [CAPTURE ID: {capture_id}]" if capture_id else ""
+    lead.message = f"{lead.message}\n\n[PAYPAL ORDER ID: {payment.paypal_order_id}]{capture_part} [{note}]"
+
+    if payer:
+        lead.email      = payer.get('email_address', lead.email)
+        lead.first_name = payer.get('name', {}).get('given_name', lead.first_name)
+        lead.last_name  = payer.get('name', {}).get('surname',    lead.last_name)
+        lead.full_name  = f"{lead.first_name} {lead.last_name}".strip()
+
+        if address:
+            lead.address  = address.get('address_line_1', lead.address)
+            lead.city     = address.get('admin_area_2',   lead.city)
+            lead.state    = address.get('admin_area_1',   lead.state)
+            lead.zip_code = address.get('postal_code',    lead.zip_code)
+            lead.country  = address.get('country_code',   lead.country)
+
+    await lead.asave()
+
+    if await payment.aclaim_emails():
+        threading.Thread(target=send_lead_emails_task, args=(lead,)).start()
+    return True
+
 @method_decorator(csrf_exempt, name='dispatch')
 class LeadCreateAPIView(generics.CreateAPIView):
     queryset = Lead.objects.all()
@@ -309,13 +346,21 @@ class LeadCreateAPIView(generics.CreateAPIView):
     def post(self, request, *args, **kwargs):
         try:
             return super().post(request, *args, **kwargs)
+        except IntegrityError as e:
+            if request.data.get('lead_type') == 'NEWSLETTER':
+                # Same answer as NewsletterSubscribeAPIView for an address already on the list.
+                newsletter_subscribers.add(request.data.get('email'))
+                return Response({'message': 'You are already subscribed!'}, status=status.HTTP_200_OK)
+            error = e
         except Exception as e:
-            logger.error(f"Error in LeadCreateAPIView: {e}", exc_info=True)
-            return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
+            error = e
+        logger.error(f"Error in LeadCreateAPIView: {error}", exc_info=error)
+        return JsonResponse({'status': 'error', 'message': str(error)}, status=500)
 
     def perform_create(self, serializer):
         logger.info(f"Creating lead from API: {serializer.validated_data.get('email')}")
-        lead = serializer.save()
+        with transaction.atomic():
+            lead = serializer.save()
         # Run email in thread
         threading.Thread(target=send_lead_emails_task, args=(lead,)).start()
 
@@ -561,7 +606,9 @@ class CapturePaymentView(View):
     """
     Handles capturing the payment after user approves it on the PayPal side.
     """
-    def post(self, request, *args, **kwargs):
+    @uses_client
+    async def post(self, request, *args, **kwargs):
+        claimed = None
         try:
             data = json.loads(request.body)
             order_id = data.get('orderID')
@@ -571,7 +618,19 @@ class CapturePaymentView(View):
                 return JsonResponse({'status': 'error', 'message': 'Missing orderID or leadID'}, status=400)
 
             # Retrieve the lead
-            lead = get_object_or_404(Lead, id=lead_id)
+            lead = await aget_object_or_404(Lead.objects.select_related('report'), id=lead_id)
+
+            payment, _ = await Payment.objects.aget_or_create(paypal_order_id=order_id, defaults={'lead': lead})
+            if payment.lead_id != lead.id:
+                return JsonResponse({'status': 'error', 'message': 'Order does not belong to this lead'}, status=400)
+            payment.lead = lead
+
+            # Repeated callbacks are answered from stored state without calling PayPal
+            if payment.is_completed:
+                return JsonResponse({'status': 'success'})
+            if not await payment.abegin_capture():
+                return JsonResponse({'status': 'pending', 'message': 'Payment is already being processed'}, status=202)
+            claimed = payment
 
             # Get expected price
             price = 0
@@ -581,32 +640,33 @@ class CapturePaymentView(View):
             elif lead.license_type == 'data':     price = lead.report.data_pack_price
 
             # Verify Payment with PayPal (includes deep capture verification)
-            is_valid, result = verify_paypal_payment(order_id, expected_price=price)
+            is_valid, result = await verify_paypal_payment(order_id, expected_price=price)
             if not is_valid:
+                 await payment.amark_failed()
                  return JsonResponse({'status': 'error', 'message': f'Payment verification failed: {result}'}, status=400)
 
-            # Mark as paid (result is capture_id)
-            lead.message = f"{lead.message}\n\n[PAYPAL ORDER ID: {order_id}] [CAPTURE ID: {result}] [VERIFIED]"
-            lead.save()
-
-            # Trigger emails in background
-            threading.Thread(target=send_lead_emails_task, args=(lead,)).start()
+            # Mark as paid (result is capture_id) and trigger emails once
+            await finalise_payment(payment, capture_id=result, note='VERIFIED')
 
             return JsonResponse({'status': 'success'})
         except Exception as e:
             logger.error(f"PayPal capture error: {e}")
+            if claimed is not None:
+                # Release the claim so the buyer can retry now rather than after CAPTURE_LEASE.
+                await claimed.amark_failed()
             return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
 
 @method_decorator(csrf_exempt, name='dispatch')
 class CreatePayPalOrderView(View):
-    def post(self, request, *args, **kwargs):
+    @uses_client
+    async def post(self, request, *args, **kwargs):
         try:
             data = json.loads(request.body)
             lead_id = data.get('lead_id')
             if not lead_id:
                 return JsonResponse({'error': 'Missing lead_id'}, status=400)
 
-            lead = get_object_or_404(Lead, id=lead_id)
+            lead = await aget_object_or_404(Lead.objects.select_related('report'), id=lead_id)
 
             # Get price from license type
             price = 0
@@ -618,7 +678,7 @@ class CreatePayPalOrderView(View):
             if not price:
                 return JsonResponse({'error': 'Invalid price configuration'}, status=400)
 
-            token = get_paypal_access_token()
+            token = await get_paypal_access_token()
             if not token:
                 logger.error("PayPal auth failed when creating order")
                 return JsonResponse({'error': 'Failed to authenticate with PayPal. Please try again.'}, status=500)
@@ -629,7 +689,7 @@ class CreatePayPalOrderView(View):
             # Generate Tracking ID for STC (Risk assessment)
             # This must be done BEFORE constructing the return_url
             tracking_id = f"MNXT-TRK-{lead.id}-{uuid.uuid4().hex[:6]}"
-            set_paypal_stc(tracking_id, lead, access_token=token)
+            await set_paypal_stc(tracking_id, lead, access_token=token)
 
             # Construct redirection URLs
             # CRITICAL: Always use production domain for redirects to avoid 'localhost' issues with live credentials
@@ -707,7 +767,7 @@ class CreatePayPalOrderView(View):
                 "PayPal-Request-Id": str(uuid.uuid4())
             }
 
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
+            response = await get_async_client().post(url, headers=headers, json=payload, timeout=30)
             
             # --- DEBUG LOGGING FOR LOCAL TESTING ---
             logger.info(f"--- PAYPAL CREATE ORDER RESPONSE ({response.status_code}) ---")
@@ -717,6 +777,13 @@ class CreatePayPalOrderView(View):
             if response.status_code in [200, 201]:
                 order_data = response.json()
                 links = order_data.get('links', [])
+
+                # Register the order so return/capture callbacks can be made idempotent
+                if order_data.get('id'):
+                    await Payment.objects.aget_or_create(
+                        paypal_order_id=order_data['id'],
+                        defaults={'lead': lead, 'amount': price_str}
+                    )
                 
                 # Modern flows with payment_source often use 'payer-action' instead of 'approve'
                 # We check for both to ensure compatibility
@@ -736,7 +803,8 @@ class CreatePayPalOrderView(View):
             return JsonResponse({'error': 'An unexpected error occurred. Please try again.'}, status=500)
 
 class PayPalReturnView(View):
-    def get(self, request, *args, **kwargs):
+    @uses_client
+    async def get(self, request, *args, **kwargs):
         lead_id = request.GET.get('lead_id')
         token   = request.GET.get('token')  # PayPal Order ID
 
@@ -744,22 +812,37 @@ class PayPalReturnView(View):
             logger.error(f"PayPal return missing params: lead_id={lead_id}, token={token}")
             return redirect('/')
 
+        claimed = None
         try:
-            lead = get_object_or_404(Lead, id=lead_id)
+            lead = await aget_object_or_404(Lead.objects.select_related('report'), id=lead_id)
+            success_url = reverse('report-detail', kwargs={'slug': lead.report.slug}) + "?payment=success"
 
-            # ── Idempotency guard: already captured? Redirect straight to success ──
-            if '[CAPTURED]' in (lead.message or ''):
-                logger.info(f"Lead {lead_id} already captured — skipping duplicate capture")
-                return redirect(reverse('report-detail', kwargs={'slug': lead.report.slug}) + "?payment=success")
+            # Map back to URL slug
+            url_license = lead.license_type
+            if url_license == 'data': url_license = 'datapack'
+            failed_url = reverse('checkout', kwargs={'slug': lead.report.slug, 'license_type': url_license}) + "?payment=failed"
+
+            payment, _ = await Payment.objects.aget_or_create(paypal_order_id=token, defaults={'lead': lead})
+            if payment.lead_id != lead.id:
+                logger.error(f"PayPal order {token} belongs to lead {payment.lead_id}, not {lead_id}")
+                return redirect(failed_url)
+            payment.lead = lead
+
+            # ── Idempotency guard: repeated returns are answered from stored state ──
+            if payment.is_completed:
+                logger.info(f"Order {token} already captured — skipping duplicate capture")
+                return redirect(success_url)
+            if not await payment.abegin_capture():
+                logger.info(f"Order {token} is being captured by another request")
+                return redirect(reverse('report-detail', kwargs={'slug': lead.report.slug}) + "?payment=processing")
+            claimed = payment
 
             # ── Get access token ──
-            access_token = get_paypal_access_token()
+            access_token = await get_paypal_access_token()
             if not access_token:
                 logger.error("PayPal auth failed during capture")
-                # Map back to URL slug
-                url_license = lead.license_type
-                if url_license == 'data': url_license = 'datapack'
-                return redirect(reverse('checkout', kwargs={'slug': lead.report.slug, 'license_type': url_license}) + "?payment=failed")
+                await payment.amark_failed()
+                return redirect(failed_url)
 
             base_url = get_paypal_base_url()
             url = f"{base_url}/v2/checkout/orders/{token}/capture"
@@ -767,8 +850,8 @@ class PayPalReturnView(View):
             headers = {
                 "Content-Type": "application/json",
                 "Authorization": f"Bearer {access_token}",
-                # Unique Id for each capture attempt
-                "PayPal-Request-Id": str(uuid.uuid4()),
+                # Keyed on the order so PayPal also de-duplicates retried captures
+                "PayPal-Request-Id": f"capture-{token}",
             }
             
             # Pass the tracking_id from the STC/RISK API call if available
@@ -781,7 +864,7 @@ class PayPalReturnView(View):
             logger.info(headers)
             # ----------------------------------------
 
-            response = requests.post(url, headers=headers, json={}, timeout=30)
+            response = await get_async_client().post(url, headers=headers, json={}, timeout=30)
             
             # --- DEBUG LOGGING FOR LOCAL TESTING ---
             logger.info(f"--- PAYPAL CAPTURE RESPONSE ({response.status_code}) ---")
@@ -795,6 +878,7 @@ class PayPalReturnView(View):
                 # Ensure the capture status is COMPLETED and verify amount
                 purchase_units = capture_data.get('purchase_units', [])
                 capture_status = None
+                capture_id = None
                 
                 if purchase_units:
                     # Get expected price for verification
@@ -817,61 +901,42 @@ class PayPalReturnView(View):
                     
                     if not actual_amount or float(actual_amount) != float(expected_price):
                         logger.error(f"PayPal Amount Mismatch for lead {lead.id}: Expected {expected_price}, got {actual_amount}")
-                        url_license = lead.license_type
-                        if url_license == 'data': url_license = 'datapack'
-                        return redirect(reverse('checkout', kwargs={'slug': lead.report.slug, 'license_type': url_license}) + "?payment=failed&reason=amount_mismatch")
+                        await payment.amark_failed()
+                        return redirect(failed_url + "&reason=amount_mismatch")
 
                     if captures:
                         capture_status = captures[0].get('status')
+                        capture_id = captures[0].get('id')
                 
                 if capture_status != 'COMPLETED':
                     logger.error(f"PayPal Order {token} failed: Status is {capture_status}")
-                    url_license = lead.license_type
-                    if url_license == 'data': url_license = 'datapack'
-                    return redirect(reverse('checkout', kwargs={'slug': lead.report.slug, 'license_type': url_license}) + f"?payment=failed&reason={capture_status}")
-
-                payer = capture_data.get('payer', {})
-                lead.message = f"{lead.message}\n\n[PAYPAL ORDER ID: {token}] [CAPTURED]"
-
-                if payer:
-                    lead.email      = payer.get('email_address', lead.email)
-                    lead.first_name = payer.get('name', {}).get('given_name', lead.first_name)
-                    lead.last_name  = payer.get('name', {}).get('surname',    lead.last_name)
-                    lead.full_name  = f"{lead.first_name} {lead.last_name}".strip()
-
-                    purchase_units = capture_data.get('purchase_units', [])
-                    if purchase_units:
-                        address = purchase_units[0].get('shipping', {}).get('address', {})
-                        if address:
-                            lead.address  = address.get('address_line_1', lead.address)
-                            lead.city     = address.get('admin_area_2',   lead.city)
-                            lead.state    = address.get('admin_area_1',   lead.state)
-                            lead.zip_code = address.get('postal_code',    lead.zip_code)
-                            lead.country  = address.get('country_code',   lead.country)
-
-                lead.save()
-                threading.Thread(target=send_lead_emails_task, args=(lead,)).start()
-                return redirect(reverse('report-detail', kwargs={'slug': lead.report.slug}) + "?payment=success")
+                    await payment.amark_failed()
+                    return redirect(failed_url + f"&reason={capture_status}")
+
+                address = None
+                if purchase_units:
+                    address = purchase_units[0].get('shipping', {}).get('address', {})
+
+                await finalise_payment(payment, capture_id=capture_id, payer=capture_data.get('payer', {}), address=address)
+                return redirect(success_url)
 
             # ── 422: Already captured (e.g. user refreshed) → treat as success ──
             elif response.status_code == 422:
                 logger.warning(f"PayPal 422 for lead {lead_id} order {token} — already captured, treating as success")
-                if '[CAPTURED]' not in (lead.message or ''):
-                    lead.message = f"{lead.message}\n\n[PAYPAL ORDER ID: {token}] [CAPTURED-DUPLICATE]"
-                    lead.save()
-                    threading.Thread(target=send_lead_emails_task, args=(lead,)).start()
-                return redirect(reverse('report-detail', kwargs={'slug': lead.report.slug}) + "?payment=success")
+                await finalise_payment(payment, note='CAPTURED-DUPLICATE')
+                return redirect(success_url)
 
             # ── Any other failure → back to checkout with error flag ──
             else:
                 logger.error(f"PayPal capture failed ({response.status_code}): {response.text}")
-                # Map back to URL slug
-                url_license = lead.license_type
-                if url_license == 'data': url_license = 'datapack'
-                return redirect(reverse('checkout', kwargs={'slug': lead.report.slug, 'license_type': url_license}) + "?payment=failed")
+                await payment.amark_failed()
+                return redirect(failed_url)
 
         except Exception as e:
             logger.error(f"PayPalReturnView unexpected error: {e}", exc_info=True)
+            if claimed is not None:
+                # Release the claim so the buyer can retry now rather than after CAPTURE_LEASE.
+                await claimed.amark_failed()
             return redirect('/')
 
 class PayPalCancelView(View):
@@ -938,7 +1003,7 @@ class NewsletterSubscribeAPIView(generics.CreateAPIView):
             
         captcha = request.data.get('captcha')
         # Check if already subscribed to prevent duplicates
-        if Lead.objects.filter(email__iexact=email, lead_type='NEWSLETTER').exists():
+        if newsletter_subscribers.exists(email):
             return Response({'message': 'You are already subscribed!'}, status=status.HTTP_200_OK)
         
         data = {
@@ -950,11 +1015,18 @@ class NewsletterSubscribeAPIView(generics.CreateAPIView):
         
         serializer = self.get_serializer(data=data)
         serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
+        try:
+            self.perform_create(serializer)
+        except IntegrityError:
+            # Subscribed through another worker, or by an edited lead the filter has not seen.
+            newsletter_subscribers.add(email)
+            return Response({'message': 'You are already subscribed!'}, status=status.HTTP_200_OK)
         
         return Response({'message': 'Subscribed successfully'}, status=status.HTTP_201_CREATED)
 
     def perform_create(self, serializer):
-        lead = serializer.save()
+        with transaction.atomic():
+            lead = serializer.save()
+        newsletter_subscribers.add(lead.email)
         # Run email in thread
         threading.Thread(target=send_lead_emails_task, args=(lead,)).start()
@@ -13,4 +13,13 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'market_research_backend.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from leads.http import SharedClientApp  # noqa: E402
+
+# One outbound HTTP client per worker, closed at lifespan shutdown (leads/http.py).
+application = SharedClientApp(django_application)
+
+from market_research_backend.warmup import warm_up  # noqa: E402
+
+warm_up()
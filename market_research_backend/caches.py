@@ -0,0 +1,65 @@
+"""
+CACHES['default'] from a CACHE_URL.
+
+    locmem://                       per-process memory (development default)
+    file:///.django_cache           files under the project, shared by every worker on the host
+    file:////var/cache/marketsnxt   absolute path
+    redis://host:6379/0             any Redis-compatible server (needs the ``redis`` package)
+    dummy://                        caching off
+
+Query parameters: ``timeout`` (seconds, default 300) and ``max_entries``
+(locmem and file backends).
+"""
+import hashlib
+from pathlib import Path
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'rediss': 'django.core.cache.backends.redis.RedisCache',
+    'dummy': 'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+def cache_config(url, base_dir, key_prefix=''):
+    parts = urlsplit(url)
+    try:
+        backend = BACKENDS[parts.scheme]
+    except KeyError:
+        raise ValueError(f"Unsupported CACHE_URL scheme: {parts.scheme!r}")
+    params = dict(parse_qsl(parts.query))
+    config = {
+        'BACKEND': backend,
+        'TIMEOUT': int(params.pop('timeout', 300)),
+        'KEY_PREFIX': key_prefix,
+    }
+    if 'max_entries' in params:
+        config['OPTIONS'] = {'MAX_ENTRIES': int(params.pop('max_entries'))}
+
+    if parts.scheme == 'locmem':
+        config['LOCATION'] = parts.netloc
+    elif parts.scheme == 'file':
+        path = unquote(parts.path)[1:]
+        config['LOCATION'] = path if path.startswith('/') else str(Path(base_dir) / (path or '.django_cache'))
+    elif parts.scheme.startswith('redis'):
+        config['LOCATION'] = parts._replace(query='').geturl()
+        if params:
+            config['OPTIONS'] = params
+    return config
+
+
+def files_version(base_dir, patterns, *values):
+    """
+    Short hash of the contents of the files matching the glob patterns, and
+    of the repr() of any extra values (settings the output depends on). It
+    changes whenever one of them does and is the same on every host, so it
+    suits versioning cache entries rendered from those files.
+    """
+    base_dir = Path(base_dir)
+    digest = hashlib.sha1(repr(values).encode())
+    for path in sorted({path for pattern in patterns for path in base_dir.glob(pattern)}):
+        digest.update(str(path.relative_to(base_dir)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
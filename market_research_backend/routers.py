@@ -0,0 +1,76 @@
+"""
+Read-replica routing.
+
+Writes always go to ``default``. Reads go to the replica only while a
+routing() block has opted in (ReplicaRoutingMiddleware does so for the
+public catalogue views); admin, lead forms and management commands read
+from the primary. Once anything in the block writes, or while a
+transaction is open on the primary, reads in the block go to the primary
+as well, so a request always sees its own writes.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class RoutingState:
+    __slots__ = ('read_alias', 'wrote')
+
+    def __init__(self):
+        self.read_alias = None
+        self.wrote = False
+
+
+_state = ContextVar('db_routing_state', default=None)
+
+# Session and login state must never lag behind a login or logout.
+PRIMARY_ONLY_APPS = frozenset({'sessions', 'auth', 'admin', 'contenttypes'})
+
+
+def replica_alias():
+    """The configured replica alias, or None when DATABASES has no such entry."""
+    alias = getattr(settings, 'READ_REPLICA_ALIAS', 'replica')
+    return alias if alias in settings.DATABASES else None
+
+
+@contextmanager
+def routing():
+    """Yields the RoutingState for the block; set read_alias on it to send reads to a replica."""
+    state = RoutingState()
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+def current_state():
+    return _state.get()
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or state.read_alias is None or state.wrote:
+            return DEFAULT_DB_ALIAS
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return state.read_alias
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is populated by replication, never migrated directly.
+        return db == DEFAULT_DB_ALIAS
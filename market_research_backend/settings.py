@@ -18,10 +18,14 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 import os
 from pathlib import Path
 
+from .caches import cache_config, files_version
+from .database import database_config
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-# Load .env file
+# Load .env file, once, at the top: every setting below reads os.environ, and
+# real environment variables take precedence over the file.
 def load_env():
     env_path = BASE_DIR / '.env'
     if env_path.exists():
@@ -39,7 +43,11 @@ SECRET_KEY = os.environ.get('SECRET_KEY', 'django-insecure-fallback-key-change-m
 
 # SECURITY WARNING: don't run with debug turned on in production!
 ALLOWED_HOSTS = ["marketsnxt.com", "www.marketsnxt.com", "localhost", "127.0.0.1"]
-DEBUG = True
+# DJANGO_ENV=production switches on the production profile: DEBUG off, explicit
+# cached template loaders, template warm-up at startup, no debug context processor.
+DJANGO_ENV = os.environ.get('DJANGO_ENV', 'development')
+IS_PRODUCTION = DJANGO_ENV == 'production'
+DEBUG = os.environ.get('DJANGO_DEBUG', 'False' if IS_PRODUCTION else 'True') == 'True'
 #ALLOWED_HOSTS = os.environ.get('ALLOWED_HOSTS', '*').split(',')
 
 CSRF_TRUSTED_ORIGINS = os.environ.get(
@@ -56,6 +64,7 @@ INSTALLED_APPS = [
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
+    'pages',  # before staticfiles: its collectstatic also builds image variants
     'django.contrib.staticfiles',
     
     # Third party
@@ -67,7 +76,6 @@ INSTALLED_APPS = [
     'reports',
     'leads',
     'blog',
-    'pages',
     
     'django_recaptcha',
     'django.contrib.sitemaps', # SEO
@@ -165,13 +173,17 @@ CKEDITOR_5_CONFIGS = {
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware', # New: Static files
+    'middleware.prerendered.PrerenderedPageMiddleware',
+    'middleware.instrumentation.RequestMetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'middleware.ratelimit.RateLimitMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'middleware.replica.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'market_research_backend.urls'
@@ -193,22 +205,94 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'pages.context_processors.global_site_config',
+                'pages.context_processors.template_cache',
             ],
         },
     },
 ]
 
+if not DEBUG:
+    TEMPLATES[0]['OPTIONS']['context_processors'].remove('django.template.context_processors.debug')
+
+if IS_PRODUCTION:
+    # Parse each template once per process and never stat it again.
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+
+# Compile every template when the WSGI/ASGI application is created (see warmup.py)
+TEMPLATE_WARMUP = os.environ.get('TEMPLATE_WARMUP', str(IS_PRODUCTION)) == 'True'
+
+# {% cache %} fragments (site header/footer, report bodies): TEMPLATE_CACHE_VERSION
+# is set below the image variant settings it depends on.
+TEMPLATE_FRAGMENT_TIMEOUT = int(os.environ.get('TEMPLATE_FRAGMENT_TIMEOUT', 60 * 60 * 24))
+
+# Static marketing pages rendered to disk by `manage.py prerender_pages` at deploy
+# time and served by PrerenderedPageMiddleware (see pages/prerender.py).
+PRERENDER_PAGES = os.environ.get('PRERENDER_PAGES', str(IS_PRODUCTION)) == 'True'
+PRERENDER_DIR = BASE_DIR / 'prerendered'
+PRERENDER_HOST = os.environ.get('PRERENDER_HOST', 'marketsnxt.com')
+
+# Per-request query count / DB / template timing: Server-Timing header, JSON log
+# lines on the `request_metrics` logger, and per-URL aggregates in ViewMetrics
+# (admin, or `manage.py request_metrics`). See middleware/instrumentation.py.
+REQUEST_METRICS_ENABLED = os.environ.get('REQUEST_METRICS_ENABLED', 'False') == 'True'
+REQUEST_METRICS_FLUSH_SECONDS = int(os.environ.get('REQUEST_METRICS_FLUSH_SECONDS', 30))
+
 WSGI_APPLICATION = 'market_research_backend.wsgi.application'
 
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# DATABASE_URL selects the backend (see database.py); without it, the project's
+# db.sqlite3 with WAL and busy-timeout pragmas. SQLITE_TUNING=False keeps SQLite's
+# defaults (rollback journal, full fsync), e.g. to compare with
+# benchmarks/database_concurrency.py. Connections persist for DB_CONN_MAX_AGE
+# seconds and are health-checked before reuse.
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': str(BASE_DIR / 'db.sqlite3'),
+    'default': database_config(
+        os.environ.get('DATABASE_URL', 'sqlite:///db.sqlite3'),
+        BASE_DIR,
+        conn_max_age=int(os.environ.get('DB_CONN_MAX_AGE', 600 if IS_PRODUCTION else 0)),
+        sqlite_tuning=os.environ.get('SQLITE_TUNING', 'True') == 'True',
+    )
+}
+
+# Optional read replica. Public catalogue pages and the read-only API read from it
+# (middleware/replica.py); admin, leads and all writes use the primary, and a
+# browser that just wrote reads from the primary for REPLICA_STICKY_SECONDS.
+# Locally, a second SQLite URL (or the same file) can stand in for it.
+READ_REPLICA_ALIAS = 'replica'
+REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 15))
+if os.environ.get('DATABASE_REPLICA_URL'):
+    DATABASES[READ_REPLICA_ALIAS] = {
+        **database_config(
+            os.environ['DATABASE_REPLICA_URL'],
+            BASE_DIR,
+            conn_max_age=DATABASES['default']['CONN_MAX_AGE'],
+            sqlite_tuning=os.environ.get('SQLITE_TUNING', 'True') == 'True',
+        ),
+        # Tests see one database, as they would with real replication.
+        'TEST': {'MIRROR': 'default'},
     }
+DATABASE_ROUTERS = ['market_research_backend.routers.ReadReplicaRouter']
+
+
+# Cache
+# CACHE_URL picks the backend (see caches.py). Production defaults to a file cache
+# shared by all workers on the host that survives restarts; set a redis:// URL to
+# share it across hosts. pages/caching.py adds tagged keys and stampede protection.
+CACHES = {
+    'default': cache_config(
+        os.environ.get('CACHE_URL', 'file:///.django_cache?max_entries=20000' if IS_PRODUCTION else 'locmem://'),
+        BASE_DIR,
+        key_prefix=os.environ.get('CACHE_KEY_PREFIX', 'marketsnxt'),
+    )
 }
 
 
@@ -248,12 +332,42 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
-if not DEBUG:
-    STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Outside DEBUG, collectstatic writes content-hashed, gzip/brotli-compressed copies
+# that WhiteNoise serves with far-future cache headers.
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+        else 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Responsive image variants (pages/images.py). Static ones are generated by
+# collectstatic into static/variants (git-ignored), blog uploads on save.
+IMAGE_VARIANTS_DIR = BASE_DIR / 'static' / 'variants'
+IMAGE_VARIANT_SOURCES = ('images',)
+IMAGE_VARIANT_WIDTHS = (320, 640, 960, 1280, 1920)
+IMAGE_VARIANT_FORMATS = ('avif', 'webp')
+IMAGE_VARIANT_QUALITY = {'avif': 60, 'webp': 78}
+
+# Version of the {% cache %} fragments. The cache (file or Redis) outlives deploys,
+# so the default hashes everything the fragments render from: templates and tag
+# libraries, the <picture> markup in pages/images.py and the variant settings
+# above, and the static and variant manifests holding the hashed file names
+# (written by collectstatic, before the servers start). Set it explicitly (e.g.
+# to the deployed commit) to skip the hashing.
+TEMPLATE_CACHE_SOURCES = [
+    'templates/**/*.html', '*/templatetags/*.py', 'pages/images.py',
+    'staticfiles/staticfiles.json', 'static/variants/manifest.json',
+]
+TEMPLATE_CACHE_VERSION = os.environ.get('TEMPLATE_CACHE_VERSION') or files_version(
+    BASE_DIR, TEMPLATE_CACHE_SOURCES,
+    IMAGE_VARIANT_SOURCES, IMAGE_VARIANT_WIDTHS, IMAGE_VARIANT_FORMATS, IMAGE_VARIANT_QUALITY,
+)
+
 # CORS
 CORS_ALLOW_ALL_ORIGINS = True
 
@@ -265,27 +379,6 @@ CORS_ALLOW_ALL_ORIGINS = True
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-# Email Configuration
-import os
-
-def get_env_variable(var_name, default=None):
-    try:
-        from dotenv import load_dotenv
-        load_dotenv()
-    except ImportError:
-        pass # Handle if dotenv is not installed
-
-    return os.environ.get(var_name) or default
-
-# Load env file manually if python-dotenv fails or just to be safe
-env_path = BASE_DIR / '.env'
-if env_path.exists():
-    with open(env_path) as f:
-        for line in f:
-            if '=' in line:
-                key, value = line.strip().split('=', 1)
-                os.environ[key] = value
-
 # Email Configuration
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
@@ -303,5 +396,36 @@ RECAPTCHA_PRIVATE_KEY = os.environ.get('RECAPTCHA_PRIVATE_KEY', '6LeIxAcTAAAAAGG
 # Use Invisible ReCAPTCHA for badge-style protection without checkbox
 RECAPTCHA_REQUIRED_SCORE = 0.85
 
+# Server-side verification of API submissions (leads/recaptcha.py)
+RECAPTCHA_TIMEOUT = float(os.environ.get('RECAPTCHA_TIMEOUT', 3))
+RECAPTCHA_FAIL_OPEN = os.environ.get('RECAPTCHA_FAIL_OPEN', 'True') == 'True'
+RECAPTCHA_BREAKER_THRESHOLD = int(os.environ.get('RECAPTCHA_BREAKER_THRESHOLD', 5))
+RECAPTCHA_BREAKER_COOLDOWN = int(os.environ.get('RECAPTCHA_BREAKER_COOLDOWN', 30))
+# Seconds a verdict is reused for a retried submission (same token, client IP and email)
+RECAPTCHA_VERDICT_TTL = 300
+
 if not os.environ.get('RECAPTCHA_PUBLIC_KEY'):
      SILENCED_SYSTEM_CHECKS = ['django_recaptcha.recaptcha_test_key_error']
+
+# Newsletter duplicate pre-check (leads/dedupe.py)
+LEAD_DEDUPE_CAPACITY = int(os.environ.get('LEAD_DEDUPE_CAPACITY', 1_000_000))
+LEAD_DEDUPE_SYNC_SECONDS = int(os.environ.get('LEAD_DEDUPE_SYNC_SECONDS', 5))
+
+# Rate limiting (middleware/ratelimit.py), keyed by URL name
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'True') == 'True'
+RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'cache')  # 'cache' or 'memory'
+# Behind Nginx every REMOTE_ADDR is the proxy; set to HTTP_X_FORWARDED_FOR there.
+RATE_LIMIT_IP_HEADER = os.environ.get('RATE_LIMIT_IP_HEADER', 'REMOTE_ADDR')
+_LEAD_FORM_LIMIT = {'rate': '20/h', 'burst': 5, 'keys': ('ip', 'email')}
+RATE_LIMITS = {
+    'lead-create': _LEAD_FORM_LIMIT,
+    'request-sample': _LEAD_FORM_LIMIT,
+    'ask-for-discount': _LEAD_FORM_LIMIT,
+    'request-customization': _LEAD_FORM_LIMIT,
+    'speak-to-analyst': _LEAD_FORM_LIMIT,
+    'contact': _LEAD_FORM_LIMIT,
+    'newsletter-subscribe': {'rate': '10/h', 'burst': 3, 'keys': ('ip', 'email')},
+    'checkout': {'rate': '30/h', 'burst': 10, 'keys': ('ip', 'email')},
+    'checkout_default': {'rate': '30/h', 'burst': 10, 'keys': ('ip', 'email')},
+    'create-paypal-order': {'rate': '30/h', 'burst': 10, 'keys': ('ip',)},
+}
@@ -9,7 +9,7 @@ class ReportSitemap(Sitemap):
     priority = 0.9
 
     def items(self):
-        return Report.objects.all()
+        return Report.objects.only('url_path', 'updated_at').order_by('pk')
         
     def location(self, obj):
         return obj.get_absolute_url()
@@ -22,7 +22,7 @@ class CategorySitemap(Sitemap):
     priority = 0.7
 
     def items(self):
-        return Category.objects.all()
+        return Category.objects.order_by('pk')
 
     def location(self, obj):
         return reverse('category-report-list', kwargs={'category_slug': obj.slug})
@@ -32,7 +32,7 @@ class BlogSitemap(Sitemap):
     priority = 0.7
 
     def items(self):
-        return BlogPost.objects.filter(is_published=True)
+        return BlogPost.objects.filter(is_published=True).order_by('pk')
 
     def location(self, obj):
         return f'/blog/{obj.slug}/'
@@ -58,7 +58,7 @@ class CountryCategorySitemap(Sitemap):
 
     def items(self):
         # Get actual region + category pairs that exist in reports
-        combos = Report.objects.exclude(region__iexact='Global').values('region', 'category__slug').distinct()
+        combos = Report.objects.exclude(region__iexact='Global').values('region', 'category__slug').distinct().order_by('region', 'category__slug')
         return combos
 
     def location(self, obj):
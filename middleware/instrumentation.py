@@ -0,0 +1,116 @@
+"""
+Opt-in per-request instrumentation (REQUEST_METRICS_ENABLED).
+
+For every request it measures:
+
+* the number of SQL queries and the time spent in them, on every database
+  alias, via connection.execute_wrapper;
+* template time: the outermost Template.render calls, including any
+  queries that lazy querysets run while rendering;
+* total time through the rest of the middleware stack and the view.
+
+These are sent back as a Server-Timing header (visible in the browser's
+network panel), logged as one JSON line on the ``request_metrics`` logger,
+and aggregated per URL name into ViewMetrics by pages.metrics.
+
+When disabled the middleware removes itself at startup and Template.render
+is left untouched.
+"""
+import contextvars
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.base import Template
+
+from pages import metrics
+
+logger = logging.getLogger('request_metrics')
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+
+class RequestMeasurement:
+    __slots__ = ('queries', 'db', 'db_in_template', 'template', 'rendering')
+
+    def __init__(self):
+        self.queries = 0
+        self.db = self.db_in_template = self.template = 0.0
+        self.rendering = False
+
+
+def _time_query(execute, sql, params, many, context):
+    measurement = _current.get()
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        if measurement is not None:
+            elapsed = time.perf_counter() - started
+            measurement.queries += 1
+            measurement.db += elapsed
+            if measurement.rendering:
+                measurement.db_in_template += elapsed
+
+
+def _timed_render(original):
+    def render(self, context):
+        measurement = _current.get()
+        if measurement is None or measurement.rendering:
+            return original(self, context)
+        measurement.rendering = True
+        started = time.perf_counter()
+        try:
+            return original(self, context)
+        finally:
+            measurement.template += time.perf_counter() - started
+            measurement.rendering = False
+    render._request_metrics = True
+    return render
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if not getattr(Template.render, '_request_metrics', False):
+            Template.render = _timed_render(Template.render)
+
+    def __call__(self, request):
+        measurement = RequestMeasurement()
+        token = _current.set(measurement)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(_time_query))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total = time.perf_counter() - started
+        self.report(request, response, measurement, total)
+        return response
+
+    def report(self, request, response, m, total):
+        total_ms, db_ms, template_ms = total * 1000, m.db * 1000, m.template * 1000
+        # Everything else: middleware, URL resolution and view code outside DB calls.
+        app_ms = max(0.0, total_ms - template_ms - (m.db - m.db_in_template) * 1000)
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={db_ms:.1f};desc="{m.queries} queries"',
+            f'tpl;dur={template_ms:.1f}',
+            f'app;dur={app_ms:.1f}',
+            f'total;dur={total_ms:.1f}',
+        ])
+        match = request.resolver_match
+        url_name = (match.view_name if match else None) or 'unresolved'
+        logger.info(json.dumps({
+            'event': 'request', 'method': request.method, 'path': request.path, 'url_name': url_name,
+            'status': response.status_code, 'queries': m.queries, 'db_ms': round(db_ms, 2),
+            'template_ms': round(template_ms, 2), 'total_ms': round(total_ms, 2),
+        }))
+        metrics.record(url_name, total_ms, db_ms, template_ms, m.queries)
@@ -0,0 +1,82 @@
+"""
+Serves pages written by ``prerender_pages`` straight from disk.
+
+Sits right after WhiteNoise, so a hit skips sessions, CSRF, auth, URL
+resolution and template rendering. Only anonymous-looking GET/HEAD requests
+without a query string are answered; anything else, or a page that has not
+been rendered, falls through to the normal view. File contents are kept in
+memory and reloaded when the file's mtime changes.
+"""
+import threading
+from email.utils import formatdate
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.urls import NoReverseMatch, reverse
+from django.utils.cache import patch_vary_headers
+
+from pages import prerender
+
+
+class PrerenderedPageMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'PRERENDER_PAGES', False)
+        self._paths = None
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def paths(self):
+        if self._paths is None:
+            paths = {}
+            for url_name in prerender.PRERENDERED_PAGES:
+                try:
+                    paths[reverse(url_name)] = url_name
+                except NoReverseMatch:
+                    continue
+            self._paths = paths
+        return self._paths
+
+    def load(self, url_name):
+        """(html, gzipped, etag, last_modified) for a page, or None if it has not been rendered."""
+        path = prerender.file_for(url_name)
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        cached = self._files.get(url_name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with self._lock:
+            try:
+                html = path.read_bytes()
+                gzipped = path.with_suffix('.html.gz').read_bytes()
+            except FileNotFoundError:
+                return None
+            entry = (html, gzipped, f'"{int(mtime * 1000):x}-{len(html):x}"', formatdate(mtime, usegmt=True))
+            self._files[url_name] = (mtime, entry)
+        return entry
+
+    def __call__(self, request):
+        if self.enabled and request.method in ('GET', 'HEAD') and not request.META.get('QUERY_STRING') \
+                and 'messages' not in request.COOKIES:
+            url_name = self.paths().get(request.path_info)
+            entry = self.load(url_name) if url_name else None
+            if entry:
+                return self.respond(request, *entry)
+        return self.get_response(request)
+
+    def respond(self, request, html, gzipped, etag, last_modified):
+        if request.META.get('HTTP_IF_NONE_MATCH') == etag:
+            response = HttpResponseNotModified()
+        elif 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', ''):
+            response = HttpResponse(gzipped, content_type='text/html; charset=utf-8')
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(html, content_type='text/html; charset=utf-8')
+        response['ETag'] = etag
+        response['Last-Modified'] = last_modified
+        # XFrameOptionsMiddleware sits further in and never sees this response.
+        response['X-Frame-Options'] = getattr(settings, 'X_FRAME_OPTIONS', 'DENY')
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
@@ -0,0 +1,139 @@
+"""
+Token-bucket rate limiting for form and checkout endpoints.
+
+Policies are configured per URL name in settings.RATE_LIMITS:
+
+    RATE_LIMITS = {
+        'lead-create': {'rate': '20/h', 'burst': 5, 'keys': ('ip', 'email')},
+    }
+
+``rate`` is the sustained refill rate (count per s/m/h/d), ``burst`` the
+bucket size, and ``keys`` what a bucket is keyed by. A request must find a
+token in every one of its buckets. Only the listed ``methods`` (POST by
+default) are counted, so page views of a form are never limited.
+
+Buckets live in the default cache (shared between workers) or, with
+RATE_LIMIT_BACKEND = 'memory', in a per-process dict. The check runs in
+process_view, before the view has written anything or spawned threads.
+"""
+import hashlib
+import json
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """'20/h' -> tokens per second."""
+    count, period = rate.split('/')
+    return int(count) / PERIODS[period[0].lower()]
+
+
+class MemoryBuckets:
+    """Per-process bucket store with LRU eviction."""
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, refill, burst, now):
+        with self._lock:
+            tokens, stamp = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - stamp) * refill)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+            return allowed, tokens
+
+
+class CacheBuckets:
+    """
+    Bucket store in the Django cache. Read-modify-write is not atomic, so
+    a burst racing across workers may get a token or two extra; the limit
+    still holds at any sustained rate.
+    """
+
+    def take(self, key, refill, burst, now):
+        tokens, stamp = cache.get(key) or (burst, now)
+        tokens = min(burst, tokens + (now - stamp) * refill)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        # Keep the entry until the bucket would have refilled completely.
+        cache.set(key, (tokens, now), math.ceil(burst / refill))
+        return allowed, tokens
+
+
+def client_ip(request):
+    header = getattr(settings, 'RATE_LIMIT_IP_HEADER', 'REMOTE_ADDR')
+    value = request.META.get(header) or request.META.get('REMOTE_ADDR', '')
+    # X-Forwarded-For: the right-most entry is the one our proxy appended.
+    return value.split(',')[-1].strip()
+
+
+def submitted_email(request):
+    email = request.POST.get('email')
+    if email is None and request.content_type == 'application/json':
+        try:
+            email = json.loads(request.body or b'{}').get('email')
+        except (ValueError, AttributeError):
+            email = None
+    return (email or '').strip().lower() or None
+
+
+class RateLimitMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if getattr(settings, 'RATE_LIMIT_BACKEND', 'cache') == 'memory':
+            self.buckets = MemoryBuckets()
+        else:
+            self.buckets = CacheBuckets()
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not getattr(settings, 'RATE_LIMIT_ENABLED', True):
+            return None
+        match = request.resolver_match
+        policy = settings.RATE_LIMITS.get(match.url_name) if match else None
+        if not policy or request.method not in policy.get('methods', ('POST',)):
+            return None
+
+        refill = parse_rate(policy['rate'])
+        burst = policy.get('burst', 1)
+        now = time.time()
+        for key_type in policy.get('keys', ('ip',)):
+            value = client_ip(request) if key_type == 'ip' else submitted_email(request)
+            if not value:
+                continue
+            digest = hashlib.sha1(value.encode()).hexdigest()
+            key = f"ratelimit:{match.url_name}:{key_type}:{digest}"
+            allowed, tokens = self.buckets.take(key, refill, burst, now)
+            if not allowed:
+                logger.warning(f"Rate limit hit on {match.url_name} by {key_type} {value}")
+                return self.too_many(request, math.ceil((1 - tokens) / refill))
+        return None
+
+    def too_many(self, request, retry_after):
+        message = "Too many requests. Please try again later."
+        if request.path.startswith('/api/') or request.content_type == 'application/json':
+            response = JsonResponse({'status': 'error', 'message': message}, status=429)
+        else:
+            response = HttpResponse(message, status=429, content_type='text/plain')
+        response['Retry-After'] = str(retry_after)
+        return response
@@ -0,0 +1,60 @@
+"""
+Sends the database reads of public catalogue pages to the read replica.
+
+Only GET/HEAD requests to the URL names below are routed; admin, lead
+forms, checkout and everything else stay on the primary. A request that
+writes (an admin edit, a lead, a price update) sets a short-lived cookie,
+and that browser reads from the primary until it expires, so an editor
+sees their change immediately instead of the replica's lagging copy.
+Disabled unless a replica alias is configured (see DATABASE_REPLICA_URL).
+"""
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from market_research_backend.routers import current_state, replica_alias, routing
+
+# Read-heavy public views: listings, report and blog pages, sitemaps and the read-only API.
+REPLICA_URL_NAMES = frozenset({
+    'home', 'pages:pricing',
+    'report-list', 'report-list-paginated', 'global-report-list', 'global-report-list-paginated',
+    'global-report-list-category', 'global-report-list-category-paginated',
+    'report-detail', 'report-detail-global', 'report-detail-country',
+    'report-methodology', 'report-methodology-global', 'report-methodology-country',
+    'country-reports', 'country-reports-paginated', 'country-report-list', 'country-report-list-paginated',
+    'country-report-list-category-paginated', 'category-report-list', 'category-report-list-paginated',
+    'report-tab-fragment', 'blog-list', 'blog-detail', 'django.contrib.sitemaps.views.sitemap',
+    'api-category-list', 'api-report-list', 'api-report-detail', 'api-report-search-suggestions',
+})
+
+STICKY_COOKIE = 'db_primary_until'
+
+
+class ReplicaRoutingMiddleware:
+    def __init__(self, get_response):
+        self.alias = replica_alias()
+        if self.alias is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sticky_seconds = getattr(settings, 'REPLICA_STICKY_SECONDS', 15)
+
+    def __call__(self, request):
+        with routing() as state:
+            response = self.get_response(request)
+        if state.wrote:
+            until = int(time.time()) + self.sticky_seconds
+            response.set_cookie(STICKY_COOKIE, str(until), max_age=self.sticky_seconds, httponly=True,
+                                samesite='Lax', secure=request.is_secure())
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method not in ('GET', 'HEAD') or request.resolver_match.view_name not in REPLICA_URL_NAMES:
+            return None
+        try:
+            if int(request.COOKIES.get(STICKY_COOKIE, 0)) > time.time():
+                return None
+        except ValueError:
+            pass
+        current_state().read_alias = self.alias
+        return None
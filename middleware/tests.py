@@ -0,0 +1,83 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from leads.views import NewsletterSubscribeAPIView
+
+from . import ratelimit
+
+# One token a minute, two in the bucket.
+POLICY = {'rate': '1/m', 'burst': 2}
+
+
+class RateLimitTests(SimpleTestCase):
+    """Exercised on the newsletter endpoint: a POST without data gets the view's 400 unless limited."""
+
+    def setUp(self):
+        cache.clear()
+        self.now = 1_000_000.0
+        patcher = mock.patch.object(ratelimit.time, 'time', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.url = reverse('newsletter-subscribe')
+
+    def post(self, email=None, ip='10.0.0.1'):
+        return self.client.post(self.url, {'email': email} if email else {}, REMOTE_ADDR=ip)
+
+    @override_settings(RATE_LIMITS={'newsletter-subscribe': {**POLICY, 'keys': ('ip',)}})
+    def test_empty_bucket_gets_429_with_retry_after(self):
+        self.assertEqual(self.post().status_code, 400)
+        self.assertEqual(self.post().status_code, 400)
+        response = self.post()
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '60')
+        self.assertEqual(response.json()['status'], 'error')
+        # Another client has a bucket of its own.
+        self.assertEqual(self.post(ip='10.0.0.2').status_code, 400)
+
+    @override_settings(RATE_LIMITS={'newsletter-subscribe': {**POLICY, 'keys': ('ip',)}})
+    def test_bucket_refills_over_time(self):
+        self.post()
+        self.post()
+        self.now += 30
+        response = self.post()
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '30')
+        self.now += 30
+        self.assertEqual(self.post().status_code, 400)
+        self.assertEqual(self.post().status_code, 429)
+
+    @override_settings(RATE_LIMITS={'newsletter-subscribe': {**POLICY, 'keys': ('ip', 'email')}})
+    def test_email_key_limits_across_addresses(self):
+        # Keep the view away from the database; only the limiter is under test.
+        rejected = mock.Mock(return_value=JsonResponse({}, status=400))
+        with mock.patch.object(NewsletterSubscribeAPIView, 'post', rejected):
+            self.assertEqual(self.post('A@example.com', ip='10.0.0.1').status_code, 400)
+            self.assertEqual(self.post('a@example.com ', ip='10.0.0.2').status_code, 400)
+            self.assertEqual(self.post('a@example.com', ip='10.0.0.3').status_code, 429)
+            self.assertEqual(self.post('b@example.com', ip='10.0.0.4').status_code, 400)
+
+    @override_settings(RATE_LIMITS={'newsletter-subscribe': {**POLICY, 'keys': ('ip',)}})
+    def test_get_requests_are_not_counted(self):
+        for _ in range(5):
+            self.assertEqual(self.client.get(self.url, REMOTE_ADDR='10.0.0.1').status_code, 405)
+        self.assertEqual(self.post().status_code, 400)
+
+    @override_settings(RATE_LIMIT_ENABLED=False, RATE_LIMITS={'newsletter-subscribe': {**POLICY, 'keys': ('ip',)}})
+    def test_disabled(self):
+        for _ in range(5):
+            self.assertEqual(self.post().status_code, 400)
+
+    def test_memory_buckets(self):
+        buckets = ratelimit.MemoryBuckets(max_entries=2)
+        refill = ratelimit.parse_rate('1/m')
+        self.assertEqual(buckets.take('a', refill, 1, 0)[0], True)
+        self.assertEqual(buckets.take('a', refill, 1, 30)[0], False)
+        self.assertEqual(buckets.take('a', refill, 1, 90)[0], True)
+        buckets.take('b', refill, 1, 90)
+        buckets.take('c', refill, 1, 90)
+        # 'a' was least recently used and has been evicted, so it starts full again.
+        self.assertEqual(buckets.take('a', refill, 1, 91)[0], True)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Page, SiteConfiguration
+from .models import Page, SiteConfiguration, ViewMetrics
 
 @admin.register(Page)
 class PageAdmin(admin.ModelAdmin):
@@ -16,3 +16,41 @@ class SiteConfigurationAdmin(admin.ModelAdmin):
         if self.model.objects.exists():
             return False
         return True
+
+
+@admin.register(ViewMetrics)
+class ViewMetricsAdmin(admin.ModelAdmin):
+    list_display = ('url_name', 'requests', 'avg_ms', 'p50_ms', 'p95_ms', 'max_ms',
+                    'avg_queries', 'max_queries', 'avg_db_ms', 'avg_template_ms', 'updated_at')
+    search_fields = ('url_name',)
+    readonly_fields = [f.name for f in ViewMetrics._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description='avg ms')
+    def avg_ms(self, obj):
+        return round(obj.average('total_ms'), 1)
+
+    @admin.display(description='p50 ms')
+    def p50_ms(self, obj):
+        return round(obj.percentile(0.5), 1)
+
+    @admin.display(description='p95 ms')
+    def p95_ms(self, obj):
+        return round(obj.percentile(0.95), 1)
+
+    @admin.display(description='avg queries')
+    def avg_queries(self, obj):
+        return round(obj.average('queries'), 1)
+
+    @admin.display(description='avg DB ms')
+    def avg_db_ms(self, obj):
+        return round(obj.average('db_ms'), 1)
+
+    @admin.display(description='avg template ms')
+    def avg_template_ms(self, obj):
+        return round(obj.average('template_ms'), 1)
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class PagesConfig(AppConfig):
+    name = 'pages'
+
+    def ready(self):
+        from . import signals  # noqa: F401
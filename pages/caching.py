@@ -0,0 +1,127 @@
+"""
+Cache-aside helpers on top of the default cache.
+
+    menu = caching.get_or_set('category-menu', load_menu, timeout=300, tags=[caching.CATEGORIES])
+
+Tags: every key is stored under the current version of each of its tags,
+so invalidate_tags('categories') makes every value tagged 'categories'
+miss at once, in every process sharing the cache, without knowing their
+keys. CATEGORIES is invalidated when a category is saved or deleted (see
+reports/slugs.py, which also compares its version on every lookup).
+
+Stampede protection: on a miss, one caller (per cache) takes a short lock
+with cache.add and computes; concurrent callers wait for its value
+instead of all running the same expensive query, and compute themselves
+only if it does not arrive within lock_timeout.
+"""
+import hashlib
+import threading
+import time
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+# Model tags, invalidated by signals.
+CATEGORIES = 'categories'
+
+_MISSING = object()
+_TAG_PREFIX = 'tag:'
+_LOCK_PREFIX = 'lock:'
+# Keys beyond this length are hashed (memcached limits keys to 250 bytes).
+MAX_KEY_LENGTH = 200
+
+# Striped, so the set of locks stays fixed however many keys there are.
+_local_locks = [threading.RLock() for _ in range(64)]
+
+
+def _tag_key(tag):
+    return f'{_TAG_PREFIX}{tag}'
+
+
+def tag_versions(tags):
+    """{tag: version}. A tag with no version yet (or an evicted one) gets a fresh, time-based one."""
+    if not tags:
+        return {}
+    keys = {_tag_key(tag): tag for tag in tags}
+    found = cache.get_many(keys)
+    versions = {}
+    for key, tag in keys.items():
+        version = found.get(key)
+        if version is None:
+            # Never restart from 0: values cached under an evicted version must not come back.
+            cache.add(key, time.time_ns(), None)
+            version = cache.get(key)
+        versions[tag] = version
+    return versions
+
+
+def tag_version(tag):
+    return tag_versions([tag])[tag]
+
+
+def invalidate_tags(*tags):
+    for tag in tags:
+        try:
+            cache.incr(_tag_key(tag))
+        except ValueError:
+            cache.set(_tag_key(tag), time.time_ns(), None)
+
+
+def make_key(key, tags=()):
+    """The cache key for `key` under the current versions of `tags`."""
+    if tags:
+        versions = tag_versions(sorted(set(tags)))
+        key = f"{key}|{'|'.join(f'{tag}={version}' for tag, version in versions.items())}"
+    if len(key) > MAX_KEY_LENGTH:
+        key = 'h:' + hashlib.sha1(key.encode()).hexdigest()
+    return key
+
+
+def _local_lock(key):
+    return _local_locks[hash(key) % len(_local_locks)]
+
+
+def get_or_set(key, compute, timeout=DEFAULT_TIMEOUT, tags=(), lock_timeout=10):
+    """
+    The cached value for key, or compute()'s result, cached for `timeout`
+    seconds (the cache's default if omitted, forever if None). Concurrent
+    misses compute once (see module docstring).
+    """
+    full_key = make_key(key, tags)
+    value = cache.get(full_key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    # Threads of this process queue on a local lock; processes on the cache lock.
+    with _local_lock(full_key):
+        value = cache.get(full_key, _MISSING)
+        if value is not _MISSING:
+            return value
+        lock_key = _LOCK_PREFIX + full_key
+        locked = cache.add(lock_key, 1, lock_timeout)
+        if not locked:
+            deadline = time.monotonic() + lock_timeout
+            delay = 0.01
+            while time.monotonic() < deadline:
+                time.sleep(delay)
+                value = cache.get(full_key, _MISSING)
+                if value is not _MISSING:
+                    return value
+                if cache.get(lock_key) is None:
+                    break
+                delay = min(delay * 2, 0.2)
+        try:
+            value = compute()
+            cache.set(full_key, value, timeout)
+        finally:
+            if locked:
+                cache.delete(lock_key)
+    return value
+
+
+def get(key, default=None, tags=()):
+    return cache.get(make_key(key, tags), default)
+
+
+def delete(key, tags=()):
+    cache.delete(make_key(key, tags))
@@ -1,3 +1,4 @@
+from django.conf import settings
 from .models import SiteConfiguration
 
 def global_site_config(request):
@@ -19,3 +20,11 @@ def global_site_config(request):
         }
     except SiteConfiguration.DoesNotExist:
         return {'site_config': None}
+
+
+def template_cache(request=None):
+    """Version and timeout for {% cache %} fragments (header, footer, report bodies)."""
+    return {
+        'template_cache_version': settings.TEMPLATE_CACHE_VERSION,
+        'fragment_cache_timeout': settings.TEMPLATE_FRAGMENT_TIMEOUT,
+    }
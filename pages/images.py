@@ -0,0 +1,273 @@
+"""
+Responsive image variants.
+
+Raster images are re-encoded as AVIF and WebP at a few widths
+(IMAGE_VARIANT_WIDTHS, never wider than the source) and the templates emit
+<picture> elements with srcset/sizes and native lazy loading, so browsers
+download the smallest file that fills the slot instead of the original
+multi-megapixel JPEG/PNG.
+
+Variants are built ahead of time and cached on disk next to a JSON
+manifest describing what exists for each source:
+
+* static images under static/images are built into IMAGE_VARIANTS_DIR by
+  ``collectstatic`` (or ``build_image_variants``), so they are hashed and
+  compressed like every other static file;
+* blog uploads are built into MEDIA_ROOT/variants when the post is saved.
+
+A variant is only re-encoded when its source is newer. At render time only
+the manifest is consulted (re-read when its mtime changes); an image with
+no manifest entry falls back to a plain lazy <img>.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import ManifestFilesMixin, staticfiles_storage
+from django.core.files.storage import default_storage
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+from PIL import Image, ImageOps, features
+
+logger = logging.getLogger(__name__)
+
+SOURCE_EXTENSIONS = {'.jpg', '.jpeg', '.png'}
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'png': 'image/png', 'jpg': 'image/jpeg', 'jpeg': 'image/jpeg'}
+VARIANT_FORMATS = ('avif', 'webp')
+DEFAULT_SIZES = '100vw'
+
+
+def _widths():
+    return sorted(getattr(settings, 'IMAGE_VARIANT_WIDTHS', (320, 640, 960, 1280, 1920)))
+
+
+def _formats():
+    # AVIF needs Pillow built against libavif; without it we still ship WebP.
+    return [fmt for fmt in getattr(settings, 'IMAGE_VARIANT_FORMATS', VARIANT_FORMATS) if features.check(fmt)]
+
+
+def variant_name(name, width, fmt):
+    """'images/FMCG.jpg', 640, 'webp' -> 'images/FMCG-640w.webp'"""
+    stem, _ = os.path.splitext(name)
+    return f"{stem}-{width}w.{fmt}"
+
+
+def target_widths(source_width):
+    widths = [w for w in _widths() if w < source_width]
+    # Always offer the source width too (capped), so small logos still get a smaller format.
+    widths.append(min(source_width, _widths()[-1]))
+    return sorted(set(widths))
+
+
+def build_variants(source, name, out_dir, force=False):
+    """
+    Encodes the variants of one source file into out_dir and returns its
+    manifest entry. Existing variants newer than the source are kept.
+    """
+    source = Path(source)
+    out_dir = Path(out_dir)
+    source_mtime = source.stat().st_mtime
+    with Image.open(source) as img:
+        img = ImageOps.exif_transpose(img)
+        width, height = img.size
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA' if 'transparency' in img.info or img.mode in ('LA', 'PA') else 'RGB')
+        variants = {}
+        for fmt in _formats():
+            for w in target_widths(width):
+                path = out_dir / variant_name(name, w, fmt)
+                if not force and path.exists() and path.stat().st_mtime >= source_mtime:
+                    continue
+                path.parent.mkdir(parents=True, exist_ok=True)
+                resized = img if w == width else img.resize((w, round(height * w / width)), Image.LANCZOS)
+                quality = getattr(settings, 'IMAGE_VARIANT_QUALITY', {}).get(fmt, 60 if fmt == 'avif' else 78)
+                resized.save(path, fmt.upper(), quality=quality)
+            variants[fmt] = target_widths(width)
+    return {'width': width, 'height': height, 'variants': variants}
+
+
+class VariantManifest:
+    """JSON map of source name -> {width, height, variants: {format: [widths]}}."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._entries = {}
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def _current(self):
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            return {}
+        if mtime != self._mtime:
+            with self._lock:
+                try:
+                    self._entries = json.loads(self.path.read_text())
+                except ValueError:
+                    logger.warning(f"Unreadable image variant manifest {self.path}")
+                    self._entries = {}
+                self._mtime = mtime
+        return self._entries
+
+    def get(self, name):
+        return self._current().get(name)
+
+    def update(self, entries, replace=False):
+        """
+        Writes entries (atomically, via rename). Two processes updating at the
+        same moment can lose one update; build_image_variants repairs that.
+        """
+        with self._lock:
+            data = {} if replace else dict(self._current())
+            data.update(entries)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f'.{os.getpid()}.tmp')
+            tmp.write_text(json.dumps(data, indent=1, sort_keys=True))
+            os.replace(tmp, self.path)
+
+
+def _static_dir():
+    return Path(settings.IMAGE_VARIANTS_DIR)
+
+
+def _media_dir():
+    return Path(settings.MEDIA_ROOT) / 'variants'
+
+
+static_manifest = VariantManifest(_static_dir() / 'manifest.json')
+media_manifest = VariantManifest(_media_dir() / 'manifest.json')
+
+
+def build_static_variants(force=False):
+    """Builds variants for every raster image under IMAGE_VARIANT_SOURCES. Returns the count."""
+    entries = {}
+    root = Path(settings.BASE_DIR) / 'static'
+    for sub in getattr(settings, 'IMAGE_VARIANT_SOURCES', ('images',)):
+        for path in sorted((root / sub).rglob('*')):
+            if path.suffix.lower() in SOURCE_EXTENSIONS and _static_dir() not in path.parents:
+                name = path.relative_to(root).as_posix()
+                entries[name] = build_variants(path, name, _static_dir(), force=force)
+    static_manifest.update(entries, replace=True)
+    return len(entries)
+
+
+def build_media_variants(name, force=False):
+    """Builds variants for an uploaded file (storage name), e.g. on save of a blog post."""
+    if not name or os.path.splitext(name)[1].lower() not in SOURCE_EXTENSIONS:
+        return None
+    try:
+        entry = build_variants(default_storage.path(name), name, _media_dir(), force=force)
+    except (OSError, NotImplementedError) as e:
+        logger.warning(f"Could not build image variants for {name}: {e}")
+        return None
+    media_manifest.update({name: entry})
+    return entry
+
+
+def _srcset(entry, name, fmt, url_for):
+    return ', '.join(f"{url_for(variant_name(name, w, fmt))} {w}w" for w in entry['variants'][fmt])
+
+
+def picture(src, alt, entry=None, name=None, url_for=None, sizes=DEFAULT_SIZES, eager=False, **attrs):
+    """
+    <picture> markup for an image. Without a manifest entry this is a plain
+    <img>; either way it is lazy-loaded unless eager (above-the-fold images).
+    Extra keyword arguments become <img> attributes (class_ -> class).
+    """
+    img_attrs = {'src': src, 'alt': alt}
+    img_attrs.update({k.rstrip('_'): v for k, v in attrs.items() if v is not None})
+    if eager:
+        img_attrs.setdefault('fetchpriority', 'high')
+    else:
+        img_attrs.setdefault('loading', 'lazy')
+    img_attrs.setdefault('decoding', 'async')
+    img = format_html('<img {}>', format_html_join(' ', '{}="{}"', img_attrs.items()))
+    if not entry:
+        return img
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        ((MIME_TYPES[fmt], _srcset(entry, name, fmt, url_for), sizes) for fmt in VARIANT_FORMATS if fmt in entry['variants']),
+    )
+    return format_html('<picture>{}{}</picture>', sources, img)
+
+
+def static_exists(name):
+    """
+    Whether static(name) resolves to a real file. With a manifest storage
+    (outside DEBUG) static() raises for a name missing from the manifest, so
+    templates that build names from data check first.
+    """
+    if isinstance(staticfiles_storage, ManifestFilesMixin):
+        try:
+            staticfiles_storage.stored_name(name)
+        except ValueError:
+            return False
+        return True
+    return finders.find(name) is not None
+
+
+def static_picture(name, alt, **kwargs):
+    """picture() for a static file name such as 'images/reports/deck_standard.jpg'."""
+    return picture(static(name), alt, static_manifest.get(name), name,
+                   lambda variant: static('variants/' + variant), **kwargs)
+
+
+def media_picture(fieldfile, alt, **kwargs):
+    """picture() for an uploaded ImageField value."""
+    if not fieldfile:
+        return ''
+    return picture(fieldfile.url, alt, media_manifest.get(fieldfile.name), fieldfile.name,
+                   lambda variant: default_storage.url('variants/' + variant), **kwargs)
+
+
+def static_image_set(name, width=None):
+    """
+    CSS image-set() value for a background image: the smallest variant at
+    least `width` pixels wide in each format, then the original. Declare a
+    plain url() before it for browsers without image-set(). Single-quoted,
+    so it can go inside a style="" attribute.
+    """
+    entry = static_manifest.get(name)
+    original = f"url('{static(name)}') type('{MIME_TYPES[name.rsplit('.', 1)[-1].lower()]}')"
+    candidates = []
+    for fmt in VARIANT_FORMATS if entry else ():
+        widths = entry['variants'].get(fmt)
+        if widths:
+            w = min((w for w in widths if w >= (width or 0)), default=widths[-1])
+            candidates.append(f"url('{static('variants/' + variant_name(name, w, fmt))}') type('{MIME_TYPES[fmt]}')")
+    return f'image-set({", ".join(candidates + [original])})'
+
+
+def whiten_to_transparent(img, threshold=220):
+    """
+    Returns an RGBA copy of img with every near-white pixel (all of R, G and
+    B above threshold) made fully transparent, e.g. for logos shipped on a
+    white background. Done with one NumPy mask over the whole image.
+    """
+    import numpy as np  # deferred: only the logo conversion command needs it
+    pixels = np.array(img.convert('RGBA'))
+    pixels[(pixels[..., :3] > threshold).all(axis=-1)] = (255, 255, 255, 0)
+    return Image.fromarray(pixels, 'RGBA')
+
+
+def convert_transparent(source, destination, threshold=220, fmt='png', optimize=False):
+    """
+    Converts one file for the make_transparent command; returns (source,
+    destination, seconds). optimize trades several times the encode time
+    for a slightly smaller file.
+    """
+    started = time.perf_counter()
+    with Image.open(source) as img:
+        out = whiten_to_transparent(ImageOps.exif_transpose(img), threshold)
+    Path(destination).parent.mkdir(parents=True, exist_ok=True)
+    if fmt == 'webp':
+        out.save(destination, 'WEBP', lossless=True, method=6 if optimize else 4)
+    else:
+        out.save(destination, 'PNG', optimize=optimize)
+    return str(source), str(destination), time.perf_counter() - started
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import BlogPost, BlogPostImage
+from pages.images import build_media_variants, build_static_variants
+
+
+class Command(BaseCommand):
+    help = "Build AVIF/WebP size variants of static images and blog uploads (see pages/images.py)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--static-only', action='store_true', help="Skip blog uploads.")
+        parser.add_argument('--force', action='store_true', help="Re-encode variants that are already up to date.")
+
+    def handle(self, *args, **options):
+        count = build_static_variants(force=options['force'])
+        self.stdout.write(f"Static images: {count}")
+        if options['static_only']:
+            return
+        names = set(BlogPost.objects.exclude(image='').exclude(image=None).values_list('image', flat=True))
+        names.update(BlogPostImage.objects.values_list('image', flat=True))
+        built = sum(1 for name in sorted(names) if build_media_variants(name, force=options['force']))
+        self.stdout.write(self.style.SUCCESS(f"Built variants for {count} static images and {built} uploads."))
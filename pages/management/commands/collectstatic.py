@@ -0,0 +1,19 @@
+from django.contrib.staticfiles.management.commands.collectstatic import Command as CollectStaticCommand
+
+from pages.images import build_static_variants
+
+
+class Command(CollectStaticCommand):
+    """collectstatic that first builds the responsive image variants, so they get hashed and compressed too."""
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--skip-image-variants', action='store_true',
+                            help="Don't (re)build static image variants first.")
+
+    def handle(self, **options):
+        if not options['skip_image_variants'] and not options['dry_run']:
+            count = build_static_variants()
+            if options['verbosity'] >= 1:
+                self.stdout.write(f"Built image variants for {count} static images.")
+        return super().handle(**options)
@@ -0,0 +1,86 @@
+"""
+Turns the near-white background of logos/badges transparent.
+
+    python manage.py make_transparent static/images/IAF.jpg 'static/images/ISO*.jpg'
+    python manage.py make_transparent static/logos/ --format webp --output-dir static/logos/transparent
+
+Each file is written next to its source as <name>-transparent.<format>, or
+as <name>.<format> under --output-dir. A destination that is its own source
+is refused unless --in-place is given. Files are converted in a process pool.
+"""
+import glob
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pages.images import SOURCE_EXTENSIONS, convert_transparent
+
+SUFFIX = '-transparent'
+
+
+class Command(BaseCommand):
+    help = "Make near-white backgrounds of images transparent (PNG or lossless WebP output)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help="Files, directories or glob patterns.")
+        parser.add_argument('--threshold', type=int, default=220,
+                            help="Pixels with R, G and B all above this become transparent (default 220).")
+        parser.add_argument('--format', choices=('png', 'webp'), default='png')
+        parser.add_argument('--optimize', action='store_true',
+                            help="Spend more encode time for slightly smaller files.")
+        parser.add_argument('--output-dir', help="Write results here, keeping the source names.")
+        parser.add_argument('--in-place', action='store_true',
+                            help="Allow overwriting a source (e.g. PNGs converted to PNG in their own directory).")
+        parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                            help="Worker processes (default: one per CPU).")
+
+    def sources(self, patterns):
+        found = []
+        for pattern in patterns:
+            path = Path(pattern)
+            if path.is_dir():
+                # Skip the results of an earlier run next to the sources.
+                found.extend(p for p in sorted(path.rglob('*'))
+                             if p.suffix.lower() in SOURCE_EXTENSIONS and not p.stem.endswith(SUFFIX))
+            else:
+                matches = [Path(p) for p in sorted(glob.glob(pattern, recursive=True))]
+                if not matches:
+                    raise CommandError(f"No files match {pattern}")
+                found.extend(matches)
+        return list(dict.fromkeys(found))
+
+    def destination(self, source, options):
+        if options['output_dir']:
+            return Path(options['output_dir']) / f"{source.stem}.{options['format']}"
+        return source.parent / f"{source.stem}{SUFFIX}.{options['format']}"
+
+    def handle(self, *args, **options):
+        jobs = [(source, self.destination(source, options)) for source in self.sources(options['paths'])]
+        overwritten = [str(source) for source, destination in jobs if destination.resolve() == source.resolve()]
+        if overwritten and not options['in_place']:
+            raise CommandError(f"Would overwrite {', '.join(overwritten)}; pass --in-place to allow it.")
+        written = Counter(destination.resolve() for _, destination in jobs)
+        clashes = sorted(str(destination) for destination, count in written.items() if count > 1)
+        if clashes:
+            raise CommandError(f"Several sources would be written to {', '.join(clashes)}.")
+        failed = 0
+        with ProcessPoolExecutor(max_workers=max(1, min(options['workers'], len(jobs)))) as pool:
+            futures = {
+                pool.submit(convert_transparent, source, destination, options['threshold'],
+                            options['format'], options['optimize']): source
+                for source, destination in jobs
+            }
+            for future in as_completed(futures):
+                try:
+                    source, destination, seconds = future.result()
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f"Failed to convert {futures[future]}: {e}")
+                    continue
+                self.stdout.write(f"Converted: {source} -> {destination} ({seconds * 1000:.0f} ms)")
+        self.stdout.write(self.style.SUCCESS(f"Converted {len(jobs) - failed} of {len(jobs)} files."))
+        if failed:
+            raise CommandError(f"{failed} files failed")
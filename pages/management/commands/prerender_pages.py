@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from pages import prerender
+
+
+class Command(BaseCommand):
+    help = "Render the static marketing pages to PRERENDER_DIR for PrerenderedPageMiddleware."
+
+    def add_arguments(self, parser):
+        parser.add_argument('url_names', nargs='*',
+                            help="Only these URL names (e.g. pages:about); default: all pre-rendered pages.")
+        parser.add_argument('--clear', action='store_true', help="Delete the rendered files instead.")
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            prerender.clear()
+            self.stdout.write(self.style.SUCCESS("Removed pre-rendered pages."))
+            return
+        url_names = options['url_names'] or prerender.PRERENDERED_PAGES
+        unknown = set(url_names) - set(prerender.PRERENDERED_PAGES)
+        if unknown:
+            raise CommandError(f"Not pre-renderable: {', '.join(sorted(unknown))}")
+        written = prerender.prerender(url_names)
+        for url_name, size in written.items():
+            self.stdout.write(f"{url_name}: {size / 1024:.1f} KB")
+        self.stdout.write(self.style.SUCCESS(f"Pre-rendered {len(written)} of {len(url_names)} pages to {prerender.output_dir()}"))
+        if len(written) < len(url_names):
+            raise CommandError("Some pages failed to render; see the log.")
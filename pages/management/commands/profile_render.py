@@ -0,0 +1,108 @@
+"""
+Per-block template render profile for one or more URLs.
+
+    python manage.py profile_render /reports/global/energy/some-report/ --repeat 20
+
+Each URL is requested through the test client; {% block %}, {% cache %}
+and {% include %} nodes are timed while it renders and reported with
+their inclusive and self (exclusive of nested timed nodes) cost, so the
+effect of fragment caching shows up block by block. --cold clears the
+cache before every request to compare against uncached rendering.
+"""
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.template.base import Template
+from django.template.loader_tags import BlockNode, IncludeNode
+from django.templatetags.cache import CacheNode
+from django.test import Client
+
+
+class RenderProfile:
+    def __init__(self):
+        self.calls = defaultdict(int)
+        self.inclusive = defaultdict(float)
+        self.exclusive = defaultdict(float)
+        self._stack = []
+
+    def wrap(self, label_for, original):
+        profile = self
+
+        def render(node, context):
+            label = label_for(node)
+            profile._stack.append(0.0)
+            started = time.perf_counter()
+            try:
+                return original(node, context)
+            finally:
+                elapsed = time.perf_counter() - started
+                children = profile._stack.pop()
+                profile.calls[label] += 1
+                profile.inclusive[label] += elapsed
+                profile.exclusive[label] += elapsed - children
+                if profile._stack:
+                    profile._stack[-1] += elapsed
+        return render
+
+    @contextmanager
+    def active(self):
+        patches = [
+            mock.patch.object(Template, 'render', self.wrap(lambda t: f"template {t.name}", Template.render)),
+            mock.patch.object(BlockNode, 'render', self.wrap(lambda n: f"block {n.name}", BlockNode.render)),
+            mock.patch.object(CacheNode, 'render', self.wrap(lambda n: f"cache {n.fragment_name}", CacheNode.render)),
+            mock.patch.object(IncludeNode, 'render', self.wrap(lambda n: f"include {n.template.token}", IncludeNode.render)),
+        ]
+        for patch in patches:
+            patch.start()
+        try:
+            yield self
+        finally:
+            for patch in reversed(patches):
+                patch.stop()
+
+
+class Command(BaseCommand):
+    help = "Profile per-block template render time for the given URLs."
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+')
+        parser.add_argument('--repeat', type=int, default=10)
+        parser.add_argument('--cold', action='store_true', help="Clear the cache before every request.")
+        parser.add_argument('--top', type=int, default=25)
+
+    def handle(self, *args, **options):
+        host = next((h for h in settings.ALLOWED_HOSTS if h and '*' not in h), 'localhost').lstrip('.')
+        client = Client(HTTP_HOST=host)
+        repeat = options['repeat']
+
+        for path in options['paths']:
+            if not options['cold']:
+                client.get(path)  # warm caches and the template loader before measuring
+            profile = RenderProfile()
+            request_times = []
+            with profile.active():
+                for _ in range(repeat):
+                    if options['cold']:
+                        cache.clear()
+                    started = time.perf_counter()
+                    response = client.get(path)
+                    request_times.append(time.perf_counter() - started)
+                    if response.status_code != 200:
+                        raise CommandError(f"{path} returned {response.status_code}")
+
+            mode = 'cold' if options['cold'] else 'warm'
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"{path} ({mode}, {repeat} requests, {sum(request_times) / repeat * 1000:.1f} ms/request)"))
+            self.stdout.write(f"{'node':<52}{'calls':>7}{'incl ms/req':>13}{'self ms/req':>13}")
+            ranked = sorted(profile.exclusive, key=profile.exclusive.get, reverse=True)
+            for label in ranked[:options['top']]:
+                self.stdout.write(
+                    f"{label[:51]:<52}{profile.calls[label] // repeat:>7}"
+                    f"{profile.inclusive[label] / repeat * 1000:>13.2f}"
+                    f"{profile.exclusive[label] / repeat * 1000:>13.2f}"
+                )
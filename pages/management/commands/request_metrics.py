@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from pages.metrics import BUCKETS_MS
+from pages.models import ViewMetrics
+
+
+class Command(BaseCommand):
+    help = "Show (or reset) the per-URL request metrics collected by RequestMetricsMiddleware."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sort', default='total_ms',
+                            choices=('total_ms', 'requests', 'queries', 'db_ms', 'template_ms', 'max_ms'),
+                            help="Order by this accumulated column, descending.")
+        parser.add_argument('--limit', type=int, default=30)
+        parser.add_argument('--histogram', action='store_true', help="Also print each latency histogram.")
+        parser.add_argument('--reset', action='store_true', help="Delete all collected metrics.")
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            deleted, _ = ViewMetrics.objects.all().delete()
+            self.stdout.write(self.style.SUCCESS(f"Deleted metrics for {deleted} URL names."))
+            return
+
+        rows = ViewMetrics.objects.order_by(f"-{options['sort']}")[:options['limit']]
+        header = f"{'url name':<40} {'reqs':>7} {'avg ms':>8} {'p50':>7} {'p95':>7} {'max':>8} {'q/req':>6} {'max q':>6} {'db ms':>7} {'tpl ms':>7}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for row in rows:
+            self.stdout.write(
+                f"{row.url_name[:40]:<40} {row.requests:>7} {row.average('total_ms'):>8.1f} "
+                f"{row.percentile(0.5):>7.1f} {row.percentile(0.95):>7.1f} {row.max_ms:>8.1f} "
+                f"{row.average('queries'):>6.1f} {row.max_queries:>6} {row.average('db_ms'):>7.1f} "
+                f"{row.average('template_ms'):>7.1f}"
+            )
+            if options['histogram']:
+                labels = [f"<={b}" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"]
+                self.stdout.write('    ' + '  '.join(f"{label}:{count}" for label, count in zip(labels, row.histogram) if count))
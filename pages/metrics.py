@@ -0,0 +1,101 @@
+"""
+Aggregation of per-request metrics into ViewMetrics.
+
+middleware.instrumentation hands every measured request to record(), which
+adds it to an in-process buffer keyed by URL name. The buffer is merged
+into the ViewMetrics table at most every REQUEST_METRICS_FLUSH_SECONDS, so
+the database sees one small transaction per worker per interval instead
+of a write per request. Inspect with the admin page or
+``manage.py request_metrics``.
+"""
+import bisect
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Latency histogram bucket upper bounds; one more bucket counts anything slower.
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Aggregate:
+    __slots__ = ('requests', 'total_ms', 'db_ms', 'template_ms', 'queries', 'max_queries', 'max_ms', 'histogram')
+
+    def __init__(self):
+        self.requests = 0
+        self.total_ms = self.db_ms = self.template_ms = self.max_ms = 0.0
+        self.queries = self.max_queries = 0
+        self.histogram = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, total_ms, db_ms, template_ms, queries):
+        self.requests += 1
+        self.total_ms += total_ms
+        self.db_ms += db_ms
+        self.template_ms += template_ms
+        self.queries += queries
+        self.max_queries = max(self.max_queries, queries)
+        self.max_ms = max(self.max_ms, total_ms)
+        self.histogram[bisect.bisect_left(BUCKETS_MS, total_ms)] += 1
+
+    def merge_into(self, row):
+        row.requests += self.requests
+        row.total_ms += self.total_ms
+        row.db_ms += self.db_ms
+        row.template_ms += self.template_ms
+        row.queries += self.queries
+        row.max_queries = max(row.max_queries, self.max_queries)
+        row.max_ms = max(row.max_ms, self.max_ms)
+        histogram = row.histogram or [0] * len(self.histogram)
+        row.histogram = [a + b for a, b in zip(histogram, self.histogram)]
+
+
+_lock = threading.Lock()
+_pending = {}
+_flushed_at = time.monotonic()
+
+
+def record(url_name, total_ms, db_ms, template_ms, queries):
+    global _flushed_at
+    with _lock:
+        _pending.setdefault(url_name, Aggregate()).add(total_ms, db_ms, template_ms, queries)
+        if time.monotonic() - _flushed_at < getattr(settings, 'REQUEST_METRICS_FLUSH_SECONDS', 30):
+            return
+        batch = dict(_pending)
+        _pending.clear()
+        _flushed_at = time.monotonic()
+    flush(batch)
+
+
+def flush(batch):
+    """Merges a {url_name: Aggregate} batch into the ViewMetrics rows."""
+    from .models import ViewMetrics
+    if not batch:
+        return
+    try:
+        with transaction.atomic():
+            ViewMetrics.objects.bulk_create([ViewMetrics(url_name=name) for name in batch], ignore_conflicts=True)
+            rows = list(ViewMetrics.objects.select_for_update().filter(url_name__in=batch))
+            now = timezone.now()
+            for row in rows:
+                batch[row.url_name].merge_into(row)
+                row.updated_at = now
+            ViewMetrics.objects.bulk_update(rows, [
+                'requests', 'total_ms', 'db_ms', 'template_ms', 'queries', 'max_queries', 'max_ms', 'histogram',
+                'updated_at',
+            ])
+    except DatabaseError as e:
+        # Metrics are best effort: never fail the request that triggered the flush.
+        logger.warning(f"Could not flush request metrics: {e}")
+
+
+def flush_pending():
+    """Writes whatever this process has buffered (e.g. at the end of a benchmark run)."""
+    with _lock:
+        batch = dict(_pending)
+        _pending.clear()
+    flush(batch)
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0005_alter_siteconfiguration_google_analytics_measurement_id_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ViewMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url_name', models.CharField(max_length=255, unique=True)),
+                ('requests', models.PositiveBigIntegerField(default=0)),
+                ('total_ms', models.FloatField(default=0)),
+                ('db_ms', models.FloatField(default=0)),
+                ('template_ms', models.FloatField(default=0)),
+                ('queries', models.PositiveBigIntegerField(default=0)),
+                ('max_queries', models.PositiveIntegerField(default=0)),
+                ('max_ms', models.FloatField(default=0)),
+                ('histogram', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'View Metrics',
+                'verbose_name_plural': 'View Metrics',
+                'ordering': ['-total_ms'],
+            },
+        ),
+    ]
@@ -63,3 +63,40 @@ class SiteConfiguration(models.Model):
     class Meta:
         verbose_name = "Site Configuration"
         verbose_name_plural = "Site Configuration"
+
+
+class ViewMetrics(models.Model):
+    """Per-URL-name request metrics aggregated by middleware.instrumentation (see pages/metrics.py)."""
+    url_name = models.CharField(max_length=255, unique=True)
+    requests = models.PositiveBigIntegerField(default=0)
+    total_ms = models.FloatField(default=0)
+    db_ms = models.FloatField(default=0)
+    template_ms = models.FloatField(default=0)
+    queries = models.PositiveBigIntegerField(default=0)
+    max_queries = models.PositiveIntegerField(default=0)
+    max_ms = models.FloatField(default=0)
+    # Request counts per latency bucket, aligned with pages.metrics.BUCKETS_MS (+ one overflow bucket).
+    histogram = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "View Metrics"
+        verbose_name_plural = "View Metrics"
+        ordering = ['-total_ms']
+
+    def __str__(self):
+        return self.url_name
+
+    def average(self, field):
+        return getattr(self, field) / self.requests if self.requests else 0
+
+    def percentile(self, q):
+        """Upper bound (ms) of the histogram bucket holding the q-th quantile."""
+        from .metrics import BUCKETS_MS
+        target = q * self.requests
+        seen = 0
+        for bound, count in zip((*BUCKETS_MS, self.max_ms), self.histogram):
+            seen += count
+            if seen >= target and count:
+                return min(bound, self.max_ms)
+        return self.max_ms
@@ -0,0 +1,82 @@
+"""
+Pre-rendered HTML for the static marketing pages (about, privacy, terms, ...).
+
+These pages depend only on their template and on SiteConfiguration, so
+``prerender_pages`` renders them once at deploy time into PRERENDER_DIR as
+HTML plus a gzipped copy, and PrerenderedPageMiddleware serves those files
+ahead of sessions, CSRF, the template engine and the context processors.
+
+Saving or deleting the SiteConfiguration re-renders them (signals.py).
+Workers pick up new files by mtime, so a render on one worker is served by
+all of them.
+"""
+import gzip
+import logging
+from pathlib import Path
+
+from django.conf import settings
+from django.urls import resolve, reverse
+
+logger = logging.getLogger(__name__)
+
+# URL names of pages with no per-request content (no forms, no query parameters).
+PRERENDERED_PAGES = (
+    'pages:about', 'pages:consulting', 'pages:privacy', 'pages:terms', 'pages:faqs',
+    'pages:certifications', 'pages:mission', 'pages:leadership', 'pages:methodology',
+    'pages:disclaimer', 'pages:governance', 'pages:research_disclaimers',
+)
+
+
+def output_dir():
+    return Path(settings.PRERENDER_DIR)
+
+
+def file_for(url_name):
+    return output_dir() / f"{url_name.replace(':', '-')}.html"
+
+
+def render_page(url_name):
+    """Renders one page as an anonymous visitor on the canonical host; returns the HTML bytes."""
+    from django.test import RequestFactory  # deferred: pulls in the test framework
+    path = reverse(url_name)
+    request = RequestFactory().get(path, HTTP_HOST=settings.PRERENDER_HOST, secure=True)
+    match = resolve(path)
+    request.resolver_match = match
+    response = match.func(request, *match.args, **match.kwargs)
+    if hasattr(response, 'render'):
+        response.render()
+    if response.status_code != 200:
+        raise ValueError(f"{url_name} rendered with status {response.status_code}")
+    if b'csrfmiddlewaretoken' in response.content:
+        # A token baked into a shared file would be wrong for every visitor.
+        raise ValueError(f"{url_name} contains a CSRF token and cannot be pre-rendered")
+    return response.content
+
+
+def _write(path, data):
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+
+def prerender(url_names=PRERENDERED_PAGES):
+    """Renders pages to PRERENDER_DIR; returns {url_name: bytes written}."""
+    output_dir().mkdir(parents=True, exist_ok=True)
+    written = {}
+    for url_name in url_names:
+        try:
+            html = render_page(url_name)
+        except Exception:
+            logger.exception(f"Could not pre-render {url_name}")
+            file_for(url_name).unlink(missing_ok=True)
+            continue
+        target = file_for(url_name)
+        _write(target.with_suffix('.html.gz'), gzip.compress(html, compresslevel=9, mtime=0))
+        _write(target, html)
+        written[url_name] = len(html)
+    return written
+
+
+def clear():
+    for path in output_dir().glob('*.html*'):
+        path.unlink()
@@ -0,0 +1,15 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import prerender
+from .models import SiteConfiguration
+
+
+@receiver(post_save, sender=SiteConfiguration)
+@receiver(post_delete, sender=SiteConfiguration)
+def site_configuration_changed(sender, **kwargs):
+    # Analytics/verification tags are baked into the pre-rendered pages; only
+    # refresh pages that were rendered in the first place (i.e. in production).
+    if prerender.output_dir().is_dir():
+        transaction.on_commit(prerender.prerender)
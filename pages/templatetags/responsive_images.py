@@ -0,0 +1,27 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from pages import images
+
+register = template.Library()
+
+
+@register.simple_tag
+def static_picture(name, alt='', **attrs):
+    """
+    {% static_picture 'images/FMCG.jpg' alt=category.name sizes="64px" class="thumb" %}
+    Lazy <picture> with AVIF/WebP srcsets; pass eager=True for above-the-fold images.
+    """
+    return images.static_picture(name, alt, **attrs)
+
+
+@register.simple_tag
+def media_picture(fieldfile, alt='', **attrs):
+    """{% media_picture post.image alt=post.title sizes="(max-width: 900px) 100vw, 860px" %}"""
+    return images.media_picture(fieldfile, alt, **attrs)
+
+
+@register.simple_tag
+def static_image_set(name, width=None):
+    """image-set() for a CSS background-image declaration."""
+    return mark_safe(images.static_image_set(name, width))
@@ -0,0 +1,315 @@
+import io
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import Count
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver, reverse
+from django.utils.text import slugify
+from PIL import Image
+
+from blog.models import BlogPost
+from market_research_backend.caches import files_version
+from pages import caching
+from reports.models import Category, Report
+from reports.pricing import refresh_pricing_stats
+from reports.related import refresh_related
+from reports.synthetic import build_blog_posts, build_leads, build_reports, ensure_categories
+
+# URL name -> (max queries, max response KB) for a cold cache. Query counts
+# must not depend on how much data there is, so an N+1 on a listing or the
+# sitemap blows the budget on this catalogue already; sizes catch templates
+# that start inlining whole report bodies or unbounded lists. A cold cache also
+# means the dispatcher views reload the category slug set (reports/slugs.py).
+BUDGETS = {
+    'home': (3, 60),
+    'pages:home': (3, 60),
+    'pages:about': (1, 35),
+    'pages:pricing': (2, 45),
+    'pages:contact': (1, 40),
+    'pages:consulting': (1, 40),
+    'pages:privacy': (1, 40),
+    'pages:terms': (1, 40),
+    'pages:faqs': (1, 40),
+    'pages:certifications': (1, 40),
+    'pages:mission': (1, 40),
+    'pages:leadership': (1, 40),
+    'pages:methodology': (1, 40),
+    'pages:disclaimer': (1, 40),
+    'pages:governance': (1, 40),
+    'pages:research_disclaimers': (1, 40),
+    'report-list': (5, 80),
+    'report-list-paginated': (5, 80),
+    'global-report-list': (5, 80),
+    'global-report-list-paginated': (5, 80),
+    'global-report-list-category': (6, 80),
+    'global-report-list-category-paginated': (6, 80),
+    'category-report-list': (7, 80),
+    'category-report-list-paginated': (7, 80),
+    'country-reports': (5, 85),
+    'country-reports-paginated': (5, 85),
+    'country-report-list': (7, 75),
+    'country-report-list-paginated': (7, 75),
+    'country-report-list-category': (9, 75),
+    'country-report-list-category-paginated': (7, 75),
+    'report-detail': (5, 100),
+    'report-detail-global': (4, 100),
+    'report-detail-country': (5, 100),
+    'report-methodology': (2, 65),
+    'report-methodology-global': (2, 65),
+    'report-methodology-country': (2, 65),
+    'report-tab-fragment': (1, 12),
+    'request-sample': (2, 75),
+    'ask-for-discount': (2, 75),
+    'request-customization': (2, 75),
+    'speak-to-analyst': (2, 75),
+    'checkout': (2, 75),
+    'blog-list': (2, 55),
+    'blog-detail': (5, 50),
+    'api-category-list': (1, 10),
+    'api-report-list': (2, 450),
+    'api-report-detail': (2, 60),
+    'api-report-search-suggestions': (1, 4),
+    'django.contrib.sitemaps.views.sitemap': (10, 125),
+}
+
+# Routes that are not public pages: POST-only endpoints, PayPal callbacks and
+# redirects, the editor upload, and the admin (matched by namespace).
+UNBUDGETED = {
+    'lead-create', 'newsletter-subscribe', 'create-paypal-order', 'paypal_capture', 'paypal-return',
+    'paypal-cancel', 'dev-bypass', 'checkout_default', 'ck_editor_5_upload_file',
+}
+UNBUDGETED_NAMESPACES = {'admin'}
+
+
+def url_names(patterns=None, namespace=''):
+    """Every named route in the URLconf, namespaced like reverse() expects."""
+    for pattern in get_resolver().url_patterns if patterns is None else patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace not in UNBUDGETED_NAMESPACES:
+                prefix = f'{namespace}{pattern.namespace}:' if pattern.namespace else namespace
+                yield from url_names(pattern.url_patterns, prefix)
+        elif pattern.name:
+            yield namespace + pattern.name
+
+
+class QueryBudgetTests(TestCase):
+    """Every public URL name renders within its query and response-size budget on a synthetic catalogue."""
+
+    @classmethod
+    def setUpTestData(cls):
+        build_reports(300, seed=3)
+        # Enough reports in one country and category for their listings to have a second page.
+        cls.category = ensure_categories()[0]
+        build_reports(25, seed=3, categories=[cls.category], regions=['Germany'], global_share=0, start=300)
+        build_blog_posts(40, seed=3)
+        build_leads(200, seed=3)
+        refresh_related()
+        refresh_pricing_stats()
+        cls.global_report = Report.objects.filter(region='Global').select_related('category').first()
+        cls.country_report = Report.objects.exclude(region='Global').first()
+        cls.global_category = (Category.objects.filter(reports__region='Global')
+                               .annotate(n=Count('reports')).order_by('-n').first())
+        cls.blog_slug = BlogPost.objects.values_list('slug', flat=True).first()
+
+    def setUp(self):
+        cache.clear()
+
+    def urls(self):
+        report, country_report = self.global_report, self.country_report
+        slug = {'slug': report.slug}
+        category = {'category_slug': self.category.slug}
+        global_category = {'category_slug': self.global_category.slug}
+        country = {'country_slug': 'germany'}
+        country_category = {**country, 'category_slug': self.category.slug}
+        country_detail = {'country_slug': slugify(country_report.region), 'slug': country_report.slug}
+        urls = {
+            name: reverse(name) for name in (
+                'home', 'report-list', 'global-report-list', 'country-reports', 'blog-list',
+                'api-category-list', 'api-report-list', 'django.contrib.sitemaps.views.sitemap',
+            )
+        }
+        urls.update({name: reverse(name) for name in url_names() if name.startswith('pages:')})
+        urls.update({
+            'report-list-paginated': reverse('report-list-paginated', kwargs={'page': 3}),
+            'global-report-list-paginated': reverse('global-report-list-paginated', kwargs={'page': 2}),
+            'global-report-list-category': reverse('global-report-list-category', kwargs=global_category),
+            'global-report-list-category-paginated': reverse('global-report-list-category-paginated',
+                                                             kwargs={**global_category, 'page': 2}),
+            'category-report-list': reverse('category-report-list', kwargs=category),
+            'category-report-list-paginated': reverse('category-report-list-paginated',
+                                                      kwargs={**category, 'page': 2}),
+            'country-reports-paginated': reverse('country-reports-paginated', kwargs={'page': 2}),
+            'country-report-list': reverse('country-report-list', kwargs=country),
+            'country-report-list-paginated': reverse('country-report-list-paginated', kwargs={**country, 'page': 2}),
+            'country-report-list-category': reverse('country-report-list-category',
+                                                    kwargs={**country, 'slug': self.category.slug}),
+            'country-report-list-category-paginated': reverse('country-report-list-category-paginated',
+                                                              kwargs={**country_category, 'page': 2}),
+            'report-detail': reverse('report-detail', kwargs=slug),
+            'report-detail-global': report.get_absolute_url(),
+            'report-detail-country': country_report.get_absolute_url(),
+            'report-methodology': reverse('report-methodology', kwargs=slug),
+            'report-methodology-global': report.get_methodology_url(),
+            'report-methodology-country': reverse('report-methodology-country', kwargs=country_detail),
+            'report-tab-fragment': reverse('report-tab-fragment', kwargs={**slug, 'tab': 'toc'}),
+            'checkout': reverse('checkout', kwargs={**slug, 'license_type': 'single'}),
+            'blog-detail': reverse('blog-detail', kwargs={'slug': self.blog_slug}),
+            'api-report-detail': reverse('api-report-detail', kwargs=slug),
+            'api-report-search-suggestions': reverse('api-report-search-suggestions') + '?q=market',
+        })
+        for name in ('request-sample', 'ask-for-discount', 'request-customization', 'speak-to-analyst'):
+            urls[name] = reverse(name, kwargs=slug)
+        return urls
+
+    def test_every_public_url_name_has_a_budget(self):
+        # A new view fails here until it gets a budget (or joins UNBUDGETED).
+        self.assertEqual(set(url_names()) - UNBUDGETED, set(BUDGETS))
+        self.assertEqual(set(self.urls()), set(BUDGETS))
+
+    def test_url_names_within_budget(self):
+        urls = self.urls()
+        for url_name, path in urls.items():
+            max_queries, max_kb = BUDGETS[url_name]
+            with self.subTest(url_name=url_name):
+                cache.clear()
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(path)
+                self.assertEqual(response.status_code, 200, path)
+                self.assertLessEqual(len(queries), max_queries, '\n'.join(q['sql'] for q in queries))
+                self.assertLessEqual(len(response.content) / 1024, max_kb)
+
+    def test_report_urls_do_not_query(self):
+        reports = list(Report.objects.only('slug', 'url_path', 'methodology_path')[:50])
+        with self.assertNumQueries(0):
+            for report in reports:
+                report.get_absolute_url()
+                report.get_methodology_url()
+
+
+class CachingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_saving_a_category_invalidates_its_tag(self):
+        category = ensure_categories(['Quantum Widgets'])[0]
+        caching.get_or_set('latest', lambda: 'old', tags=[caching.CATEGORIES])
+        self.assertEqual(caching.get('latest', tags=[caching.CATEGORIES]), 'old')
+        category.save()
+        self.assertIsNone(caching.get('latest', tags=[caching.CATEGORIES]))
+
+    def test_concurrent_misses_compute_once(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return 'value'
+
+        threads = [threading.Thread(target=caching.get_or_set, args=('shared', compute)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(caching.get('shared'), 'value')
+
+
+class TemplateCacheVersionTests(SimpleTestCase):
+    """A deploy that changes what the cached fragments render from must change their version."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.base = Path(tmp.name)
+        for name in ('templates/base.html', 'pages/templatetags/images.py', 'pages/images.py',
+                     'staticfiles/staticfiles.json', 'static/variants/manifest.json'):
+            path = self.base / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text('{}')
+        self.values = [settings.IMAGE_VARIANT_WIDTHS, settings.IMAGE_VARIANT_QUALITY]
+
+    def version(self):
+        return files_version(self.base, settings.TEMPLATE_CACHE_SOURCES, *self.values)
+
+    def test_changes_with_every_source(self):
+        for name in ('templates/base.html', 'pages/templatetags/images.py', 'pages/images.py',
+                     'staticfiles/staticfiles.json', 'static/variants/manifest.json'):
+            with self.subTest(name=name):
+                before = self.version()
+                (self.base / name).write_text(f'{{"changed": "{name}"}}')
+                self.assertNotEqual(self.version(), before)
+
+    def test_changes_with_variant_settings(self):
+        before = self.version()
+        self.values[0] = (*settings.IMAGE_VARIANT_WIDTHS, 2560)
+        self.assertNotEqual(self.version(), before)
+
+
+class SourceManifestStorage(ManifestStaticFilesStorage):
+    """Manifest storage whose manifest lists the source static files as-is, so no collectstatic is needed."""
+
+    def load_manifest(self):
+        return {path: path for finder in finders.get_finders() for path, _ in finder.list([])}, ''
+
+
+@override_settings(STORAGES={
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': f'{__name__}.SourceManifestStorage'},
+})
+class ManifestStaticImageTests(TestCase):
+    """Under manifest storage static() raises for unknown files; category images must fall back instead."""
+
+    @classmethod
+    def setUpTestData(cls):
+        categories = ensure_categories(['Quantum Widgets'])
+        build_reports(1, categories=categories, global_share=1)
+        cls.report = Report.objects.get()
+
+    def setUp(self):
+        cache.clear()
+
+    def test_category_without_image(self):
+        for path in (self.report.get_absolute_url(), reverse('home')):
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, 'images/reports/deck_standard.jpg')
+                self.assertNotContains(response, 'Quantum Widgets.jpg')
+
+
+class MakeTransparentTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.source = self.dir / 'logo.png'
+        Image.new('RGB', (8, 8), 'white').save(self.source)
+        self.original = self.source.read_bytes()
+
+    def run_command(self, *args):
+        call_command('make_transparent', str(self.dir), '--workers', '1', *args, stdout=io.StringIO())
+
+    def test_writes_next_to_the_source_without_touching_it(self):
+        self.run_command()
+        self.run_command()  # a second run skips the first run's output
+        self.assertEqual(sorted(p.name for p in self.dir.iterdir()), ['logo-transparent.png', 'logo.png'])
+        self.assertEqual(self.source.read_bytes(), self.original)
+        with Image.open(self.dir / 'logo-transparent.png') as out:
+            self.assertEqual(out.getpixel((0, 0)), (255, 255, 255, 0))
+
+    def test_refuses_to_overwrite_a_source_unless_in_place(self):
+        with self.assertRaisesMessage(CommandError, '--in-place'):
+            self.run_command('--output-dir', str(self.dir))
+        self.assertEqual(self.source.read_bytes(), self.original)
+        self.run_command('--output-dir', str(self.dir), '--in-place')
+        self.assertNotEqual(self.source.read_bytes(), self.original)
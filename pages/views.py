@@ -117,65 +117,37 @@ class PricingView(TemplateView):
     template_name = 'pages/pricing.html'
     
     def get_context_data(self, **kwargs):
-        from reports.models import Report
-        from django.db.models import Avg
+        from reports.models import Category, Report
+        from reports.pricing import PRICE_FIELDS, scope_of, typical_prices
         from django.shortcuts import get_object_or_404
         context = super().get_context_data(**kwargs)
         
         slug = self.request.GET.get('slug')
         pricing_type = self.request.GET.get('type', 'all')
         report = None
+        category = None
         
         if slug:
-            report = get_object_or_404(Report, slug=slug)
+            report = get_object_or_404(Report.objects.only('slug', 'region', *PRICE_FIELDS.values()), slug=slug)
             context['report'] = report
             # Determine type from report if not explicitly provided or if conflicting
-            if 'global' in report.region.lower():
-                pricing_type = 'global'
-            else:
-                pricing_type = 'country'
+            pricing_type = scope_of(report.region)
+        elif self.request.GET.get('category'):
+            category = get_object_or_404(Category.objects.only('id', 'name', 'slug'), slug=self.request.GET['category'])
+            context['category'] = category
         
         context['pricing_type'] = pricing_type
 
         # Get stats
         if report:
             # If report exists, we use its specific prices
-            context['global_prices'] = {
-                'single': report.single_user_price,
-                'multi': report.multi_user_price,
-                'enterprise': report.enterprise_price,
-                'datapack': report.data_pack_price
-            }
+            context['global_prices'] = {key: getattr(report, field) for key, field in PRICE_FIELDS.items()}
             context['country_prices'] = context['global_prices'] # Same for display logic if locked to one
         else:
-            # Fallback to averages
-            global_stats = Report.objects.filter(region__icontains='Global').aggregate(
-                single=Avg('single_user_price'),
-                multi=Avg('multi_user_price'),
-                enterprise=Avg('enterprise_price'),
-                datapack=Avg('data_pack_price')
-            )
-            
-            country_stats = Report.objects.exclude(region__icontains='Global').aggregate(
-                single=Avg('single_user_price'),
-                multi=Avg('multi_user_price'),
-                enterprise=Avg('enterprise_price'),
-                datapack=Avg('data_pack_price')
-            )
-            
-            context['global_prices'] = {
-                'single': int(global_stats['single'] or 4550),
-                'multi': int(global_stats['multi'] or 5450),
-                'enterprise': int(global_stats['enterprise'] or 6950),
-                'datapack': int(global_stats['datapack'] or 3150)
-            }
-            
-            context['country_prices'] = {
-                'single': int(country_stats['single'] or 1850),
-                'multi': int(country_stats['multi'] or 2450),
-                'enterprise': int(country_stats['enterprise'] or 3150),
-                'datapack': int(country_stats['datapack'] or 1050)
-            }
+            # Fallback to averages, precomputed by reports.pricing
+            category_id = category.id if category else None
+            context['global_prices'] = typical_prices('global', category_id)
+            context['country_prices'] = typical_prices('country', category_id)
         
         # Initial prices based on type
         if pricing_type == 'country':
@@ -1,5 +1,4 @@
 import json
-import pandas as pd
 import csv
 import os
 import traceback
@@ -14,6 +13,8 @@ from django_ckeditor_5.widgets import CKEditor5Widget
 from django.db import models
 from .models import Category, Report, ImportBatch
 from .utils import auto_format_content, parse_content_sections
+from .related import refresh_related_in_background
+from .pricing import PRICE_FIELDS, refresh_pricing_stats, scope_of, scopes_of
 
 
 class ExcelImportForm(forms.Form):
@@ -50,6 +51,25 @@ class ReportAdmin(admin.ModelAdmin):
     change_list_template = "admin/reports_changelist.html"
     actions = ['export_to_excel', 'update_price_action']
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change and not {'region', 'category', *PRICE_FIELDS.values()} & set(form.changed_data):
+            return
+        # Only the report's scope, and the one it left if the region moved it.
+        scopes = {scope_of(obj.region)}
+        if change:
+            scopes.add(scope_of(form.initial.get('region')))
+        refresh_pricing_stats(scopes)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        refresh_pricing_stats({scope_of(obj.region)})
+
+    def delete_queryset(self, request, queryset):
+        scopes = scopes_of(queryset)
+        super().delete_queryset(request, queryset)
+        refresh_pricing_stats(scopes)
+
     def export_to_excel(self, request, queryset):
         response = HttpResponse(content_type='text/csv')
         response['Content-Disposition'] = 'attachment; filename=Reports_Export.csv'
@@ -156,6 +176,7 @@ class ReportAdmin(admin.ModelAdmin):
                     report.enterprise_price *= multiplier
                     report.save()
                     count += 1
+                refresh_pricing_stats(scopes_of(reports))
                 messages.success(request, f"Updated prices for {count} reports.")
                 return redirect("admin:reports_report_changelist")
         else:
@@ -170,6 +191,8 @@ class ReportAdmin(admin.ModelAdmin):
         return render(request, "admin/price_update.html", context)
 
     def process_excel(self, file, file_name):
+        # Deferred: pandas (and openpyxl through it) adds ~300 ms and tens of MB to every worker.
+        import pandas as pd
         df = pd.read_excel(file)
         df.columns = df.columns.str.strip().str.lower()
         
@@ -193,6 +216,7 @@ class ReportAdmin(admin.ModelAdmin):
             return 0, skipped_count, duplicate_titles
 
         batch = ImportBatch.objects.create(file_name=file_name)
+        imported_ids = []
 
         for row in rows_to_import:
             try:
@@ -218,7 +242,7 @@ class ReportAdmin(admin.ModelAdmin):
                 content_sections = parsed_data.get('sections', {})
                 
                 report_title = str(row.get('title')).strip()
-                Report.objects.create(
+                report = Report.objects.create(
                     title=report_title,
                     slug=slugify(row.get('slug')) if row.get('slug') else slugify(report_title),
                     category=category,
@@ -254,12 +278,16 @@ class ReportAdmin(admin.ModelAdmin):
                     enterprise_price=get_price(row.get('corporat', row.get('corporate license', 0))),
                     data_pack_price=get_price(row.get('data pac', row.get('data pack excel license', 0))),
                 )
+                imported_ids.append(report.id)
                 imported_count += 1
             except Exception:
                 skipped_count += 1
 
         batch.report_count = imported_count
         batch.save()
+        if imported_ids:
+            refresh_related_in_background(imported_ids)
+            refresh_pricing_stats(scopes_of(Report.objects.filter(id__in=imported_ids)))
         return imported_count, skipped_count, duplicate_titles
 
 @admin.register(ImportBatch)
@@ -268,11 +296,15 @@ class ImportBatchAdmin(admin.ModelAdmin):
     readonly_fields = ('file_name', 'import_date', 'report_count')
     def has_add_permission(self, request): return False
     def delete_model(self, request, obj):
+        scopes = scopes_of(obj.reports.all())
         obj.reports.all().delete()
         super().delete_model(request, obj)
+        refresh_pricing_stats(scopes)
     def delete_queryset(self, request, queryset):
+        scopes = scopes_of(Report.objects.filter(import_batch__in=queryset))
         for obj in queryset: obj.reports.all().delete()
         super().delete_queryset(request, queryset)
+        refresh_pricing_stats(scopes)
 
 admin.site.site_header = "Markets NXT Admin"
 admin.site.site_title = "Markets NXT Admin Portal"
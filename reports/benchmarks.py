@@ -0,0 +1,215 @@
+"""
+Benchmark cases for the report hot paths.
+
+Each Case times one operation (a page through the test client, a filter
+chain, an Excel import) over a synthetic catalogue from reports.synthetic.
+run() records wall time per iteration and, on one extra instrumented
+iteration, the number of SQL queries and the response size; a case with a
+query budget fails when it exceeds it. Results are plain dicts, so the
+``benchmark`` management command can write them as JSON and compare two
+runs.
+"""
+import io
+import itertools
+from contextlib import ExitStack
+import platform
+import random
+import statistics
+import subprocess
+import time
+from pathlib import Path
+
+import django
+import pandas as pd
+from django.conf import settings
+from django.contrib import admin
+from django.core.cache import cache
+from django.db import connection, connections, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import synthetic
+from .models import Report
+from .templatetags import report_filters
+
+EXCEL_ROWS = 25
+
+
+class BenchContext:
+    """Shared state for the cases: a client and a rotation of sample reports."""
+
+    def __init__(self, seed=0):
+        self.rng = random.Random(seed)
+        self.client = Client(HTTP_HOST='localhost')
+        ids = list(Report.objects.values_list('id', flat=True))
+        sample = self.rng.sample(ids, min(len(ids), 50))
+        self.reports = list(Report.objects.filter(id__in=sample).select_related('category'))
+        self._next_report = itertools.cycle(self.reports)
+        self.search_term = synthetic.SUBJECTS[0].split()[0]
+        self.excel = None
+
+    def next_report(self):
+        return next(self._next_report)
+
+    def get(self, url_name, kwargs=None, **params):
+        return self.fetch(reverse(url_name, kwargs=kwargs), **params)
+
+    def fetch(self, path, **params):
+        response = self.client.get(path, params)
+        if response.status_code != 200:
+            raise AssertionError(f"GET {path} returned {response.status_code}")
+        return response
+
+
+class Case:
+    def __init__(self, name, run, query_budget=None, setup=None, before_each=None, after_each=None):
+        self.name = name
+        self.run = run
+        self.query_budget = query_budget
+        self.setup = setup
+        self.before_each = before_each
+        self.after_each = after_each
+
+
+def _content_size(result):
+    return len(result.content) if hasattr(result, 'content') else len(str(result or ''))
+
+
+def _report_detail(ctx):
+    return ctx.fetch(ctx.next_report().get_absolute_url())
+
+
+def _report_filters(ctx):
+    report = ctx.next_report()
+    return ''.join(str(part) for part in (
+        report_filters.format_report_content(report_filters.exclude_report_tabs(report.summary), report),
+        report_filters.format_market_coverage(report.market_coverage),
+        report_filters.format_faqs(report.faqs),
+        report_filters.format_segmentation(report.segmentation),
+        report_filters.format_toc(report.toc),
+    ))
+
+
+def _excel_setup(ctx):
+    rng = random.Random(1)
+    rows = []
+    for index in range(EXCEL_ROWS):
+        title = f"Benchmark Import {synthetic.report_title(rng, index)}"
+        rows.append({
+            'title': title, 'category': rng.choice(synthetic.CATEGORY_NAMES), 'region': 'Global',
+            'content': synthetic.raw_content(rng), 'single u': 2999, 'multi u': 3999, 'corporat': 4999,
+            'data pac': 1999, 'publish': '2025-01-15', 'methodology': synthetic.sentence(rng, 40),
+        })
+    buffer = io.BytesIO()
+    pd.DataFrame(rows).to_excel(buffer, index=False)
+    ctx.excel = buffer.getvalue()
+
+
+def _excel_import(ctx):
+    # Rolled back, like in a TestCase: nothing to clean up, and the related-report
+    # refresh the import schedules on commit (a background thread) never starts.
+    model_admin = admin.site._registry[Report]
+    with transaction.atomic():
+        imported, skipped, _ = model_admin.process_excel(io.BytesIO(ctx.excel), 'benchmark.xlsx')
+        transaction.set_rollback(True)
+    if imported != EXCEL_ROWS:
+        raise AssertionError(f"Imported {imported} of {EXCEL_ROWS} rows ({skipped} skipped)")
+    return imported
+
+
+CASES = [
+    Case('report_list', lambda ctx: ctx.get('report-list'), query_budget=6),
+    Case('report_list_page_2', lambda ctx: ctx.get('report-list-paginated', {'page': 2}), query_budget=6),
+    Case('report_list_search', lambda ctx: ctx.get('report-list', q=ctx.search_term), query_budget=6),
+    Case('country_report_list', lambda ctx: ctx.get('country-reports'), query_budget=6),
+    # Cold: fragment cache cleared, so the report body goes through report_filters.
+    Case('report_detail_cold', _report_detail, query_budget=5, before_each=lambda ctx: cache.clear()),
+    Case('report_detail_warm', _report_detail, query_budget=5),
+    Case('report_tab_toc', lambda ctx: ctx.get('report-tab-fragment', {'slug': ctx.next_report().slug, 'tab': 'toc'}),
+         query_budget=2, before_each=lambda ctx: cache.clear()),
+    Case('report_filters', _report_filters, query_budget=0),
+    Case('search_suggestions', lambda ctx: ctx.get('api-report-search-suggestions', q=ctx.search_term),
+         query_budget=2),
+    Case('pricing', lambda ctx: ctx.get('pages:pricing'), query_budget=2),
+    Case('excel_import', _excel_import, setup=_excel_setup),
+]
+
+
+def run_case(case, ctx, iterations=10, warmup=1):
+    if case.setup:
+        case.setup(ctx)
+    timings = []
+    for index in range(warmup + iterations):
+        if case.before_each:
+            case.before_each(ctx)
+        started = time.perf_counter()
+        case.run(ctx)
+        elapsed = time.perf_counter() - started
+        if case.after_each:
+            case.after_each(ctx)
+        if index >= warmup:
+            timings.append(elapsed * 1000)
+
+    # One more, instrumented iteration: capturing queries slows it down, so it is not timed.
+    # Queries are counted on every alias, so reads routed to a replica count too.
+    if case.before_each:
+        case.before_each(ctx)
+    with ExitStack() as stack:
+        captured = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in connections]
+        result = case.run(ctx)
+    queries = [query for capture in captured for query in capture]
+    if case.after_each:
+        case.after_each(ctx)
+
+    timings.sort()
+    return {
+        'iterations': iterations,
+        'min_ms': round(timings[0], 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'mean_ms': round(statistics.fmean(timings), 3),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        'max_ms': round(timings[-1], 3),
+        'queries': len(queries),
+        'query_budget': case.query_budget,
+        'bytes': _content_size(result),
+        'within_budget': case.query_budget is None or len(queries) <= case.query_budget,
+    }
+
+
+def run(cases=CASES, iterations=10, warmup=1, seed=0):
+    ctx = BenchContext(seed)
+    return {case.name: run_case(case, ctx, iterations, warmup) for case in cases}
+
+
+def metadata(size, seed):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=Path(settings.BASE_DIR),
+                                capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'commit': commit,
+        'size': size,
+        'seed': seed,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'environment': getattr(settings, 'DJANGO_ENV', None),
+    }
+
+
+def compare(previous, current, tolerance=0.2):
+    """
+    Rows of (case, old median, new median, change) for cases in both runs;
+    change is the relative difference, flagged as a regression above tolerance.
+    """
+    rows = []
+    for name, result in current['results'].items():
+        old = previous.get('results', {}).get(name)
+        if not old or not old['median_ms']:
+            continue
+        change = result['median_ms'] / old['median_ms'] - 1
+        rows.append((name, old['median_ms'], result['median_ms'], change, change > tolerance))
+    return rows
@@ -2,7 +2,7 @@ from django.urls import path
 from .views import (
     ReportListView, ReportDetailView, ReportMethodologyView,
     CountryReportListView, GlobalReportListView, CategoryOrReportView,
-    CountryCategoryOrReportView
+    CountryCategoryOrReportView, ReportTabFragmentView
 )
 from leads.views import LeadCaptureView, CheckoutView
 
@@ -39,6 +39,9 @@ urlpatterns = [
     path('country-reports/<slug:country_slug>/<slug:category_slug>/page=<int:page>/', CountryReportListView.as_view(), name='country-report-list-category-paginated'),
     path('country-reports/<slug:country_slug>/<slug:slug>/methodology/', ReportMethodologyView.as_view(), name='report-methodology-country'),
 
+    # Lazily loaded detail-page tab bodies (segmentation, toc)
+    path('fragments/<slug:slug>/<str:tab>/', ReportTabFragmentView.as_view(), name='report-tab-fragment'),
+
     # --- SEO friendly Category and Report detail dispatcher ---
     # This handles both /reports/<category-slug>/ and /reports/<report-slug>/
     path('<slug:slug>/', CategoryOrReportView.as_view(), name='report-detail'),
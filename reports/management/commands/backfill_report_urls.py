@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from reports.models import Report
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored url_path / methodology_path of reports."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--missing-only', action='store_true',
+                            help="Only fill reports that have no stored path yet.")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        queryset = Report.objects.all()
+        if options['missing_only']:
+            queryset = queryset.filter(url_path='')
+        updated = Report.refresh_url_paths(queryset, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Updated URL paths for {updated} reports."))
@@ -0,0 +1,111 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings, setup_databases, teardown_databases
+
+from reports import benchmarks
+from reports.pricing import refresh_pricing_stats
+from reports.related import refresh_related
+from reports.synthetic import build_reports, parse_count
+
+BENCHMARK_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'benchmark'}}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the report listings, detail render, report_filters, Excel import and search "
+        "against a synthetic catalogue in a throwaway test database, and write the results as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=parse_count, default=1000, help="Reports to generate, e.g. 1k, 10k, 100k.")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--iterations', type=int, default=10)
+        parser.add_argument('--warmup', type=int, default=1)
+        parser.add_argument('--cases', help="Comma-separated case names (default: all).")
+        parser.add_argument('--output', help="Write the results to this JSON file.")
+        parser.add_argument('--compare', help="Previous results file to compare medians against.")
+        parser.add_argument('--max-regression', type=float, default=0.2,
+                            help="Fail when a median is slower than --compare by more than this fraction.")
+        parser.add_argument('--keepdb', action='store_true',
+                            help="Keep the test database (and its catalogue) for the next run.")
+
+    def handle(self, *args, **options):
+        cases = benchmarks.CASES
+        if options['cases']:
+            names = options['cases'].split(',')
+            unknown = set(names) - {case.name for case in cases}
+            if unknown:
+                raise CommandError(f"Unknown cases: {', '.join(sorted(unknown))}")
+            cases = [case for case in cases if case.name in names]
+
+        # Like the test runner: every database alias is swapped for a test database (a
+        # configured replica mirrors the test default), and the cache is a private
+        # locmem one, so the configured databases and the shared cache are never touched.
+        with override_settings(CACHES=BENCHMARK_CACHES):
+            old_config = setup_databases(verbosity=0, interactive=False, keepdb=options['keepdb'],
+                                         serialized_aliases=())
+            try:
+                self.build_catalogue(options['size'], options['seed'])
+                results = benchmarks.run(cases, options['iterations'], options['warmup'], options['seed'])
+                meta = benchmarks.metadata(options['size'], options['seed'])
+            finally:
+                teardown_databases(old_config, verbosity=0, keepdb=options['keepdb'])
+
+        data = {'meta': meta, 'results': results}
+        self.print_results(results)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(data, f, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+        failures = [name for name, result in results.items() if not result['within_budget']]
+        for name in failures:
+            result = results[name]
+            self.stderr.write(f"{name}: {result['queries']} queries, budget {result['query_budget']}")
+        if options['compare']:
+            failures += self.compare(options['compare'], data, options['max_regression'])
+        if failures:
+            raise CommandError(f"{len(failures)} benchmark check(s) failed.")
+        self.stdout.write(self.style.SUCCESS("All benchmarks within budget."))
+
+    def build_catalogue(self, size, seed):
+        from reports.models import Report
+        existing = Report.objects.count()
+        if existing >= size:
+            self.stdout.write(f"Reusing catalogue of {existing} reports.")
+            return
+        started = time.perf_counter()
+        build_reports(size - existing, seed=seed, start=existing)
+        refresh_related()
+        refresh_pricing_stats()
+        self.stdout.write(f"Built {size - existing} reports in {time.perf_counter() - started:.1f}s.")
+
+    def print_results(self, results):
+        self.stdout.write(f"{'case':<24}{'median ms':>11}{'p95 ms':>10}{'queries':>9}{'KB':>9}")
+        for name, result in results.items():
+            budget = f"/{result['query_budget']}" if result['query_budget'] is not None else ''
+            self.stdout.write(
+                f"{name:<24}{result['median_ms']:>11.2f}{result['p95_ms']:>10.2f}"
+                f"{str(result['queries']) + budget:>9}{result['bytes'] / 1024:>9.1f}"
+            )
+
+    def compare(self, path, data, tolerance):
+        try:
+            with open(path) as f:
+                previous = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read {path}: {e}")
+        self.stdout.write(f"\nCompared with {previous['meta'].get('commit')} ({previous['meta'].get('size')} reports):")
+        if previous['meta'].get('size') != data['meta']['size']:
+            self.stdout.write(self.style.WARNING("Catalogue sizes differ; timings are not directly comparable."))
+        regressions = []
+        for name, old, new, change, regressed in benchmarks.compare(previous, data, tolerance):
+            line = f"{name:<24}{old:>10.2f} -> {new:>8.2f} ms ({change:+.0%})"
+            if regressed:
+                regressions.append(name)
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(line)
+        return regressions
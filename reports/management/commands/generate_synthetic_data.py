@@ -0,0 +1,76 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from blog.models import BlogCategory, BlogPost
+from leads.models import Lead
+from reports import synthetic
+from reports.models import Report
+from reports.pricing import refresh_pricing_stats
+from reports.related import refresh_related
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-generate a synthetic dataset (categories, regions, reports, blog posts, leads) for load "
+        "and scale testing. Counts accept k/m suffixes, e.g. --reports 100k --leads 1m. Rows are added "
+        "to whatever is already in the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--categories', type=synthetic.parse_count, default=len(synthetic.CATEGORY_NAMES))
+        parser.add_argument('--regions', type=synthetic.parse_count, default=len(synthetic.COUNTRIES),
+                            help="Countries that country reports are spread over.")
+        parser.add_argument('--reports', type=synthetic.parse_count, default=1000)
+        parser.add_argument('--global-share', type=float, default=0.6, help="Fraction of reports that are global.")
+        parser.add_argument('--blog-categories', type=synthetic.parse_count,
+                            default=len(synthetic.BLOG_CATEGORY_NAMES))
+        parser.add_argument('--blog-posts', type=synthetic.parse_count, default=0)
+        parser.add_argument('--leads', type=synthetic.parse_count, default=0)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--skip-refresh', action='store_true',
+                            help="Do not recompute related reports and pricing stats afterwards.")
+
+    def handle(self, *args, **options):
+        if not 0 <= options['global_share'] <= 1:
+            raise CommandError("--global-share must be between 0 and 1.")
+        seed, batch_size = options['seed'], options['batch_size']
+
+        categories = synthetic.ensure_categories(synthetic.numbered(synthetic.CATEGORY_NAMES, options['categories']))
+        regions = synthetic.numbered(synthetic.COUNTRIES, options['regions'])
+        self.stdout.write(f"{len(categories)} categories, {len(regions)} regions.")
+
+        # New rows are numbered after the existing ones, so titles and slugs never clash.
+        if options['reports']:
+            self.timed('reports', lambda: synthetic.build_reports(
+                options['reports'], seed=seed, categories=categories, regions=regions,
+                global_share=options['global_share'], start=Report.objects.count(), batch_size=batch_size,
+            ))
+        if options['blog_posts']:
+            blog_categories = synthetic.ensure_categories(
+                synthetic.numbered(synthetic.BLOG_CATEGORY_NAMES, options['blog_categories']), model=BlogCategory,
+            )
+            self.timed('blog posts', lambda: synthetic.build_blog_posts(
+                options['blog_posts'], seed=seed, categories=blog_categories, start=BlogPost.objects.count(),
+                batch_size=batch_size,
+            ))
+        if options['leads']:
+            self.timed('leads', lambda: synthetic.build_leads(
+                options['leads'], seed=seed, start=Lead.objects.count(), batch_size=max(batch_size, 5000),
+            ))
+
+        if options['reports'] and not options['skip_refresh']:
+            # refresh_related() counts reports whose neighbours were recomputed, not stored rows.
+            self.timed('reports', refresh_related, verb='Refreshed related reports for')
+            self.timed('pricing stats rows', refresh_pricing_stats, verb='Rebuilt')
+        if connection.vendor == 'sqlite':
+            connection.cursor().execute('PRAGMA optimize')
+        self.stdout.write(self.style.SUCCESS("Synthetic data generated."))
+
+    def timed(self, label, build, verb='Created'):
+        started = time.perf_counter()
+        count = build()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"{verb} {count} {label} in {elapsed:.1f}s ({count / max(elapsed, 1e-9):,.0f}/s).")
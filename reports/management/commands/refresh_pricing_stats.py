@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from reports.pricing import refresh_pricing_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the materialised pricing statistics shown on the pricing page."
+
+    def handle(self, *args, **options):
+        rows = refresh_pricing_stats()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {rows} pricing stats rows."))
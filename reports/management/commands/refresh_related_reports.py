@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from reports.related import RELATED_LIMIT, refresh_related
+
+
+class Command(BaseCommand):
+    help = "Recompute the precomputed related-reports table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--report', type=int, action='append', dest='report_ids',
+                            help="Only refresh this report (and the reports it could appear on). Repeatable.")
+        parser.add_argument('--limit', type=int, default=RELATED_LIMIT)
+
+    def handle(self, *args, **options):
+        refreshed = refresh_related(options['report_ids'], limit=options['limit'])
+        self.stdout.write(self.style.SUCCESS(f"Refreshed related reports for {refreshed} reports."))
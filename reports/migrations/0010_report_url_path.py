@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0009_report_competitive_environment_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='methodology_path',
+            field=models.CharField(blank=True, default='', editable=False, max_length=700),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='url_path',
+            field=models.CharField(blank=True, default='', editable=False, max_length=700),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0010_report_url_path'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField(default=0)),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_from', to='reports.report')),
+                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_links', to='reports.report')),
+            ],
+            options={
+                'ordering': ['report', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('report', 'rank'), name='related_report_rank_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0011_relatedreport'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PricingStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('global', 'Global'), ('country', 'Country')], max_length=10)),
+                ('report_count', models.PositiveIntegerField(default=0)),
+                ('stats', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='pricing_stats', to='reports.category')),
+            ],
+            options={
+                'verbose_name_plural': 'Pricing Stats',
+                'constraints': [models.UniqueConstraint(fields=('scope', 'category'), name='pricing_stats_scope_category_uniq'), models.UniqueConstraint(condition=models.Q(('category', None)), fields=('scope',), name='pricing_stats_scope_uniq')],
+            },
+        ),
+    ]
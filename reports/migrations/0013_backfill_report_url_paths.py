@@ -0,0 +1,36 @@
+from django.db import migrations
+from django.urls import reverse
+from django.utils.text import slugify
+
+
+def backfill_url_paths(apps, schema_editor):
+    # Mirrors Report.build_url_paths() as of this migration.
+    Report = apps.get_model('reports', 'Report')
+    reports = (Report.objects.filter(url_path='').select_related('category')
+               .only('id', 'slug', 'region', 'category__slug'))
+    batch = []
+    for report in reports.iterator(chunk_size=1000):
+        if report.region and report.region.lower() == 'global':
+            kwargs = {'category_slug': report.category.slug, 'slug': report.slug}
+            names = ('report-detail-global', 'report-methodology-global')
+        else:
+            kwargs = {'country_slug': slugify(report.region or 'country'), 'slug': report.slug}
+            names = ('report-detail-country', 'report-methodology-country')
+        report.url_path, report.methodology_path = (reverse(name, kwargs=kwargs) for name in names)
+        batch.append(report)
+        if len(batch) >= 1000:
+            Report.objects.bulk_update(batch, ['url_path', 'methodology_path'])
+            batch = []
+    if batch:
+        Report.objects.bulk_update(batch, ['url_path', 'methodology_path'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0012_pricingstats'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_url_paths, migrations.RunPython.noop),
+    ]
@@ -8,7 +8,13 @@ class Category(models.Model):
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
+        old_slug = None
+        if self.pk:
+            old_slug = Category.objects.filter(pk=self.pk).values_list('slug', flat=True).first()
         super().save(*args, **kwargs)
+        if old_slug is not None and old_slug != self.slug:
+            # Global report URLs embed the category slug.
+            Report.refresh_url_paths(self.reports.all())
 
     def get_absolute_url(self):
         from django.urls import reverse
@@ -74,6 +80,10 @@ class Report(models.Model):
     discount_url_slug = models.CharField(max_length=500, blank=True, null=True)
     inquiry_url_slug = models.CharField(max_length=500, blank=True, null=True)
 
+    # Canonical paths, kept in sync by save() and Category.save(); see build_url_paths()
+    url_path = models.CharField(max_length=700, blank=True, default='', editable=False)
+    methodology_path = models.CharField(max_length=700, blank=True, default='', editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -100,36 +110,84 @@ class Report(models.Model):
             self.discount_url_slug = f"ask-for-discount-{self.slug}"
         if not self.inquiry_url_slug:
             self.inquiry_url_slug = f"speak-to-analyst-{self.slug}"
-            
+
+        self.url_path, self.methodology_path = self.build_url_paths()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'url_path', 'methodology_path'}
+
         super().save(*args, **kwargs)
 
-    def get_absolute_url(self):
+    def build_url_paths(self):
+        """Returns (detail path, methodology path) for the report's current slug, region and category."""
         from django.urls import reverse
-        from django.utils.text import slugify
         if self.region and self.region.lower() == 'global':
-            return reverse('report-detail-global', kwargs={
-                'category_slug': self.category.slug,
-                'slug': self.slug
-            })
-        else:
-            return reverse('report-detail-country', kwargs={
-                'country_slug': slugify(self.region or 'country'),
-                'slug': self.slug
-            })
+            kwargs = {'category_slug': self.category.slug, 'slug': self.slug}
+            return (reverse('report-detail-global', kwargs=kwargs),
+                    reverse('report-methodology-global', kwargs=kwargs))
+        kwargs = {'country_slug': slugify(self.region or 'country'), 'slug': self.slug}
+        return (reverse('report-detail-country', kwargs=kwargs),
+                reverse('report-methodology-country', kwargs=kwargs))
+
+    @classmethod
+    def refresh_url_paths(cls, queryset, batch_size=1000):
+        """Recomputes the stored paths for every report in queryset. Returns the number updated."""
+        reports = queryset.select_related('category').only('id', 'slug', 'region', 'category__slug')
+        batch, updated = [], 0
+        for report in reports.iterator(chunk_size=batch_size):
+            report.url_path, report.methodology_path = report.build_url_paths()
+            batch.append(report)
+            if len(batch) >= batch_size:
+                updated += cls.objects.bulk_update(batch, ['url_path', 'methodology_path'])
+                batch = []
+        if batch:
+            updated += cls.objects.bulk_update(batch, ['url_path', 'methodology_path'])
+        return updated
+
+    def get_absolute_url(self):
+        return self.url_path or self.build_url_paths()[0]
 
     def get_methodology_url(self):
-        from django.urls import reverse
-        from django.utils.text import slugify
-        if self.region and self.region.lower() == 'global':
-            return reverse('report-methodology-global', kwargs={
-                'category_slug': self.category.slug,
-                'slug': self.slug
-            })
-        else:
-            return reverse('report-methodology-country', kwargs={
-                'country_slug': slugify(self.region or 'country'),
-                'slug': self.slug
-            })
+        return self.methodology_path or self.build_url_paths()[1]
 
     def __str__(self):
         return self.title
+
+
+class RelatedReport(models.Model):
+    """Precomputed neighbours of a report, maintained by reports.related."""
+    report = models.ForeignKey(Report, on_delete=models.CASCADE, related_name="related_links")
+    related = models.ForeignKey(Report, on_delete=models.CASCADE, related_name="related_from")
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField(default=0)
+
+    class Meta:
+        ordering = ['report', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['report', 'rank'], name='related_report_rank_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.report_id} -> {self.related_id} (#{self.rank})"
+
+
+class PricingStats(models.Model):
+    """Price distribution of one scope (optionally within a category), maintained by reports.pricing."""
+    SCOPE_CHOICES = [('global', 'Global'), ('country', 'Country')]
+
+    scope = models.CharField(max_length=10, choices=SCOPE_CHOICES)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, null=True, blank=True, related_name="pricing_stats")
+    report_count = models.PositiveIntegerField(default=0)
+    # {'single': {'avg': ..., 'min': ..., 'p25': ..., 'median': ..., 'p75': ..., 'max': ...}, 'multi': {...}, ...}
+    stats = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Pricing Stats"
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'category'], name='pricing_stats_scope_category_uniq'),
+            models.UniqueConstraint(fields=['scope'], condition=models.Q(category=None), name='pricing_stats_scope_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_scope_display()} / {self.category or 'All categories'}"
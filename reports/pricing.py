@@ -0,0 +1,145 @@
+"""
+Materialised pricing statistics.
+
+The pricing page shows typical licence prices for global and country
+reports. Rather than aggregating the whole reports table per hit, the
+distribution (average, min, quartiles, max) of each licence price is
+computed in one pass per refresh, for each scope overall and per category,
+and stored in PricingStats. Readers get the full table from the cache,
+falling back to a single query.
+
+Refreshed after Excel imports, bulk price updates and admin edits that
+touch prices (only the scopes those reports are in), and by
+``manage.py refresh_pricing_stats``.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Q
+
+from pages import caching
+
+from .models import PricingStats, Report
+
+# Keys used by the pricing template -> Report fields.
+PRICE_FIELDS = {
+    'single': 'single_user_price',
+    'multi': 'multi_user_price',
+    'enterprise': 'enterprise_price',
+    'datapack': 'data_pack_price',
+}
+
+# Shown while there are no reports in a scope.
+DEFAULT_PRICES = {
+    'global': {'single': 4550, 'multi': 5450, 'enterprise': 6950, 'datapack': 3150},
+    'country': {'single': 1850, 'multi': 2450, 'enterprise': 3150, 'datapack': 1050},
+}
+
+CACHE_KEY = 'reports:pricing-stats'
+# Bounds staleness in other workers while the default cache is per-process.
+CACHE_TIMEOUT = 300
+
+
+SCOPES = {
+    'global': Q(region__icontains='global'),
+    'country': ~Q(region__icontains='global'),
+}
+
+
+def scope_of(region):
+    return 'global' if 'global' in (region or '').lower() else 'country'
+
+
+def scopes_of(reports):
+    """The scopes of a queryset of reports, e.g. before deleting them."""
+    return {scope_of(region) for region in reports.values_list('region', flat=True).distinct()}
+
+
+def _quantile(values, q):
+    """Linear-interpolated quantile of sorted values."""
+    position = (len(values) - 1) * q
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+def summarise(values):
+    if not values:
+        return None
+    values.sort()
+    return {
+        'avg': round(sum(values) / len(values), 2),
+        'min': values[0],
+        'p25': round(_quantile(values, 0.25), 2),
+        'median': round(_quantile(values, 0.5), 2),
+        'p75': round(_quantile(values, 0.75), 2),
+        'max': values[-1],
+    }
+
+
+def refresh_pricing_stats(scopes=None):
+    """
+    Recomputes the PricingStats rows of `scopes` (default: all) from one scan
+    of their reports' price columns. Returns the rows written.
+    """
+    scopes = set(SCOPES if scopes is None else scopes)
+    if not scopes:
+        return 0
+    counts = defaultdict(int)
+    values = defaultdict(lambda: defaultdict(list))
+    rows = Report.objects.values_list('region', 'category_id', *PRICE_FIELDS.values())
+    if scopes != set(SCOPES):
+        rows = rows.filter(Q(*(SCOPES[scope] for scope in scopes), _connector=Q.OR))
+    for region, category_id, *prices in rows.iterator(chunk_size=5000):
+        scope = scope_of(region)
+        for group in ((scope, None), (scope, category_id)):
+            counts[group] += 1
+            for key, price in zip(PRICE_FIELDS, prices):
+                # Same semantics as Avg(): NULL prices are left out.
+                if price is not None:
+                    values[group][key].append(float(price))
+
+    stats = [
+        PricingStats(scope=scope, category_id=category_id, report_count=counts[(scope, category_id)],
+                     stats={key: summarise(values[(scope, category_id)][key]) for key in PRICE_FIELDS})
+        for scope, category_id in counts
+    ]
+    with transaction.atomic():
+        PricingStats.objects.filter(scope__in=scopes).delete()
+        PricingStats.objects.bulk_create(stats)
+    caching.delete(CACHE_KEY)
+    return len(stats)
+
+
+def _load_table():
+    rows = PricingStats.objects.values_list('scope', 'category_id', 'stats')
+    table = {(scope, category_id): stats for scope, category_id, stats in rows}
+    if not table and refresh_pricing_stats():
+        # Never computed yet (fresh database or deploy): build it once now.
+        table = {(scope, category_id): stats for scope, category_id, stats in rows.all()}
+    return table
+
+
+def _table():
+    # Single-flight: after a refresh, one worker reloads the table while the others wait for it.
+    return caching.get_or_set(CACHE_KEY, _load_table, CACHE_TIMEOUT)
+
+
+def price_stats(scope, category_id=None):
+    """The stored distribution for a scope (and category), or None if it has no reports."""
+    return _table().get((scope, category_id))
+
+
+def typical_prices(scope, category_id=None, statistic='avg'):
+    """
+    {'single': ..., 'multi': ..., 'enterprise': ..., 'datapack': ...} as whole
+    numbers for the pricing page; a category without reports in the scope
+    falls back to the scope as a whole, then to DEFAULT_PRICES.
+    """
+    stats = price_stats(scope, category_id) or {}
+    if category_id is not None and not stats:
+        stats = price_stats(scope) or {}
+    return {
+        key: int((stats.get(key) or {}).get(statistic) or DEFAULT_PRICES[scope][key])
+        for key in PRICE_FIELDS
+    }
@@ -0,0 +1,147 @@
+"""
+Related-reports engine.
+
+Neighbours are computed offline from slim columns (title, category,
+region, publish date) and stored in RelatedReport, so the detail page
+reads its cards with one indexed query instead of ranking on every hit.
+
+Scoring: title keyword overlap (Jaccard) dominates, with bonuses for the
+same category and the same region, and recency breaking ties. Candidates
+come from an inverted index over title keywords plus the most recent
+reports of the same category, so the cost per report stays bounded as
+the catalogue grows.
+"""
+import logging
+import re
+import threading
+from collections import defaultdict
+
+from django.db import connection, transaction
+
+from .models import Report, RelatedReport
+
+RELATED_LIMIT = 6
+CATEGORY_CANDIDATES = 50
+# Keywords shared by more reports than this carry no signal and are skipped.
+MAX_KEYWORD_FREQUENCY = 2000
+
+STOPWORDS = {
+    'a', 'an', 'and', 'by', 'for', 'in', 'of', 'on', 'the', 'to', 'with',
+    'market', 'markets', 'report', 'global', 'size', 'share', 'trends', 'trend',
+    'analysis', 'forecast', 'outlook', 'industry', 'growth', 'research',
+}
+WORD_RE = re.compile(r'[a-z][a-z0-9\-]+')
+
+logger = logging.getLogger(__name__)
+
+
+def keywords(title):
+    return {w for w in WORD_RE.findall((title or '').lower()) if w not in STOPWORDS}
+
+
+class Catalogue:
+    """In-memory snapshot of the slim report columns used for scoring."""
+
+    def __init__(self):
+        self.rows = {}
+        self.keywords = {}
+        self.by_keyword = defaultdict(set)
+        self.by_category = defaultdict(list)
+        rows = Report.objects.order_by('-publish_date', '-id').values_list(
+            'id', 'title', 'category_id', 'region', 'publish_date')
+        for pk, title, category_id, region, publish_date in rows.iterator(chunk_size=5000):
+            words = keywords(title)
+            self.rows[pk] = (category_id, (region or '').lower(), publish_date)
+            self.keywords[pk] = words
+            self.by_category[category_id].append(pk)
+            for word in words:
+                self.by_keyword[word].add(pk)
+
+    def candidates(self, pk):
+        category_id = self.rows[pk][0]
+        found = set(self.by_category[category_id][:CATEGORY_CANDIDATES + 1])
+        for word in self.keywords[pk]:
+            ids = self.by_keyword[word]
+            if len(ids) <= MAX_KEYWORD_FREQUENCY:
+                found |= ids
+        found.discard(pk)
+        return found
+
+    def score(self, pk, other):
+        category_id, region, _ = self.rows[pk]
+        other_category, other_region, other_date = self.rows[other]
+        words, other_words = self.keywords[pk], self.keywords[other]
+        union = len(words | other_words)
+        score = 4.0 * len(words & other_words) / union if union else 0.0
+        if other_category == category_id:
+            score += 2.0
+        if other_region == region:
+            score += 0.5
+        return score, other_date
+
+    def neighbours(self, pk, limit=RELATED_LIMIT):
+        ranked = sorted(((self.score(pk, other), other) for other in self.candidates(pk)), reverse=True)
+        return [(other, score) for (score, _), other in ranked[:limit]]
+
+
+def refresh_related(report_ids=None, limit=RELATED_LIMIT):
+    """
+    Recomputes stored neighbours. With report_ids, only those reports and
+    the reports they are candidates of are refreshed (e.g. after an import);
+    otherwise the whole catalogue is. Returns the number of reports refreshed.
+    """
+    catalogue = Catalogue()
+    if report_ids is None:
+        targets = set(catalogue.rows)
+    else:
+        targets = {pk for pk in report_ids if pk in catalogue.rows}
+        # New reports can displace existing neighbours of reports that would match them.
+        for pk in list(targets):
+            targets |= catalogue.candidates(pk)
+
+    links = [
+        RelatedReport(report_id=pk, related_id=other, rank=rank, score=score)
+        for pk in targets
+        for rank, (other, score) in enumerate(catalogue.neighbours(pk, limit))
+    ]
+    with transaction.atomic():
+        if report_ids is None:
+            RelatedReport.objects.all().delete()
+        else:
+            RelatedReport.objects.filter(report_id__in=targets).delete()
+        RelatedReport.objects.bulk_create(links, batch_size=1000)
+    return len(targets)
+
+
+def refresh_related_in_background(report_ids):
+    """
+    Runs refresh_related(report_ids) on a thread once the current transaction
+    commits, so an admin import does not wait for the catalogue scan. Until it
+    finishes (or if the worker exits first) detail pages fall back to the
+    category; ``manage.py refresh_related_reports`` recomputes everything.
+    """
+    def run():
+        try:
+            refresh_related(report_ids)
+        except Exception:
+            logger.exception("Refreshing related reports failed")
+        finally:
+            connection.close()
+
+    transaction.on_commit(lambda: threading.Thread(target=run, name='refresh-related', daemon=True).start())
+
+
+def related_reports_for(report, limit=RELATED_LIMIT):
+    """Slim related-report rows for a detail page card list."""
+    fields = ('title', 'slug', 'url_path', 'publish_date')
+    related = list(
+        Report.objects.filter(related_from__report=report)
+        .order_by('related_from__rank').only(*fields)[:limit]
+    )
+    if related:
+        return related
+    # Not computed yet (new report before the next refresh): fall back to the category.
+    return list(
+        Report.objects.filter(category_id=report.category_id).exclude(id=report.id)
+        .order_by('-publish_date').only(*fields)[:limit]
+    )
@@ -0,0 +1,36 @@
+"""
+In-process set of category slugs, so the /reports/<slug>/ dispatchers can
+tell a category from a report without a query.
+
+The set is loaded once per process and rebuilt when a category changes:
+reports.signals clears it locally and invalidates the categories cache tag,
+whose version other processes compare against on each lookup.
+"""
+import threading
+
+from pages import caching
+
+_lock = threading.Lock()
+_slugs = None
+_version = None
+
+
+def category_slugs():
+    global _slugs, _version
+    version = caching.tag_version(caching.CATEGORIES)
+    if _slugs is None or version != _version:
+        from .models import Category
+        with _lock:
+            _slugs = frozenset(Category.objects.values_list('slug', flat=True))
+            _version = version
+    return _slugs
+
+
+def is_category_slug(slug):
+    return slug in category_slugs()
+
+
+def invalidate():
+    global _slugs
+    _slugs = None
+    caching.invalidate_tags(caching.CATEGORIES)
@@ -0,0 +1,284 @@
+"""
+Synthetic catalogues (categories, regions, reports, blog posts, leads) for
+benchmarks and scale tests.
+
+Report bodies are written in the same marker format the Excel importer
+receives (named section paragraphs, SEGMENTATION/FAQ/TOC comment markers,
+nested <ol> TOC) and run through auto_format_content and
+parse_content_sections exactly like process_excel, so the detail page and
+report_filters see realistic HTML. Parsing is done for a small pool of
+body variants per run and reused, which keeps generation at bulk_create
+speed.
+
+Rows are inserted with bulk_create, one transaction per batch, from
+generators, so memory stays flat however many rows are asked for.
+Everything is driven by a seeded random.Random, so the same counts and
+seed always produce the same data.
+"""
+import datetime
+import itertools
+import random
+
+from django.db import transaction
+from django.utils.text import slugify
+
+from blog.models import BlogCategory, BlogPost
+from leads.dedupe import normalize_email
+from leads.models import Lead
+
+from .models import Category, Report
+from .utils import auto_format_content, parse_content_sections
+
+CATEGORY_NAMES = [
+    'Aerospace, Defense & Security', 'Banking, Financial Services & Insurance',
+    'Chemicals, Materials & Polymers', 'Energy & Power', 'FMCG & Consumer Products',
+    'Healthcare & Life Sciences', 'Heavy Machinery & Equipment',
+    'Industrial Automation & Mobility', 'Information Technology & Electronics',
+]
+COUNTRIES = [
+    'United States', 'India', 'Germany', 'Japan', 'Brazil', 'United Kingdom', 'China',
+    'France', 'Canada', 'South Korea', 'Australia', 'Mexico', 'Italy', 'Spain', 'Indonesia',
+    'Saudi Arabia', 'Turkey', 'Netherlands', 'Switzerland', 'Poland', 'Sweden', 'Belgium', 'Thailand',
+    'Argentina', 'Norway', 'Vietnam', 'Malaysia', 'Singapore', 'South Africa', 'Egypt', 'Nigeria',
+    'United Arab Emirates', 'Philippines', 'Chile', 'Colombia', 'Denmark', 'Finland', 'Israel', 'Ireland',
+    'New Zealand', 'Portugal',
+]
+SUBJECTS = [
+    'Artificial Intelligence', 'Electric Vehicle Battery', 'Sustainable Packaging', 'Telemedicine',
+    'Cybersecurity Insurance', 'Plant-Based Food', 'Industrial Robotics', 'Green Hydrogen',
+    'Smart Grid', 'Biopharmaceutical', 'Cloud Security', 'Precision Agriculture', 'Medical Imaging',
+    'Lithium-Ion Recycling', 'Satellite Communication', 'Specialty Polymers', 'Digital Payments',
+    'Wind Turbine', 'Cold Chain Logistics', 'Semiconductor Packaging', 'Edge Computing',
+    'Nutraceuticals', 'Autonomous Trucks', 'Carbon Capture', 'Wearable Devices',
+]
+QUALIFIERS = [
+    'Systems', 'Services', 'Software', 'Equipment', 'Components', 'Solutions', 'Materials', 'Platforms',
+]
+SECTIONS = [
+    'Report Highlights', 'Industry Snapshot', 'Key Market Growth Catalysts',
+    'Market Challenges and Constraints', 'Strategic Growth Opportunities', 'Market Coverage Overview',
+    'Geographic Performance Analysis', 'Competitive Environment Analysis',
+    'Leading Market Participants', 'Long-Term Market Perspective',
+]
+WORDS = (
+    'market demand growth adoption revenue pricing regulation supply chain investment capacity '
+    'innovation segment region players strategy forecast consumption production margin technology '
+    'integration partnerships expansion outlook competitive landscape procurement infrastructure'
+).split()
+
+BLOG_CATEGORY_NAMES = ['Industry Insights', 'Market Trends', 'Press Releases', 'Research Notes', 'Case Studies']
+FIRST_NAMES = ['Aarav', 'Emma', 'Liam', 'Priya', 'Noah', 'Sofia', 'Kenji', 'Amara', 'Lucas', 'Mei', 'Omar', 'Hannah']
+LAST_NAMES = ['Sharma', 'Smith', 'Müller', 'Tanaka', 'Silva', 'Brown', 'Kim', 'Okafor', 'Rossi', 'Chen', 'Garcia']
+DESIGNATIONS = ['Analyst', 'Product Manager', 'Director of Strategy', 'CEO', 'Research Lead', 'Consultant']
+
+# Distinct parsed bodies generated per run; reports cycle through them.
+BODY_VARIANTS = 25
+
+
+def parse_count(value):
+    """'1000', '10k' or '1.5m' -> 1500000."""
+    value = str(value).strip().lower()
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(value[-1:], 1)
+    return int(float(value.rstrip('km')) * multiplier)
+
+
+def bulk_insert(model, objects, batch_size=1000):
+    """Saves an iterable of unsaved instances in batches, one transaction each; returns the number saved."""
+    objects = iter(objects)
+    created = 0
+    while batch := list(itertools.islice(objects, batch_size)):
+        with transaction.atomic():
+            model.objects.bulk_create(batch, batch_size=batch_size)
+        created += len(batch)
+    return created
+
+
+def numbered(names, count):
+    """The first `count` of names, continued as "<name> 2", "<name> 3", ... when there are too few."""
+    return [names[i % len(names)] + (f" {i // len(names) + 1}" if i >= len(names) else '') for i in range(count)]
+
+
+def sentence(rng, words=14):
+    text = ' '.join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + '.'
+
+
+def report_title(rng, index):
+    # The index keeps titles (and therefore slugs) unique at any catalogue size.
+    return f"{rng.choice(SUBJECTS)} {rng.choice(QUALIFIERS)} Market Size, Share & Trends Analysis {index}"
+
+
+def raw_content(rng, paragraphs=3):
+    """Importer-style body: one HTML element per line, with the section and block markers."""
+    lines = []
+    for section in SECTIONS:
+        lines.append(f'<p>{section}</p>')
+        if section == 'Report Highlights':
+            lines.extend(f'<li>{sentence(rng, 10)}</li>' for _ in range(5))
+        elif section == 'Market Coverage Overview':
+            lines.append('<p>Parameter | Details</p>')
+            lines.extend(f'<p>{label} | {sentence(rng, 6)}</p>'
+                         for label in ('Market Size Value', 'Growth Rate', 'Base Year', 'Forecast Period'))
+        else:
+            lines.extend(f'<p>{" ".join(sentence(rng) for _ in range(4))}</p>' for _ in range(paragraphs))
+
+    lines.append('<!-- SEGMENTATION_START -->')
+    for dimension in ('By Type', 'By Application', 'By End User', 'By Region'):
+        lines.append(f'<p>{dimension}</p>')
+        lines.extend(f'<p>{rng.choice(SUBJECTS)} {rng.choice(QUALIFIERS)}</p>' for _ in range(5))
+    lines.append('<!-- SEGMENTATION_END -->')
+
+    lines.append('<!-- FAQ_START -->')
+    for _ in range(6):
+        lines.append(f'<h3>{sentence(rng, 8)[:-1]}?</h3>')
+        lines.append(f'<p>{" ".join(sentence(rng) for _ in range(3))}</p>')
+    lines.append('<!-- FAQ_END -->')
+
+    toc = ['<!-- TOC_START -->', '<ol>']
+    for chapter in range(1, 13):
+        toc.append(f'<li>{sentence(rng, 4)[:-1]}<ol>')
+        toc.extend(f'<li>{sentence(rng, 5)[:-1]}</li>' for _ in range(6))
+        toc.append('</ol></li>')
+    toc.extend(['</ol>', '<!-- TOC_END -->'])
+    lines.extend(toc)
+    return '\n'.join(lines)
+
+
+def parsed_body(rng):
+    """The Report field values process_excel would store for one synthetic body."""
+    formatted = auto_format_content(raw_content(rng))
+    parsed = parse_content_sections(formatted)
+    fields = dict(parsed.get('sections', {}))
+    fields.update(
+        summary=parsed.get('cleaned_summary') or formatted,
+        toc=parsed.get('toc', ''),
+        segmentation=parsed.get('segmentation', ''),
+        faqs=parsed.get('faqs', ''),
+        methodology=f'<p>{" ".join(sentence(rng) for _ in range(6))}</p>',
+    )
+    return fields
+
+
+def ensure_categories(names=CATEGORY_NAMES, model=Category):
+    """Creates whichever of the named categories are missing; returns all of them."""
+    existing = set(model.objects.filter(name__in=names).values_list('name', flat=True))
+    model.objects.bulk_create(
+        [model(name=name, slug=slugify(name)) for name in names if name not in existing],
+        ignore_conflicts=True,
+    )
+    return list(model.objects.filter(name__in=names).order_by('id'))
+
+
+def build_reports(count, seed=0, categories=None, regions=COUNTRIES, global_share=0.6, start=0,
+                  batch_size=1000, bodies=None):
+    """
+    Bulk-creates `count` reports and returns the number created. Country
+    reports are spread over `regions`. Reports are numbered from `start`, so
+    repeated calls with a different start extend a catalogue without slug
+    clashes.
+    """
+    rng = random.Random(seed)
+    categories = categories or ensure_categories()
+    bodies = bodies or [parsed_body(rng) for _ in range(BODY_VARIANTS)]
+    return bulk_insert(Report, _reports(rng, count, categories, regions, global_share, start, bodies), batch_size)
+
+
+def _reports(rng, count, categories, regions, global_share, start, bodies):
+    today = datetime.date.today()
+    for index in range(start, start + count):
+        title = report_title(rng, index)
+        region = 'Global' if rng.random() < global_share else rng.choice(regions)
+        price = rng.choice([1950, 2450, 2999, 3500, 4200, 4550, 5000])
+        report = Report(
+            title=title,
+            slug=slugify(title),
+            category=rng.choice(categories),
+            region=region,
+            publish_date=today - datetime.timedelta(days=rng.randint(0, 3 * 365)),
+            single_user_price=price,
+            multi_user_price=round(price * 1.3),
+            enterprise_price=round(price * 1.6),
+            data_pack_price=round(price * 0.6),
+            pages_count=rng.randint(120, 350),
+            base_year='2024',
+            forecast_period='2025-2032',
+            meta_title=title,
+            meta_description=sentence(rng, 20),
+            **bodies[index % len(bodies)],
+        )
+        # bulk_create skips save(): fill what it would derive.
+        report.sample_url_slug = f"download-sample-{report.slug}"
+        report.discount_url_slug = f"ask-for-discount-{report.slug}"
+        report.inquiry_url_slug = f"speak-to-analyst-{report.slug}"
+        report.url_path, report.methodology_path = report.build_url_paths()
+        yield report
+
+
+def blog_content(rng, paragraphs=8):
+    parts = []
+    for index in range(paragraphs):
+        if index % 3 == 0:
+            parts.append(f'<h2>{sentence(rng, 6)[:-1]}</h2>')
+        parts.append(f'<p>{" ".join(sentence(rng) for _ in range(5))}</p>')
+    return '\n'.join(parts)
+
+
+def build_blog_posts(count, seed=0, categories=None, start=0, batch_size=1000):
+    """Bulk-creates `count` published blog posts (without images); returns the number created."""
+    rng = random.Random(seed)
+    categories = categories or ensure_categories(BLOG_CATEGORY_NAMES, model=BlogCategory)
+    today = datetime.date.today()
+
+    def posts():
+        for index in range(start, start + count):
+            title = f"{rng.choice(SUBJECTS)} {rng.choice(['Outlook', 'Trends', 'Insights', 'Update'])} {index}"
+            yield BlogPost(
+                title=title,
+                slug=slugify(title),
+                category=rng.choice(categories),
+                content=blog_content(rng),
+                meta_title=title,
+                meta_description=sentence(rng, 20),
+                publish_date=today - datetime.timedelta(days=rng.randint(0, 3 * 365)),
+            )
+
+    return bulk_insert(BlogPost, posts(), batch_size)
+
+
+def build_leads(count, seed=0, report_ids=None, start=0, batch_size=5000):
+    """
+    Bulk-creates `count` leads, most of them against a random report from
+    report_ids; returns the number created.
+    """
+    rng = random.Random(seed)
+    if report_ids is None:
+        report_ids = list(Report.objects.values_list('id', flat=True))
+    lead_types = [code for code, _ in Lead.LEAD_TYPES]
+    license_types = [code for code, _ in Lead.LICENSE_TYPES]
+    # Free text is drawn from a pool: generating it per row would dominate the run time.
+    messages = [sentence(rng, 25) for _ in range(500)]
+
+    def leads():
+        for index in range(start, start + count):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            email = f"{first}.{last}.{index}@example.com".lower()
+            lead_type = rng.choice(lead_types)
+            yield Lead(
+                first_name=first,
+                last_name=last,
+                full_name=f"{first} {last}",
+                email=email,
+                # bulk_create skips save(), which maintains this.
+                email_normalized=normalize_email(email),
+                phone=f"{rng.randint(200, 999)}555{rng.randint(1000, 9999)}",
+                company_name=f"{rng.choice(SUBJECTS)} {rng.choice(['Inc', 'Ltd', 'GmbH', 'Group'])}",
+                designation=rng.choice(DESIGNATIONS),
+                country=rng.choice(COUNTRIES),
+                lead_type=lead_type,
+                license_type=rng.choice(license_types) if lead_type == 'PURCHASE' else None,
+                report_id=rng.choice(report_ids) if report_ids and lead_type != 'NEWSLETTER' else None,
+                message=rng.choice(messages),
+                ip_address=f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+            )
+
+    return bulk_insert(Lead, leads(), batch_size)
@@ -6,8 +6,12 @@ from django.urls import reverse
 from django.utils.safestring import mark_safe
 import re
 
+from pages.images import static_exists, static_picture
+
 register = template.Library()
 
+DEFAULT_CATEGORY_IMAGE = 'images/reports/deck_standard.jpg'
+
 
 @register.filter(name='format_faqs')
 def format_faqs(faq_content):
@@ -157,17 +161,17 @@ def format_market_coverage(content):
             value = parts[1].strip()
             
             if is_first and (key_clean.lower() == 'parameter' or key_clean.lower() == 'details'):
-                rows.append(f'''<tr style="background: #1e3a8a; border-bottom: 2px solid #1e3a8a;"><th style="padding: 1rem 1.25rem; font-weight: 700; color: #ffffff; width: 40%; text-transform: uppercase; font-size: 1rem; letter-spacing: 0.05em;">{key_clean}</th><th style="padding: 1rem 1.25rem; font-weight: 700; color: #ffffff; text-transform: uppercase; font-size: 1rem; letter-spacing: 0.05em;">{value}</th></tr>''')
+                rows.append(f'<tr class="mc-head"><th>{key_clean}</th><th>{value}</th></tr>')
                 is_first = False
                 continue
 
-            rows.append(f'''<tr style="border-bottom: 1px solid #e2e8f0;"><td style="padding: 1rem 1.25rem; font-weight: 600; color: #1e3a8a; background: #ffffff; width: 40%; font-size: 1rem;">{key_clean}</td><td style="padding: 1rem 1.25rem; color: #25292d; font-size: 1rem; line-height: 1.7; background: #ffffff;">{value}</td></tr>''')
+            rows.append(f'<tr class="mc-row"><td>{key_clean}</td><td>{value}</td></tr>')
             is_first = False
         else:
-            rows.append(f'''<tr style="border-bottom: 1px solid #f1f5f9;"><td colspan="2" style="padding: 1.1rem 1.5rem; color: #25292d; font-style: italic; background: #f8fafc; font-size: 1rem;">{clean_item}</td></tr>''')
+            rows.append(f'<tr class="mc-note"><td colspan="2">{clean_item}</td></tr>')
 
     if not rows: return mark_safe(content)
-    table_html = f'''<div class="market-coverage-wrapper" style="margin: 1rem 0 2rem 0; border: 1px solid #e2e8f0; border-radius: 8px; overflow: hidden; background: white;"><table style="width: 100%; border-collapse: collapse; text-align: left;"><tbody>{''.join(rows)}</tbody></table></div>'''
+    table_html = f'''<div class="market-coverage-wrapper"><table class="mc-table"><tbody>{''.join(rows)}</tbody></table></div>'''
     return mark_safe(table_html)
 
 
@@ -179,9 +183,9 @@ def format_list(content):
     lines = re.findall(r'<(?:p|h[1-6])>(.*?)</(?:p|h[1-6])>', content, re.DOTALL)
     if not lines: lines = [line.strip() for line in content.split('\n') if line.strip()]
     if not lines: return mark_safe(content)
-    li_items = [f'<li style="margin-bottom: 0.4rem; color: #334155; font-weight: 500; font-size: 1rem;">{re.sub(r"<[^>]+>", "", line).strip()}</li>' for line in lines if line.strip()]
+    li_items = [f'<li>{re.sub(r"<[^>]+>", "", line).strip()}</li>' for line in lines if line.strip()]
     if not li_items: return mark_safe(content)
-    return mark_safe(f'<ul style="list-style-type: disc; padding-left: 1.5rem; margin: 1rem 0;">{"".join(li_items)}</ul>')
+    return mark_safe(f'<ul class="rc-list">{"".join(li_items)}</ul>')
 
 
 @register.filter(name='format_segmentation')
@@ -209,13 +213,13 @@ def format_segmentation(content):
     for line in lines:
         if re.match(r'^By\s+', line, re.IGNORECASE):
             if current_list:
-                formatted_output.append(f'<ul style="list-style-type: disc; padding-left: 2rem; margin-bottom: 1.5rem;">{"".join(current_list)}</ul>')
+                formatted_output.append(f'<ul class="seg-list">{"".join(current_list)}</ul>')
                 current_list = []
-            formatted_output.append(f'<div style="font-weight: 800; color: #1e3a8a; font-size: 1rem; margin-top: 1.8rem; margin-bottom: 0.8rem;">{line}</div>')
+            formatted_output.append(f'<div class="seg-heading">{line}</div>')
         else:
-            current_list.append(f'<li style="margin-bottom: 0.5rem; color: #334155; font-size: 1rem; font-weight: 500;">{line}</li>')
+            current_list.append(f'<li>{line}</li>')
     if current_list:
-        formatted_output.append(f'<ul style="list-style-type: disc; padding-left: 2rem; margin-bottom: 1.5rem;">{"".join(current_list)}</ul>')
+        formatted_output.append(f'<ul class="seg-list">{"".join(current_list)}</ul>')
     if not formatted_output: return mark_safe(content)
     return mark_safe("".join(formatted_output))
 
@@ -301,8 +305,7 @@ def format_toc(content):
                 sub_counters[i] = 0
             prefix = f'Chapter {ch_count:02d} ' if not raw.lower().startswith('chapter') else ''
             output.append(
-                f'<div style="font-weight:700; color:#1e3a8a; font-size:1rem;'
-                f' margin-top:1.4rem; margin-bottom:0.2rem;">{prefix}{raw}</div>'
+                f'<div class="toc-chapter">{prefix}{raw}</div>'
             )
         else:
             # Sub-item at depth li_d (2 = first sub-level, 3 = second, etc.)
@@ -328,9 +331,7 @@ def format_toc(content):
 
             indent = 1.6 * (li_d - 1)
             output.append(
-                f'<div style="font-size:1rem; color:#25292d; font-weight:500;'
-                f' padding:0.15rem 0 0.15rem {indent}rem; line-height:1.75;'
-                f' font-family:\'Inter\', sans-serif;">{num_label}{raw}</div>'
+                f'<div class="toc-item" style="padding-left:{indent}rem;">{num_label}{raw}</div>'
             )
 
     for token in tokens:
@@ -369,11 +370,10 @@ def format_toc(content):
 
 
 
-@register.filter(name='get_category_image_url')
-def get_category_image_url(category_name):
-    """Return path to category image."""
-    from urllib.parse import quote
-    if not category_name: return '/static/images/default_category.jpg'
+@register.filter(name='category_image_path')
+def category_image_path(category_name):
+    """Static file name of the category's image, e.g. 'images/FMCG.jpg', or the generic one if it has none."""
+    if not category_name: return DEFAULT_CATEGORY_IMAGE
     mapping = {
         'Aerospace, Defense & Security': 'Aerospace, Defense & Security.jpg',
         'Chemicals, Materials & Polymers': 'Chemicals.jpg',
@@ -389,8 +389,17 @@ def get_category_image_url(category_name):
     normalized_name = category_name.lower().replace(' and ', ' & ')
     for k, v in mapping.items():
         if k.lower() in normalized_name:
-            return f'/static/images/{quote(v)}'
-    return f'/static/images/{quote(category_name + ".jpg")}'
+            return f'images/{v}'
+    # Categories added in the admin have no image until one is uploaded as images/<name>.jpg.
+    name = f'images/{category_name}.jpg'
+    return name if static_exists(name) else DEFAULT_CATEGORY_IMAGE
+
+
+@register.filter(name='get_category_image_url')
+def get_category_image_url(category_name):
+    """Return path to category image."""
+    from urllib.parse import quote
+    return '/static/' + quote(category_image_path(category_name))
 
 
 @register.filter(name='linebreak_list')
@@ -533,7 +542,7 @@ def _render_modern_format(html_content, report_obj, is_tab_content=False):
             cols = re.findall(r'<t[dh]>(.*?)</t[dh]>', r, re.DOTALL)
             if len(cols) >= 2: line_data.append(f"{cols[0].strip()} | {cols[1].strip()}")
         rendered = _render_market_coverage_table(line_data)
-        if is_tab_content: return f'<h2 style="color:#1e3a8a; font-weight:700; margin-top:2rem;">{m.group(1).strip()}</h2>{rendered}'
+        if is_tab_content: return f'<h2 class="tab-heading">{m.group(1).strip()}</h2>{rendered}'
         return f'<h1 class="section-header">{m.group(1).strip()}</h1>{rendered}'
     html_content = t_pat.sub(t_repl, html_content)
 
@@ -547,8 +556,8 @@ def _render_modern_format(html_content, report_obj, is_tab_content=False):
         if not clean: return ''
         # Logic: If it's a short item without section keywords, it's probably a participant or list item
         if is_tab_content and len(clean) < 45 and not any(kw in clean.lower() for kw in SECTION_KEYWORDS):
-             return f'<div style="margin: 0.5rem 0 0.5rem 1.5rem; color:#475569;">• {txt}</div>'
-        if is_tab_content: return f'<h2 style="color:#1e3a8a; font-weight:700; margin-top:1.5rem; margin-bottom:0.8rem;">{txt}</h2>'
+             return f'<div class="tab-bullet">• {txt}</div>'
+        if is_tab_content: return f'<h2 class="tab-heading">{txt}</h2>'
         return f'<h1 class="section-header">{txt}</h1>'
     html_content = re.sub(r'<h2[^>]*>(.*?)</h2>', hr, html_content, flags=re.IGNORECASE | re.DOTALL)
 
@@ -557,9 +566,9 @@ def _render_modern_format(html_content, report_obj, is_tab_content=False):
         clean = re.sub(r'[\u200b\uFEFF\xa0\s]+', '', re.sub(r'<[^>]+>', '', txt)).strip()
         if not clean: return ''
         if is_tab_content and len(clean) < 45 and not any(kw in clean.lower() for kw in SECTION_KEYWORDS):
-             return f'<div style="margin: 0.5rem 0 0.5rem 1.5rem; color:#475569;">• {txt}</div>'
-        if is_tab_content: return f'<h3 style="color:#334155; font-weight:600; margin-top:1rem; margin-left:1rem;">{txt}</h3>'
-        return f'<h2 class="section-subheader" style="border-left:4px solid #3b82f6; padding-left:1rem;">{txt}</h2>'
+             return f'<div class="tab-bullet">• {txt}</div>'
+        if is_tab_content: return f'<h3 class="tab-subheading">{txt}</h3>'
+        return f'<h2 class="section-subheader section-subheader-accent">{txt}</h2>'
     html_content = re.sub(r'<h3[^>]*>(.*?)</h3>', shr, html_content, flags=re.IGNORECASE | re.DOTALL)
 
     return mark_safe(html_content)
@@ -689,17 +698,13 @@ def _render_analyst_findings(content):
         f_text = re.sub(r'^[:\-—]\s*', '', f_text).strip()
         
         findings_html.append(f'''
-        <div style="flex: 1 1 300px; min-width: 280px; background: #182C44; border: 1px solid #233F5E; border-radius: 6px; padding: 1.25rem;">
-            <div style="color: #93B0CC; font-size: 0.75rem; font-weight: 700; letter-spacing: 0.05em; text-transform: uppercase; margin-bottom: 0.75rem;">
-                {f_title.upper()}
-            </div>
-            <div style="color: #F8FAFC; font-size: 0.95rem; line-height: 1.6;">
-                {f_text}
-            </div>
+        <div class="analyst-finding">
+            <div class="analyst-finding-title">{f_title.upper()}</div>
+            <div class="analyst-finding-text">{f_text}</div>
         </div>
         ''')
         
-    findings_row = f'''<div style="display: flex; flex-wrap: wrap; gap: 1rem; margin-bottom: 1rem;">
+    findings_row = f'''<div class="analyst-findings-row">
         {''.join(findings_html)}
     </div>''' if findings_html else ''
     
@@ -715,7 +720,7 @@ def _render_analyst_findings(content):
         clean_strong_title = re.sub(r'<[^>]+>', '', clean_strong_title).strip()
         
         if clean_strong_title:
-            rec_text = f"<strong style=\"color: white;\">{clean_strong_title}:</strong> {rec_text}"
+            rec_text = f"<strong>{clean_strong_title}:</strong> {rec_text}"
             
         if not rec_text: 
              rec_text = recommendation  
@@ -724,39 +729,29 @@ def _render_analyst_findings(content):
         if not rec_text: rec_text = recommendation
         
     rec_html = f'''
-    <style>
-        .analyst-rec-content, .analyst-rec-content * {{
-            color: #FFFFFF !important;
-        }}
-    </style>
-    <div style="background: linear-gradient(135deg, #1e3a8a 0%, #3b82f6 100%); border-radius: 6px; padding: 1.25rem; display: flex; gap: 1rem; align-items: flex-start; border: none;">
-        <div style="background: rgba(255,255,255,0.15); border-radius: 50%; width: 22px; height: 22px; display: flex; align-items: center; justify-content: center; flex-shrink: 0; margin-top: 0.1rem;">
+    <div class="callout-box">
+        <div class="callout-icon">
             <svg width="12" height="12" viewBox="0 0 24 24" fill="none" stroke="white" stroke-width="3" stroke-linecap="round" stroke-linejoin="round"><polyline points="20 6 9 17 4 12"></polyline></svg>
         </div>
         <div>
-            <div style="color: #E0F2FE; font-size: 0.75rem; font-weight: 700; letter-spacing: 0.05em; text-transform: uppercase; margin-bottom: 0.5rem;">
-                {rec_title}
-            </div>
-            <div class="analyst-rec-content" style="color: #FFFFFF; font-size: 0.95rem; line-height: 1.6;">
-                {rec_text}
-            </div>
+            <div class="callout-label">{rec_title}</div>
+            <div class="analyst-rec-content">{rec_text}</div>
         </div>
     </div>
     ''' if recommendation else ''
     
     return f'''
-    <div style="background: #0D1F34; border-radius: 8px; padding: 1.5rem; margin: 2.5rem 0; font-family: 'Inter', system-ui, -apple-system, sans-serif; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
-        <div style="margin-bottom: 1.5rem; border-bottom: 1px solid #1C324E; padding-bottom: 1rem;">
-            <div style="color: white; font-size: 1.15rem; font-weight: 700;">
-                {main_title}
-            </div>
-        </div>
+    <div class="analyst-findings">
+        <div class="analyst-findings-header">{main_title}</div>
         {findings_row}
         {rec_html}
     </div>
     '''
 
 
+# Figure cards sit in the report body column (~760px wide on desktop).
+FIGURE_SIZES = '(max-width: 768px) 92vw, 760px'
+
 def _render_bar_chart(slug):
     """Bar chart card — Image 1 (after Report Highlights)."""
     url = f'/reports/request-sample/{slug}/' if slug else '#'
@@ -764,15 +759,12 @@ def _render_bar_chart(slug):
         url = reverse('request-sample', kwargs={'slug': slug}) if slug else '#'
     except: pass
     return f'''
-<div style="text-align: center; margin: 2.5rem 0 0.75rem 0;">
-    <div style="background:#fff; border-radius:16px; box-shadow:0 4px 24px rgba(0,0,0,0.08); display:inline-block; padding:0; overflow:hidden; max-width:92%;">
-        <img src="/static/images/reports/bar_chart_standard.jpg" alt="Market Growth Chart"
-             style="max-width:100%; display:block; border-radius:16px;">
+<figure class="report-figure">
+    <div class="report-figure-frame">
+        {static_picture('images/reports/bar_chart_standard.jpg', 'Market Growth Chart', sizes=FIGURE_SIZES)}
     </div>
-</div>
-<div style="text-align:center; margin-bottom:2.5rem; font-size:0.97rem; font-weight:500; color:#334155;">
-    Want Detailed Insights - <a href="{url}" style="color:#2563eb; text-decoration:underline;">Download Sample</a>
-</div>'''
+    <figcaption>Want Detailed Insights - <a href="{url}">Download Sample</a></figcaption>
+</figure>'''
 
 def _render_regional_map(region, slug):
     """Regional map card — Image 2 (mid content)."""
@@ -781,15 +773,12 @@ def _render_regional_map(region, slug):
         url = reverse('ask-for-discount', kwargs={'slug': slug}) if slug else '#'
     except: pass
     return f'''
-<div style="text-align: center; margin: 2.5rem 0 0.75rem 0;">
-    <div style="background:#fff; border-radius:16px; box-shadow:0 4px 24px rgba(0,0,0,0.08); display:inline-block; padding:0; overflow:hidden; max-width:92%;">
-        <img src="/static/images/reports/regional_map_standard.png" alt="Regional Market Map"
-             style="max-width:100%; display:block; border-radius:16px;">
+<figure class="report-figure">
+    <div class="report-figure-frame">
+        {static_picture('images/reports/regional_map_standard.png', 'Regional Market Map', sizes=FIGURE_SIZES)}
     </div>
-</div>
-<div style="text-align:center; margin-bottom:2.5rem; font-size:0.97rem; font-weight:500; color:#334155;">
-    Limited Budget ? - <a href="{url}" style="color:#2563eb; text-decoration:underline;">Ask for Discount</a>
-</div>'''
+    <figcaption>Limited Budget ? - <a href="{url}">Ask for Discount</a></figcaption>
+</figure>'''
 
 def _render_deck(slug):
     """Deck preview card — Image 3 (end of content)."""
@@ -798,15 +787,12 @@ def _render_deck(slug):
         url = reverse('request-customization', kwargs={'slug': slug}) if slug else '#'
     except: pass
     return f'''
-<div style="text-align: center; margin: 2.5rem 0 0.75rem 0;">
-    <div style="background:#fff; border-radius:16px; box-shadow:0 4px 24px rgba(0,0,0,0.08); display:inline-block; padding:0; overflow:hidden; max-width:92%;">
-        <img src="/static/images/reports/deck_standard.jpg" alt="Market Analysis Dashboard"
-             style="max-width:100%; display:block; border-radius:16px;">
+<figure class="report-figure">
+    <div class="report-figure-frame">
+        {static_picture('images/reports/deck_standard.jpg', 'Market Analysis Dashboard', sizes=FIGURE_SIZES)}
     </div>
-</div>
-<div style="text-align:center; margin-bottom:2.5rem; font-size:0.97rem; font-weight:500; color:#334155;">
-    Need Customized Scope - <a href="{url}" style="color:#2563eb; text-decoration:underline;">Get my Report Customized</a>
-</div>'''
+    <figcaption>Need Customized Scope - <a href="{url}">Get my Report Customized</a></figcaption>
+</figure>'''
 
 def _render_market_coverage_table(line_data):
     """Professional table renderer."""
@@ -814,13 +800,13 @@ def _render_market_coverage_table(line_data):
     for line in line_data:
         if '|' in line:
             k, v = line.split('|', 1)
-            rows.append(f'<tr style="border-bottom: 1px solid #f1f5f9;"><td style="padding: 1rem; font-weight: 700; color: #1e3a8a; width: 35%; background: #f8fafc; font-size: 1rem;">{k.strip()}</td><td style="padding: 1rem; color: #25292d; font-size: 1rem; line-height: 1.7;">{v.strip()}</td></tr>')
-    return f'<div style="margin: 2rem 0; border: 1px solid #e2e8f0; border-radius: 8px; overflow: hidden;"><table style="width: 100%; border-collapse: collapse;"><tbody>{"".join(rows)}</tbody></table></div>'
+            rows.append(f'<tr><td>{k.strip()}</td><td>{v.strip()}</td></tr>')
+    return f'<div class="kv-table-wrapper"><table class="kv-table"><tbody>{"".join(rows)}</tbody></table></div>'
 
 def _render_report_highlights(items, h_text="Report Highlights"):
     """Premium Highlights box."""
-    lis = "".join(f'<li style="display: flex; gap: 0.5rem; padding: 0.2rem 0;"><span style="color: #10b981;">✓</span><span style="color: #1e293b; font-weight: 500;">{i}</span></li>' for i in items)
-    return f'<h1 class="section-header">{h_text}</h1><div style="background: linear-gradient(135deg, #f8fafc 0%, #f1f5f9 100%); border-left: 6px solid #1e3a8a; padding: 1.5rem 2rem; border-radius: 12px; margin: 2rem 0; box-shadow: 0 4px 10px rgba(0,0,0,0.05);"><ul style="list-style: none; padding: 0; margin: 0;">{lis}</ul></div>'
+    lis = "".join(f'<li><span class="hl-check">✓</span><span class="hl-text">{i}</span></li>' for i in items)
+    return f'<h1 class="section-header">{h_text}</h1><div class="hl-box"><ul>{lis}</ul></div>'
 
 
 @register.filter(name='format_blog_content')
@@ -866,42 +852,12 @@ def format_blog_content(content):
     
     # Render the styled "Our Take" card
     our_take_html = f'''
-    <style>
-        .blog-article-body .our-take-box, 
-        .blog-article-body .our-take-box * {{
-            color: #FFFFFF !important;
-        }}
-        .blog-article-body .our-take-box p {{
-            margin-bottom: 0 !important;
-            line-height: 1.6 !important;
-            font-size: 0.95rem !important;
-            color: #FFFFFF !important;
-        }}
-        .blog-article-body .our-take-box strong {{
-            color: #FFFFFF !important;
-            font-weight: 700 !important;
-        }}
-        .our-take-box {{
-            background: linear-gradient(135deg, #1e3a8a 0%, #3b82f6 100%);
-            border-radius: 8px;
-            padding: 1.25rem;
-            display: flex;
-            gap: 1rem;
-            align-items: flex-start;
-            border: none;
-            margin: 2.5rem 0;
-            font-family: 'Inter', system-ui, -apple-system, sans-serif;
-            box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-        }}
-    </style>
     <div class="our-take-box">
-        <div style="background: rgba(255,255,255,0.15); border-radius: 50%; width: 22px; height: 22px; display: flex; align-items: center; justify-content: center; flex-shrink: 0; margin-top: 0.1rem;">
+        <div class="callout-icon">
             <svg width="12" height="12" viewBox="0 0 24 24" fill="none" stroke="white" stroke-width="3" stroke-linecap="round" stroke-linejoin="round"><path d="M15 14c.2-1 .7-1.7 1.5-2.5 1-.9 1.5-2.2 1.5-3.5A5 5 0 0 0 8 8c0 1 .3 2.2 1.5 3.5.7.7 1.3 1.5 1.5 2.5"></path><line x1="9" y1="18" x2="15" y2="18"></line><line x1="10" y1="22" x2="14" y2="22"></line></svg>
         </div>
         <div>
-            <div style="color: #E0F2FE; font-size: 0.75rem; font-weight: 700; letter-spacing: 0.05em; text-transform: uppercase; margin-bottom: 0.5rem;">
-                OUR TAKE
-            </div>
+            <div class="callout-label">OUR TAKE</div>
             <div class="our-take-content">
                 {cleaned_our_take}
             </div>
@@ -1,3 +1,82 @@
+import json
+from unittest import mock
+
+from django.contrib import admin
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from . import admin as report_admin, benchmarks
+from .models import PricingStats, Report
+from .pricing import refresh_pricing_stats
+from .related import refresh_related
+from .synthetic import build_reports
+
+
+class BenchmarkCaseTests(TestCase):
+    """Runs every benchmark case once on a small catalogue: status codes and query budgets must hold."""
+
+    @classmethod
+    def setUpTestData(cls):
+        build_reports(60, seed=1)
+        refresh_related()
+        refresh_pricing_stats()
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cases_within_query_budget(self):
+        results = benchmarks.run(iterations=1, warmup=0, seed=1)
+        self.assertEqual(set(results), {case.name for case in benchmarks.CASES})
+        for name, result in results.items():
+            with self.subTest(case=name):
+                self.assertTrue(result['within_budget'], f"{result['queries']} queries > {result['query_budget']}")
+                self.assertGreater(result['bytes'], 0)
+        json.dumps({'meta': benchmarks.metadata(60, 1), 'results': results})
+
+    def test_compare_flags_regressions(self):
+        previous = {'results': {'fast': {'median_ms': 10.0}, 'slow': {'median_ms': 10.0}}}
+        current = {'results': {'fast': {'median_ms': 11.0}, 'slow': {'median_ms': 15.0}, 'new': {'median_ms': 1.0}}}
+        rows = {row[0]: row for row in benchmarks.compare(previous, current, tolerance=0.2)}
+        self.assertEqual(set(rows), {'fast', 'slow'})
+        self.assertFalse(rows['fast'][4])
+        self.assertTrue(rows['slow'][4])
+
+
+class PricingStatsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        build_reports(60, seed=2)
+        refresh_pricing_stats()
+
+    def table(self):
+        return {(row.scope, row.category_id): (row.report_count, row.stats) for row in PricingStats.objects.all()}
+
+    def test_refreshing_one_scope_matches_a_full_refresh(self):
+        Report.objects.filter(region='Global').update(single_user_price=100)
+        Report.objects.exclude(region='Global').update(single_user_price=200)
+        refresh_pricing_stats({'global'})
+        partial = self.table()
+        self.assertEqual(partial[('global', None)][1]['single']['max'], 100)
+        self.assertNotEqual(partial[('country', None)][1]['single']['max'], 200)  # not refreshed yet
+        refresh_pricing_stats({'country'})
+        partial = self.table()
+        refresh_pricing_stats()
+        self.assertEqual(partial, self.table())
+
+    def test_admin_save_refreshes_only_on_price_changes(self):
+        model_admin = admin.site._registry[Report]
+        report = Report.objects.filter(region='Global').first()
+        with mock.patch.object(report_admin, 'refresh_pricing_stats') as refresh:
+            for changed, region, expected in (
+                (['title'], 'Global', None),
+                (['single_user_price'], 'Global', {'global'}),
+                (['region'], 'India', {'global', 'country'}),
+            ):
+                report.region = region
+                form = mock.Mock(changed_data=changed, initial={'region': 'Global'})
+                refresh.reset_mock()
+                model_admin.save_model(None, report, form, change=True)
+                if expected is None:
+                    refresh.assert_not_called()
+                else:
+                    refresh.assert_called_once_with(expected)
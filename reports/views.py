@@ -2,6 +2,9 @@ from django.db.models import Q
 from rest_framework import generics, filters
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Report, Category
+from .related import related_reports_for
+from .slugs import is_category_slug
+from pages.context_processors import template_cache
 from .serializers import ReportListSerializer, ReportDetailSerializer, CategorySerializer
 from rest_framework.pagination import PageNumberPagination
 from django.views.generic import TemplateView, DetailView, ListView
@@ -94,6 +97,8 @@ class ReportListView(ListView):
         return context
 
 from django.shortcuts import get_object_or_404, redirect
+from django.http import Http404, HttpResponse
+from django.template.loader import render_to_string
 from django.views import View
 from leads.forms import LeadForm
 
@@ -106,7 +111,7 @@ class CategoryOrReportView(View):
         slug = kwargs.get('slug')
         
         # Check if it's a category
-        if Category.objects.filter(slug=slug).exists():
+        if is_category_slug(slug):
             # Build clean kwargs — replace 'slug' with 'category_slug'
             clean_kwargs = {k: v for k, v in kwargs.items() if k != 'slug'}
             clean_kwargs['category_slug'] = slug
@@ -126,7 +131,7 @@ class CountryCategoryOrReportView(View):
         country_slug = kwargs.get('country_slug')
         
         # Check if it's a category
-        if Category.objects.filter(slug=slug).exists():
+        if is_category_slug(slug):
             # Build clean kwargs — replace 'slug' with 'category_slug', keep 'country_slug'
             clean_kwargs = {k: v for k, v in kwargs.items() if k != 'slug'}
             clean_kwargs['category_slug'] = slug
@@ -168,14 +173,16 @@ class ReportDetailView(DetailView):
     model = Report
     template_name = "reports/report_detail.html"
     context_object_name = "report"
+    # Only used by the lazily loaded tabs (ReportTabFragmentView) or not rendered at all
+    deferred_fields = ('toc', 'methodology')
+
+    def get_queryset(self):
+        return Report.objects.select_related('category').defer(*self.deferred_fields)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['lead_form'] = LeadForm()
-        # Add related reports from the same category, excluding current report
-        context['related_reports'] = Report.objects.filter(
-            category=self.object.category
-        ).exclude(id=self.object.id).order_by('-publish_date')[:6]
+        context['related_reports'] = related_reports_for(self.object)
         
         # Add categories for sidebar navigation
         context['all_categories'] = Category.objects.annotate(
@@ -278,13 +285,15 @@ class ReportMethodologyView(DetailView):
     template_name = "reports/methodology.html"
     context_object_name = "report"
 
+    def get_queryset(self):
+        # The methodology page is static copy; it only shows the report's header fields.
+        return Report.objects.only(
+            'title', 'slug', 'region', 'category', 'publish_date', 'pages_count', 'url_path',
+        )
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['lead_form'] = LeadForm()
-        # Add related reports from the same category, excluding current report
-        context['related_reports'] = Report.objects.filter(
-            category=self.object.category
-        ).exclude(id=self.object.id).order_by('-publish_date')[:6]
         
         # Add categories for sidebar navigation
         context['all_categories'] = Category.objects.annotate(
@@ -293,6 +302,27 @@ class ReportMethodologyView(DetailView):
         
         return context
 
+class ReportTabFragmentView(View):
+    """
+    Body of a detail-page tab that is not part of the initial render,
+    fetched by the page when the visitor opens the tab.
+    """
+    tab_fields = {
+        'segmentation': ('slug', 'region', 'updated_at', 'summary', 'segmentation'),
+        'toc': ('slug', 'region', 'updated_at', 'summary', 'segmentation', 'toc'),
+    }
+
+    def get(self, request, slug, tab):
+        fields = self.tab_fields.get(tab)
+        if fields is None:
+            raise Http404("Unknown tab")
+        report = get_object_or_404(Report.objects.only(*fields), slug=slug)
+        # Rendered without the request: a fragment needs none of the site-wide context processors.
+        context = {'report': report, 'tab': tab, **template_cache()}
+        html = render_to_string("reports/report_tab_fragment.html", context)
+        return HttpResponse(html)
+
+
 class CategoryListAPIView(generics.ListAPIView):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
@@ -328,7 +358,7 @@ class ReportSearchSuggestionsView(APIView):
         # Search in title and summary
         reports = Report.objects.filter(
             Q(title__icontains=q) | Q(summary__icontains=q)
-        ).select_related('category').only('title', 'slug', 'category__slug', 'region')[:10]
+        ).only('title', 'url_path')[:10]
         
         results = []
         for r in reports:
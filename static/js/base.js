@@ -0,0 +1,296 @@
+document.getElementById('menuToggle').addEventListener('click', function (e) {
+    e.stopPropagation();
+    const navLinks = document.getElementById('navLinks');
+    const menuOverlay = document.getElementById('menuOverlay');
+    navLinks.classList.toggle('active');
+    menuOverlay.classList.toggle('active');
+    this.classList.toggle('active');
+
+    const spans = this.querySelectorAll('span');
+    if (this.classList.contains('active')) {
+        spans[0].style.transform = 'rotate(45deg) translate(5px, 6px)';
+        spans[1].style.opacity = '0';
+        spans[2].style.transform = 'rotate(-45deg) translate(5px, -6px)';
+    } else {
+        spans[0].style.transform = 'none';
+        spans[1].style.opacity = '1';
+        spans[2].style.transform = 'none';
+    }
+});
+
+// Close menu when clicking overlay
+document.getElementById('menuOverlay').addEventListener('click', function () {
+    const navLinks = document.getElementById('navLinks');
+    const menuToggle = document.getElementById('menuToggle');
+    navLinks.classList.remove('active');
+    this.classList.remove('active');
+    menuToggle.classList.remove('active');
+
+    const spans = menuToggle.querySelectorAll('span');
+    spans[0].style.transform = 'none';
+    spans[1].style.opacity = '1';
+    spans[2].style.transform = 'none';
+});
+
+// Close menu when clicking outside
+document.addEventListener('click', function (event) {
+    const navLinks = document.getElementById('navLinks');
+    const menuToggle = document.getElementById('menuToggle');
+    const menuOverlay = document.getElementById('menuOverlay');
+    if (!navLinks.contains(event.target) && !menuToggle.contains(event.target) && navLinks.classList.contains('active')) {
+        navLinks.classList.remove('active');
+        menuOverlay.classList.remove('active');
+        menuToggle.classList.remove('active');
+
+        const spans = menuToggle.querySelectorAll('span');
+        spans[0].style.transform = 'none';
+        spans[1].style.opacity = '1';
+        spans[2].style.transform = 'none';
+    }
+});
+
+
+// Mobile Back Button Logic
+function goBack() {
+    window.history.back();
+}
+
+document.addEventListener("DOMContentLoaded", function () {
+    const backBtn = document.getElementById('mobileBackBtn');
+    if (window.location.pathname === '/' || window.location.pathname === '') {
+        if (backBtn) backBtn.style.display = 'none';
+    }
+});
+
+document.addEventListener("DOMContentLoaded", function () {
+    const phoneInputs = [
+        { inputId: "#id_phone", codeId: "#id_country_code" },
+        { inputId: "#id_phone_checkout", codeId: "#id_country_code" }
+    ];
+
+    phoneInputs.forEach(item => {
+        const input = document.querySelector(item.inputId);
+        const codeInput = document.querySelector(item.codeId);
+
+        if (input) {
+            const iti = window.intlTelInput(input, {
+                utilsScript: "https://cdn.jsdelivr.net/npm/intl-tel-input@18.2.1/build/js/utils.js",
+                initialCountry: "auto",
+                geoIpLookup: function (callback) {
+                    fetch("https://ipapi.co/json")
+                        .then(res => res.json())
+                        .then(data => callback(data.country_code))
+                        .catch(() => callback("us"));
+                },
+                preferredCountries: ['us', 'gb', 'in', 'de', 'jp'],
+                separateDialCode: true,
+            });
+
+            // Strict India Phone Validation - Input event
+            input.addEventListener('input', function (e) {
+                const countryData = iti.getSelectedCountryData();
+                let digits = this.value.replace(/\D/g, '');
+
+                if (countryData && countryData.iso2 === 'in') {
+                    if (digits.length > 10) {
+                        digits = digits.slice(0, 10);
+                    }
+                }
+                this.value = digits;
+            });
+
+            // Keydown event - prevent typing beyond 10 digits for India
+            input.addEventListener('keydown', function (e) {
+                const countryData = iti.getSelectedCountryData();
+                if (countryData && countryData.iso2 === 'in') {
+                    const currentLength = this.value.replace(/\D/g, '').length;
+                    if ([8, 9, 27, 13, 46].indexOf(e.keyCode) !== -1 ||
+                        (e.keyCode === 65 && e.ctrlKey === true) ||
+                        (e.keyCode === 67 && e.ctrlKey === true) ||
+                        (e.keyCode === 86 && e.ctrlKey === true) ||
+                        (e.keyCode === 88 && e.ctrlKey === true) ||
+                        (e.keyCode >= 35 && e.keyCode <= 39)) {
+                        return;
+                    }
+                    if (currentLength >= 10) {
+                        e.preventDefault();
+                    }
+                }
+            });
+
+            // Paste event - trim to 10 digits for India
+            input.addEventListener('paste', function (e) {
+                const countryData = iti.getSelectedCountryData();
+                if (countryData && countryData.iso2 === 'in') {
+                    setTimeout(() => {
+                        let val = input.value.replace(/\D/g, '');
+                        if (val.length > 10) {
+                            val = val.slice(0, 10);
+                        }
+                        input.value = val;
+                    }, 10);
+                }
+            });
+
+            // Update hidden code field on change
+            input.addEventListener("countrychange", function () {
+                input.value = '';
+                const countryData = iti.getSelectedCountryData();
+                if (codeInput) {
+                    codeInput.value = "+" + countryData.dialCode;
+                }
+            });
+
+            // Initialize hidden field
+            if (codeInput) {
+                const countryData = iti.getSelectedCountryData();
+                if (countryData.dialCode) {
+                    codeInput.value = "+" + countryData.dialCode;
+                }
+            }
+        }
+    });
+});
+
+document.addEventListener('DOMContentLoaded', function () {
+    const searchInputs = document.querySelectorAll('input[name="q"]');
+
+    searchInputs.forEach(input => {
+        const form = input.closest('form');
+        if (!form) return;
+
+        // Create suggestions container
+        const suggestionsContainer = document.createElement('div');
+        suggestionsContainer.className = 'search-suggestions-container';
+
+        // Add to a relative parent
+        let parent = input.parentElement;
+        if (form.classList.contains('hero-search-form') || form.classList.contains('reports-search-form')) {
+            parent = form;
+        } else if (input.parentElement.classList.contains('reports-search-inner')) {
+            parent = input.parentElement;
+        }
+
+        parent.style.position = 'relative';
+        // Force visibility on parents to prevent clipping
+        let current = parent;
+        while (current && current !== document.body) {
+            if (getComputedStyle(current).overflow === 'hidden') {
+                current.style.overflow = 'visible';
+            }
+            current = current.parentElement;
+        }
+
+        parent.appendChild(suggestionsContainer);
+
+        let debounceTimer;
+        let activeIndex = -1;
+
+        input.setAttribute('autocomplete', 'off');
+
+        input.addEventListener('input', function () {
+            clearTimeout(debounceTimer);
+            const query = this.value.trim();
+
+            if (query.length < 2) {
+                suggestionsContainer.style.display = 'none';
+                form.classList.remove('has-suggestions');
+                return;
+            }
+
+            debounceTimer = setTimeout(() => {
+                fetch(`/api/reports/search-suggestions/?q=${encodeURIComponent(query)}`)
+                    .then(response => {
+                        if (!response.ok) throw new Error('Network response was not ok');
+                        return response.json();
+                    })
+                    .then(data => {
+                        renderSuggestions(data, suggestionsContainer);
+                        if (data.length > 0) {
+                            form.classList.add('has-suggestions');
+                        } else {
+                            form.classList.remove('has-suggestions');
+                        }
+                    })
+                    .catch(error => {
+                        console.error('Error fetching suggestions:', error);
+                        suggestionsContainer.style.display = 'none';
+                        form.classList.remove('has-suggestions');
+                    });
+            }, 300);
+        });
+
+        input.addEventListener('keydown', function (e) {
+            const items = suggestionsContainer.querySelectorAll('.search-suggestion-item');
+            if (suggestionsContainer.style.display === 'none' || !items.length) return;
+
+            if (e.key === 'ArrowDown') {
+                e.preventDefault();
+                activeIndex = (activeIndex + 1) % items.length;
+                updateActiveItem(items);
+            } else if (e.key === 'ArrowUp') {
+                e.preventDefault();
+                activeIndex = (activeIndex - 1 + items.length) % items.length;
+                updateActiveItem(items);
+            } else if (e.key === 'Enter' && activeIndex > -1) {
+                e.preventDefault();
+                items[activeIndex].click();
+            } else if (e.key === 'Escape') {
+                suggestionsContainer.style.display = 'none';
+                form.classList.remove('has-suggestions');
+            }
+        });
+
+        function updateActiveItem(items) {
+            items.forEach((item, index) => {
+                if (index === activeIndex) {
+                    item.classList.add('active');
+                    item.scrollIntoView({ block: 'nearest' });
+                } else {
+                    item.classList.remove('active');
+                }
+            });
+        }
+
+        function renderSuggestions(data, container) {
+            container.innerHTML = '';
+            activeIndex = -1;
+
+            if (data.length === 0) {
+                container.style.display = 'none';
+                form.classList.remove('has-suggestions');
+            } else {
+                data.forEach(item => {
+                    const suggestion = document.createElement('a');
+                    suggestion.href = item.url;
+                    suggestion.className = 'search-suggestion-item';
+                    suggestion.innerHTML = `
+                        <i class="fas fa-file-alt"></i>
+                        <div style="display: flex; flex-direction: column;">
+                            <span class="search-suggestion-title">${item.title}</span>
+                            <span style="font-size: 0.75rem; color: #64748b; font-weight: 500;">Market Intelligence Report</span>
+                        </div>
+                    `;
+                    container.appendChild(suggestion);
+                });
+                container.style.display = 'block';
+            }
+        }
+
+        // Close suggestions when clicking outside
+        document.addEventListener('click', function (e) {
+            if (!input.contains(e.target) && !suggestionsContainer.contains(e.target)) {
+                suggestionsContainer.style.display = 'none';
+                form.classList.remove('has-suggestions');
+            }
+        });
+
+        // Show again on focus if query exists
+        input.addEventListener('focus', function () {
+            if (this.value.trim().length >= 2 && suggestionsContainer.children.length > 0) {
+                suggestionsContainer.style.display = 'block';
+                form.classList.add('has-suggestions');
+            }
+        });
+    });
+});
@@ -0,0 +1,205 @@
+document.addEventListener("DOMContentLoaded", function () {
+    // Check for payment success parameter
+    const urlParams = new URLSearchParams(window.location.search);
+    if (urlParams.get('payment') === 'success') {
+        Swal.fire({
+            title: 'Payment Successful!',
+            text: 'Thank you for your purchase. We have received your order and will send the report to your email shortly.',
+            icon: 'success',
+            confirmButtonColor: '#2563eb',
+            confirmButtonText: 'Great!'
+        }).then((result) => {
+            // Remove parameter from URL
+            const url = new URL(window.location);
+            url.searchParams.delete('payment');
+            window.history.replaceState({}, '', url);
+        });
+    }
+});
+
+// Tab Switching Logic
+document.addEventListener('DOMContentLoaded', function () {
+    const tabs = document.querySelectorAll('button.tab-btn');
+    const panes = document.querySelectorAll('.tab-pane');
+
+    tabs.forEach(tab => {
+        tab.addEventListener('click', () => {
+            // Remove active class from all
+            tabs.forEach(t => t.classList.remove('active'));
+            panes.forEach(p => p.classList.remove('active'));
+
+            // Add active to clicked
+            tab.classList.add('active');
+
+            // Show corresponding pane
+            const targetId = tab.dataset.tab;
+            const pane = document.getElementById(targetId);
+            pane.classList.add('active');
+
+            // Lazy tab bodies
+            if (pane.dataset.fragmentUrl && !pane.dataset.loaded) {
+                pane.dataset.loaded = '1';
+                fetch(pane.dataset.fragmentUrl)
+                    .then(response => response.ok ? response.text() : Promise.reject(response.status))
+                    .then(html => { pane.innerHTML = html; })
+                    .catch(() => { delete pane.dataset.loaded; });
+            }
+        });
+    });
+
+    // All heading cleanup is now handled server-side by format_report_content filter.
+    // No client-side heading manipulation needed.
+
+    // FAQ Accordion Toggle
+    const faqHeaders = document.querySelectorAll('.faq-accordion-header');
+    faqHeaders.forEach(header => {
+        header.addEventListener('click', function () {
+            const item = this.parentElement;
+
+            // Toggle current
+            const isOpen = item.classList.contains('open');
+
+            // Close others
+            document.querySelectorAll('.faq-accordion-item').forEach(i => i.classList.remove('open'));
+
+            if (!isOpen) {
+                item.classList.add('open');
+            }
+        });
+    });
+});
+
+// Buy Link Update
+// Buy Link Update
+function updateBuyLink(radio, slug) {
+    const type = radio.value; // Now this will be single, multi, enterprise, or datapack
+    const form = document.getElementById('buyForm');
+    form.action = `/checkout/${slug}/${type}/`;
+}
+
+document.addEventListener('DOMContentLoaded', function () {
+    const popup = document.getElementById('exitIntentPopup');
+    const closeBtn = document.querySelector('.exit-popup-close');
+    const form = document.getElementById('exitIntentForm');
+    const messageDiv = document.getElementById('exitFormMessage');
+    const successDiv = document.getElementById('popupSuccess');
+    const formContainer = document.getElementById('popupFormContainer');
+    const popupTitle = document.getElementById('exitPopupTitle');
+    const emailInput = document.getElementById('exitEmail');
+    const emailError = document.getElementById('emailError');
+
+    // Truncate Title Logic
+    if (popupTitle) {
+        const originalTitle = popupTitle.innerText;
+        // Split by " Market" (case sensitive usually, but assuming standardized titles)
+        const marketIndex = originalTitle.indexOf(' Market');
+        if (marketIndex !== -1) {
+            // Include " Market" in the result length (7 characters)
+            popupTitle.innerText = originalTitle.substring(0, marketIndex + 7);
+        }
+    }
+
+    // Corporate Email Validation Logic
+    const blockedDomains = ['gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com', 'aol.com', 'icloud.com', 'protonmail.com'];
+
+    function isCorporateEmail(email) {
+        if (!email.includes('@')) return false;
+        const domain = email.split('@')[1].toLowerCase();
+        return !blockedDomains.includes(domain);
+    }
+
+    // Use a simple variable instead of localStorage so it resets on every page load
+    let hasShownPopup = false;
+
+    function showPopup() {
+        if (!hasShownPopup) {
+            // Reset form state on new show
+            if (formContainer) formContainer.style.display = 'block';
+            if (successDiv) successDiv.style.display = 'none';
+            popup.style.display = 'flex';
+            hasShownPopup = true;
+        }
+    }
+
+    // Exit Intent Logic (Desktop)
+    document.addEventListener('mouseleave', function (e) {
+        // Trigger when mouse moves out of the top of the window
+        if (e.clientY < 5) {
+            showPopup();
+        }
+    });
+
+    // Close Logic
+    closeBtn.addEventListener('click', function () {
+        popup.style.display = 'none';
+    });
+
+    // Allow closing success screen
+    const successClose = document.querySelector('.exit-popup-close-btn');
+    if (successClose) {
+        successClose.addEventListener('click', function () {
+            popup.style.display = 'none';
+        });
+    }
+
+    popup.addEventListener('click', function (e) {
+        if (e.target === popup) {
+            popup.style.display = 'none';
+        }
+    });
+
+    // Form Submission
+    form.addEventListener('submit', function (e) {
+        e.preventDefault();
+
+        const email = emailInput.value;
+        if (!isCorporateEmail(email)) {
+            emailError.style.display = 'block';
+            emailInput.style.borderColor = 'red';
+            emailInput.focus();
+            return;
+        } else {
+            emailError.style.display = 'none';
+            emailInput.style.borderColor = '#cbd5e1';
+        }
+
+        const formData = new FormData(form);
+
+        // Disable button
+        const btn = form.querySelector('button[type="submit"]');
+        const originalText = btn.innerText;
+        btn.disabled = true;
+        btn.innerText = 'Sending...';
+
+        if (typeof exitIntentWidgetId !== 'undefined') {
+            grecaptcha.execute(exitIntentWidgetId);
+        } else {
+            console.error("Recaptcha not loaded yet");
+            alert("Please wait for security check to load.");
+            btn.disabled = false;
+            btn.innerText = originalText;
+        }
+    });
+
+    // Clear error on input
+    emailInput.addEventListener('input', function () {
+        emailError.style.display = 'none';
+        this.style.borderColor = '#cbd5e1';
+    });
+
+    // Fallback: Convert <p><strong>Heading</strong></p> or <p><b>Heading</b></p> to <h2>Heading</h2>
+    // This styles them consistently as blue-bold sections if the database doesn't have proper heading tags
+    document.querySelectorAll('.tab-body p').forEach(p => {
+        const trimmedHTML = p.innerHTML.trim();
+        const isBoldOnly = (trimmedHTML.startsWith('<strong>') && trimmedHTML.endsWith('</strong>')) ||
+            (trimmedHTML.startsWith('<b>') && trimmedHTML.endsWith('</b>'));
+
+        if (isBoldOnly) {
+            const h2 = document.createElement('h2');
+            h2.innerHTML = p.querySelector('strong, b').innerHTML;
+            // Add a marker class to distinguish from static section-headers if needed
+            h2.className = 'dynamic-section-header';
+            p.parentNode.replaceChild(h2, p);
+        }
+    });
+});